@@ -1,8 +1,15 @@
 from typing import Any
 from django.contrib import admin
+from django.db import router, transaction
 from django.db.models.query import QuerySet
 from django.http import HttpRequest
 from .models import Task, Tag
+from .services import (
+    collect_orphan_tags,
+    deleting_tasks,
+    recording_task_writes,
+    tag_ids_for_tasks,
+)
 
 # Register your models here.
 
@@ -27,35 +34,34 @@ class TaskAdmin(admin.ModelAdmin):
     )
     filter_horizontal = ("tags",)
 
-    def delete_queryset(self, request: HttpRequest, queryset: QuerySet[Any]):
-        for task in queryset.all():
-            # Custom logic before deleting the Task
-            tags = task.tags.all()
-            for tag in tags:
-                if (
-                    tag.task_set.count() == 1
-                ):  # If tag is only associated with this task
-                    tag.delete()
+    def changeform_view(self, request, *args, **kwargs):
+        # The task and its tags are saved separately, log them as one change
+        using = router.db_for_write(self.model)
+        with transaction.atomic(using=using), recording_task_writes():
+            return super().changeform_view(request, *args, **kwargs)
 
-        return super().delete_queryset(request, queryset)
+    def delete_queryset(self, request: HttpRequest, queryset: QuerySet[Any]):
+        # Tag usage counts and orphans are handled once for the whole batch
+        with transaction.atomic(), deleting_tasks(queryset):
+            super().delete_queryset(request, queryset)
 
-    def delete_view(self, request: HttpRequest, object_id: str, *args, **kwargs):
-        for tag in Task.objects.get(pk=object_id).tags.all():
-            # Custom logic before deleting the Task
-            if tag.task_set.count() == 1:
-                tag.delete()
-        return super().delete_view(request, object_id, *args, **kwargs)
+    @transaction.atomic
+    def delete_model(self, request: HttpRequest, obj: Task):
+        tag_ids = tag_ids_for_tasks([obj.pk])
+        super().delete_model(request, obj)
+        collect_orphan_tags(tag_ids)
 
 
 @admin.register(Tag)
 class TagAdmin(admin.ModelAdmin):
-    list_display = ("name",)
+    list_display = ("name", "usage_count")
     search_fields = ("name",)
+    readonly_fields = ("usage_count",)
     fieldsets = (
         (
             "Tag Details",
             {
-                "fields": ("name",),
+                "fields": ("name", "usage_count"),
             },
         ),
     )
@@ -6,4 +6,6 @@ class AppConfig(AppConfig):
     name = "App"
 
     def ready(self):
+        from . import receivers, schema  # noqa: F401
+
         return super().ready()
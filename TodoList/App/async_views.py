@@ -0,0 +1,267 @@
+"""
+ASGI-native versions of the task list, create and retrieve endpoints, and
+the live stream of task changes.
+
+DRF views are synchronous, so under ASGI every request to `TaskViewSet`
+holds a worker thread until its response is written. These plain Django
+async views only hop to the ORM's thread for the queries themselves
+(`acount`, `aget`, async iteration, the create transaction);
+authentication, validation and serialization run on the event loop, so
+slow clients cost a coroutine rather than a thread. Responses have the same
+shape as `TaskViewSet`'s.
+"""
+
+import asyncio
+import json
+
+from asgiref.sync import sync_to_async
+from django.core.exceptions import ObjectDoesNotExist
+from django.http import HttpResponse, StreamingHttpResponse
+from django.utils.decorators import method_decorator
+from django.views import View
+from django.views.decorators.csrf import csrf_exempt
+from rest_framework.exceptions import ValidationError
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+from .authentication import aauthenticate_basic
+from .changes import MAX_BATCH_SIZE, ChangesExpired, check_since, read_changes
+from .events import SubscriptionDropped, get_broker
+from .filters import TaskEventFilterSerializer, TaskFilter, validate_query_params
+from .models import Task
+from .serializers import TaskSerializer
+from .views import TaskListPagination
+
+
+def json_response(data, status=200):
+    return HttpResponse(
+        JSONRenderer().render(data), status=status, content_type="application/json"
+    )
+
+
+def event_message(change):
+    """Format a change as a server-sent event."""
+    data = JSONRenderer().render(change).decode()
+    return f"id: {change['seq']}\nevent: {change['action']}\ndata: {data}\n\n"
+
+
+async def replay_changes(subscription, since):
+    """
+    Yield the changes `subscription` matches from the outbox, after `since`
+    and up to the sequence number the subscription went live at.
+    """
+    until = subscription.since or 0
+    while since < until:
+        batch = await sync_to_async(read_changes)(since, MAX_BATCH_SIZE)
+        for change in batch["changes"]:
+            # Later changes are queued on the subscription already
+            if change["seq"] <= until and subscription.matches(change):
+                yield change
+        if not batch["has_more"]:
+            break
+        since = batch["last_seq"]
+
+
+@method_decorator(csrf_exempt, name="dispatch")
+class AsyncTaskView(View):
+    """Authenticate every request with HTTP Basic before dispatching it."""
+
+    async def dispatch(self, request, *args, **kwargs):
+        request.user = await aauthenticate_basic(request)
+        if request.user is None:
+            response = json_response(
+                {"detail": "Authentication credentials were not provided."},
+                status=401,
+            )
+            response["WWW-Authenticate"] = 'Basic realm="api"'
+            return response
+        try:
+            return await super().dispatch(request, *args, **kwargs)
+        except ValidationError as error:
+            return json_response(error.detail, status=400)
+
+    def get_queryset(self):
+        return Task.objects.prefetch_related("tags")
+
+
+class AsyncTaskListView(AsyncTaskView):
+    pagination = TaskListPagination
+
+    async def get(self, request):
+        # Only builds the lazy filtered queryset, no query is run here
+        queryset = TaskFilter().filter_queryset(
+            Request(request), self.get_queryset(), self
+        )
+
+        page_size = self.get_page_size(request)
+        count = await queryset.acount()
+        try:
+            page = int(request.GET.get("page", 1))
+        except ValueError:
+            page = 0
+        pages = max(1, -(-count // page_size))
+        if not 1 <= page <= pages:
+            return json_response({"detail": "Invalid page."}, status=404)
+
+        start = (page - 1) * page_size
+        end = start + page_size
+        serializer = TaskSerializer()
+        results = [
+            serializer.to_representation(task) async for task in queryset[start:end]
+        ]
+
+        url = request.build_absolute_uri()
+        return json_response(
+            {
+                "count": count,
+                "next": self.get_page_link(url, page + 1, pages),
+                "previous": self.get_page_link(url, page - 1, pages),
+                "results": results,
+            }
+        )
+
+    async def post(self, request):
+        try:
+            data = json.loads(request.body)
+        except ValueError:
+            return json_response({"detail": "JSON parse error."}, status=400)
+
+        serializer = TaskSerializer(data=data)
+        serializer.is_valid(raise_exception=True)
+        # The task and its tags are written in one transaction
+        task = await sync_to_async(serializer.save)()
+
+        task = await self.get_queryset().aget(pk=task.pk)
+        return json_response(serializer.to_representation(task), status=201)
+
+    def get_page_link(self, url, page, pages):
+        if not 1 <= page <= pages:
+            return None
+        if page == 1:
+            return remove_query_param(url, "page")
+        return replace_query_param(url, "page", page)
+
+    def get_page_size(self, request):
+        pagination = self.pagination
+        try:
+            page_size = int(request.GET[pagination.page_size_query_param])
+        except (KeyError, ValueError):
+            return pagination.page_size
+        if page_size <= 0:
+            return pagination.page_size
+        return min(page_size, pagination.max_page_size)
+
+
+class AsyncTaskDetailView(AsyncTaskView):
+    async def get(self, request, pk):
+        try:
+            task = await self.get_queryset().aget(pk=pk)
+        except ObjectDoesNotExist:
+            return json_response(
+                {"detail": "No Task matches the given query."}, status=404
+            )
+        return json_response(TaskSerializer().to_representation(task))
+
+
+class AsyncTaskEventsView(AsyncTaskView):
+    """
+    Push task changes to the client as they are recorded.
+
+    Changes are the entries of the change feed (`/api/tasks/changes/`),
+    filtered by `status` and `tags_any` on the task after the change
+    (deletions always pass). By default they are streamed as server-sent
+    events with the sequence number as event id and the action as event
+    type, plus a comment every `keepalive` seconds; a reconnecting client
+    sends `Last-Event-ID` (or `since`) and first gets the changes it missed.
+    With `wait` the endpoint long-polls instead: it answers with the changes
+    after `since` as soon as there are any, or empty after `wait` seconds,
+    and `last_seq` is the `since` of the next request.
+
+    A stream falling too far behind is closed with a `dropped` event, the
+    client then reconnects and catches up from the outbox.
+    """
+
+    keepalive = 15
+
+    async def get(self, request):
+        params = validate_query_params(TaskEventFilterSerializer, request.GET)
+        since = params.get("since")
+        if "Last-Event-ID" in request.headers:
+            try:
+                since = int(request.headers["Last-Event-ID"])
+            except ValueError:
+                raise ValidationError(
+                    {"Last-Event-ID": ["A valid integer is required."]}
+                )
+        if since is not None:
+            try:
+                await sync_to_async(check_since)(since)
+            except ChangesExpired as error:
+                return json_response({"detail": error.detail}, status=410)
+
+        broker = get_broker()
+        subscription = await broker.subscribe(
+            params.get("status", ()), params.get("tags_any", ())
+        )
+        if "wait" not in params:
+            response = StreamingHttpResponse(
+                self.stream(broker, subscription, since),
+                content_type="text/event-stream",
+            )
+            response["Cache-Control"] = "no-cache"
+            response["X-Accel-Buffering"] = "no"  # Unbuffered behind nginx
+            return response
+
+        try:
+            changes = await self.wait(subscription, since, params["wait"])
+        finally:
+            broker.unsubscribe(subscription)
+        last_seq = max(
+            [since or 0, subscription.since or 0]
+            + [change["seq"] for change in changes]
+        )
+        return json_response({"changes": changes, "last_seq": last_seq})
+
+    async def stream(self, broker, subscription, since):
+        try:
+            if since is not None:
+                async for change in replay_changes(subscription, since):
+                    yield event_message(change)
+            while True:
+                try:
+                    change = await subscription.get(self.keepalive)
+                except SubscriptionDropped:
+                    yield "event: dropped\ndata: {}\n\n"
+                    return
+                if change is None:
+                    yield ": keepalive\n\n"
+                elif change["seq"] > subscription.since:
+                    yield event_message(change)
+        finally:
+            broker.unsubscribe(subscription)
+
+    async def wait(self, subscription, since, timeout):
+        changes = []
+        if since is not None:
+            changes = [change async for change in replay_changes(subscription, since)]
+
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        try:
+            while not changes and loop.time() < deadline:
+                change = await subscription.get(deadline - loop.time())
+                if change is None:
+                    break
+                if change["seq"] > subscription.since:
+                    changes.append(change)
+        except SubscriptionDropped:
+            return changes
+
+        # Take whatever else is already queued
+        change = subscription.get_nowait()
+        while change is not None:
+            if change["seq"] > subscription.since:
+                changes.append(change)
+            change = subscription.get_nowait()
+        return changes
@@ -0,0 +1,133 @@
+import base64
+import binascii
+import hashlib
+import hmac
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.contrib.auth import aauthenticate, get_user_model
+from rest_framework.authentication import BasicAuthentication
+
+
+class CredentialCache:
+    """
+    A bounded, thread safe LRU of recently verified credentials.
+
+    Entries map a username to an HMAC of the password it authenticated with
+    and to the stored password hash at that time. A changed password (or a
+    rehash) therefore invalidates the entry without any explicit signal.
+    Plain text passwords are never kept.
+    """
+
+    def __init__(self, max_entries=1024, ttl=300):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def digest(self, username, password):
+        message = f"{username}\0{password}".encode()
+        return hmac.new(settings.SECRET_KEY.encode(), message, hashlib.sha256).digest()
+
+    def get(self, username, password):
+        """
+        Return the password hash `password` was verified against for
+        `username`, or None if it was not verified recently.
+        """
+        with self._lock:
+            entry = self._entries.get(username)
+            if entry is None:
+                return None
+            password_hash, digest, expires = entry
+            if expires <= time.monotonic():
+                del self._entries[username]
+                return None
+            self._entries.move_to_end(username)
+
+        if not hmac.compare_digest(digest, self.digest(username, password)):
+            return None
+        return password_hash
+
+    def add(self, user, password):
+        username = user.get_username()
+        entry = (
+            user.password,
+            self.digest(username, password),
+            time.monotonic() + self.ttl,
+        )
+        with self._lock:
+            self._entries[username] = entry
+            self._entries.move_to_end(username)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+credential_cache = CredentialCache(
+    max_entries=getattr(settings, "BASIC_AUTH_CACHE_SIZE", 1024),
+    ttl=getattr(settings, "BASIC_AUTH_CACHE_TTL", 300),
+)
+
+
+class CachedBasicAuthentication(BasicAuthentication):
+    """
+    HTTP Basic authentication that skips the password hasher for credentials
+    verified in the last `BASIC_AUTH_CACHE_TTL` seconds.
+
+    The user row is still read on every request, so deactivated users and
+    password changes take effect immediately; only the (deliberately slow)
+    PBKDF2 check is avoided.
+    """
+
+    def authenticate_credentials(self, userid, password, request=None):
+        password_hash = credential_cache.get(userid, password)
+        if password_hash is not None:
+            UserModel = get_user_model()
+            user = UserModel._default_manager.filter(
+                **{UserModel.USERNAME_FIELD: userid}
+            ).first()
+            if user is not None and user.is_active and user.password == password_hash:
+                return (user, None)
+
+        user, auth = super().authenticate_credentials(userid, password, request)
+        credential_cache.add(user, password)
+        return (user, auth)
+
+
+async def aauthenticate_basic(request):
+    """
+    Return the active user named by the request's Basic credentials, or None.
+
+    The async counterpart of `CachedBasicAuthentication` for plain Django
+    async views, sharing its credential cache. The password hasher only runs
+    (in a worker thread) on a cache miss.
+    """
+    try:
+        scheme, credentials = request.headers.get("Authorization", "").split()
+        if scheme.lower() != "basic":
+            return None
+        userid, _, password = (
+            base64.b64decode(credentials, validate=True).decode().partition(":")
+        )
+    except (ValueError, binascii.Error, UnicodeDecodeError):
+        return None
+
+    password_hash = credential_cache.get(userid, password)
+    if password_hash is not None:
+        UserModel = get_user_model()
+        user = await UserModel._default_manager.filter(
+            **{UserModel.USERNAME_FIELD: userid}
+        ).afirst()
+        if user is not None and user.is_active and user.password == password_hash:
+            return user
+
+    user = await aauthenticate(request, username=userid, password=password)
+    if user is None or not user.is_active:
+        return None
+    credential_cache.add(user, password)
+    return user
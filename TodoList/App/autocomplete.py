@@ -0,0 +1,98 @@
+"""
+In-memory prefix index over tag names for keystroke level autocomplete.
+
+Names are kept case folded in a sorted list, so the tags starting with a
+prefix are a contiguous range found by bisection. The index is loaded with
+one query on first use, follows the Tag writes of this process through
+App.receivers once they commit and is reloaded every `TAG_INDEX_TTL`
+seconds to pick up the writes of other processes and the latest usage
+counts.
+"""
+
+import heapq
+import threading
+import time
+from itertools import islice
+
+from django.conf import settings
+from sortedcontainers import SortedList
+
+from .models import Tag
+
+
+class TagPrefixIndex:
+    def __init__(self, ttl=60):
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self.clear()
+
+    def clear(self):
+        with self._lock:
+            self._entries = SortedList()  # (folded name, name, pk)
+            self._by_pk = {}  # pk -> (folded name, name, pk)
+            self._usage = {}  # pk -> usage count
+            self._loaded_at = None
+
+    def _load(self):
+        entries, by_pk, usage = [], {}, {}
+        for pk, name, usage_count in Tag.objects.values_list(
+            "pk", "name", "usage_count"
+        ):
+            entry = (name.casefold(), name, pk)
+            entries.append(entry)
+            by_pk[pk] = entry
+            usage[pk] = usage_count
+
+        with self._lock:
+            self._entries = SortedList(entries)
+            self._by_pk = by_pk
+            self._usage = usage
+            self._loaded_at = time.monotonic()
+
+    def _ensure_loaded(self):
+        loaded_at = self._loaded_at
+        if loaded_at is None or time.monotonic() - loaded_at > self.ttl:
+            self._load()
+
+    def add(self, pk, name, usage_count=0):
+        """Add or rename the tag `pk`."""
+        if self._loaded_at is None:
+            return  # picked up by the first load
+        entry = (name.casefold(), name, pk)
+        with self._lock:
+            previous = self._by_pk.get(pk)
+            if previous is not None:
+                self._entries.remove(previous)
+            self._entries.add(entry)
+            self._by_pk[pk] = entry
+            self._usage.setdefault(pk, usage_count)
+
+    def remove(self, pk):
+        with self._lock:
+            entry = self._by_pk.pop(pk, None)
+            if entry is not None:
+                self._entries.remove(entry)
+                self._usage.pop(pk, None)
+
+    def complete(self, prefix, limit=10, popular=False, max_scan=1000):
+        """
+        Return up to `limit` `(pk, name, usage_count)` for the tags whose name
+        starts with `prefix` (case insensitive), alphabetically or, with
+        `popular`, most used first among the first `max_scan` matches.
+        """
+        self._ensure_loaded()
+        folded = prefix.casefold()
+        with self._lock:
+            matches = self._entries.irange((folded,), (folded + "\U0010ffff",))
+            if popular:
+                matches = heapq.nsmallest(
+                    limit,
+                    islice(matches, max_scan),
+                    key=lambda entry: (-self._usage.get(entry[2], 0), entry[0]),
+                )
+            else:
+                matches = list(islice(matches, limit))
+            return [(pk, name, self._usage.get(pk, 0)) for _, name, pk in matches]
+
+
+tag_index = TagPrefixIndex(ttl=getattr(settings, "TAG_INDEX_TTL", 60))
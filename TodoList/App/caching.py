@@ -0,0 +1,55 @@
+"""
+Cache of serialized task representations and task list pages.
+
+Entries hold the response data together with its validators, the ETag and
+Last-Modified of App.conditional, and are keyed by them. Details are keyed
+by task id and version, list pages by URL and the sequence number (and
+time) of the latest task change. Every write records a change with a sequence number
+that is never reused, so no entry has to be invalidated: a reader storing
+what it read before a write, from the primary or a lagging replica, can
+only fill a key that is no longer looked up. The validators are read from
+the database the page is read from (App.routers keeps the reads of a
+request on one alias).
+
+The cache lives in `TASK_CACHE_ALIAS` (the local memory cache by default).
+Since keys follow the database, processes sharing nothing but it never
+serve each other's stale entries; a shared backend only saves work.
+"""
+
+import hashlib
+
+from django.conf import settings
+from django.core.cache import caches
+
+
+def get_cache():
+    return caches[getattr(settings, "TASK_CACHE_ALIAS", "default")]
+
+
+def get_timeout():
+    return getattr(settings, "TASK_CACHE_TIMEOUT", 300)
+
+
+def task_key(pk, etag):
+    return f"tasks:detail:{pk}:{etag}"
+
+
+def list_key(url, etag, last_modified):
+    # Pages embed absolute next/previous links, so the host is part of the key.
+    # The time of the change tells apart a sequence number reused after a
+    # rollback (a test database, a restored backup).
+    stamp = last_modified and last_modified.timestamp()
+    digest = hashlib.md5(url.encode(), usedforsecurity=False).hexdigest()
+    return f"tasks:list:{etag}:{stamp}:{digest}"
+
+
+def get_entry(key):
+    """Return the cached `(etag, last modified, data)` for `key`, or None."""
+    return get_cache().get(key)
+
+
+def set_entry(key, etag, last_modified, data):
+    """Cache `data` and its validators under `key` and return the entry."""
+    entry = (etag, last_modified, data)
+    get_cache().set(key, entry, timeout=get_timeout())
+    return entry
@@ -0,0 +1,182 @@
+"""
+Transactional outbox of task writes and the change feed reading it.
+
+Every task write appends `TaskChange` rows (task id, action, time) in the
+transaction of the write: the model signals (App.receivers) cover single
+saves, deletes and tag changes, `tasks_changed` covers the bulk paths. API
+and admin writes run under `recording_task_writes` (App.services), so a
+task saved together with its tags is logged once.
+Consumers poll `/api/tasks/changes/?since=<seq>` with the last sequence
+number they saw and get the changes after it together with the current
+representation of the changed tasks, instead of re-reading the task list.
+A consumer starting from `since=0`, or told to after its history was
+pruned, first gets every existing task as a snapshot (`read_snapshot`).
+
+SQLite runs one write transaction at a time, so sequence numbers become
+visible in order and a consumer can never skip a change committed late.
+
+The changed tasks are stamped with the sequence number of their change
+(`Task.version`) and its time (`Task.updated_at`), the validators of the
+conditional requests (App.conditional).
+"""
+
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+from .models import Task, TaskChange
+from .serializers import TaskReadSerializer
+
+# Changes returned per request by default, and at most
+BATCH_SIZE = 500
+MAX_BATCH_SIZE = 1000
+
+
+class ChangesExpired(APIException):
+    status_code = status.HTTP_410_GONE
+    default_detail = (
+        "Changes after this sequence number were pruned, " "sync again from since=0."
+    )
+    default_code = "changes_expired"
+
+
+def record_changes(task_ids, action):
+    """
+    Append an `action` change for each of `task_ids` with one INSERT, and
+    unless they are deleted stamp the tasks with one UPDATE. Returns the
+    `(version, updated_at)` stamp, or None.
+    """
+    records = TaskChange.objects.bulk_create(
+        [TaskChange(task_id=task_id, action=action) for task_id in task_ids]
+    )
+    if not records or action == TaskChange.Action.DELETED:
+        return None
+
+    # Backends not returning the inserted keys leave `seq` unset
+    version = records[-1].seq or latest_seq()
+    updated_at = records[-1].changed_at
+    Task.objects.filter(pk__in=task_ids).update(version=version, updated_at=updated_at)
+    return version, updated_at
+
+
+def latest_seq():
+    """Return the sequence number of the last recorded change, 0 without any."""
+    latest = TaskChange.objects.order_by("-seq").values_list("seq").first()
+    return latest[0] if latest else 0
+
+
+def check_since(since):
+    """Raise `ChangesExpired` if changes after `since` were already pruned."""
+    if since:
+        # Pruning keeps the latest change, so an empty outbox was wiped
+        oldest = TaskChange.objects.order_by("seq").values_list("seq").first()
+        if oldest is None or since < oldest[0] - 1:
+            raise ChangesExpired()
+
+
+def read_changes(since=0, limit=BATCH_SIZE):
+    """
+    Return the changes after the `since` sequence number, up to `limit` rows.
+
+    Changes of the same task within the batch are merged into its latest
+    one, which carries the current representation of the task (None once
+    it is deleted). A task created within the batch keeps the `created`
+    action, and is left out altogether if it is deleted within it too.
+    `last_seq` is the `since` of the next batch and `has_more` tells
+    whether it is already available.
+    """
+    check_since(since)
+    rows = list(
+        TaskChange.objects.filter(seq__gt=since)
+        .order_by("seq")
+        .values_list("seq", "task_id", "action", "changed_at")[: limit + 1]
+    )
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    latest, created = {}, set()
+    for seq, task_id, action, changed_at in rows:
+        # Keep the tasks in the order of their last change
+        if latest.pop(task_id, None) is None and action == TaskChange.Action.CREATED:
+            created.add(task_id)
+        latest[task_id] = (seq, task_id, action, changed_at)
+
+    merged = []
+    for seq, task_id, action, changed_at in latest.values():
+        if task_id in created:
+            if action == TaskChange.Action.DELETED:
+                continue  # The consumer never saw it
+            action = TaskChange.Action.CREATED
+        merged.append((seq, task_id, action, changed_at))
+
+    task_ids = [
+        task_id
+        for _, task_id, action, _ in merged
+        if action != TaskChange.Action.DELETED
+    ]
+    queryset = TaskReadSerializer.rows(Task.objects.filter(pk__in=task_ids))
+    tasks = {
+        task["id"]: task for task in TaskReadSerializer(list(queryset), many=True).data
+    }
+
+    return {
+        "changes": [
+            {
+                "seq": seq,
+                "task_id": task_id,
+                "action": action,
+                "changed_at": changed_at,
+                "task": tasks.get(task_id),
+            }
+            for seq, task_id, action, changed_at in merged
+        ],
+        "last_seq": rows[-1][0] if rows else since,
+        "has_more": has_more,
+    }
+
+
+def read_snapshot(seq=None, after=0, limit=BATCH_SIZE):
+    """
+    Return the existing tasks as `created` changes, up to `limit` of them
+    in primary key order after the task id `after`.
+
+    A snapshot is taken as of the latest sequence number, read before any
+    task, and continued with that `seq` until `after` comes back None.
+    Tasks written meanwhile may show their newer state in the snapshot,
+    the changes after `seq` then replay them, so a consumer that goes on
+    from `last_seq` misses nothing.
+    """
+    if seq is None:
+        seq = latest_seq()
+    else:
+        check_since(seq)
+    queryset = TaskReadSerializer.rows(Task.objects.filter(pk__gt=after))
+    rows = list(queryset.order_by("pk")[: limit + 1])
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    return {
+        "changes": [
+            {
+                "seq": seq,
+                "task_id": task["id"],
+                "action": TaskChange.Action.CREATED,
+                "changed_at": row["updated_at"],
+                "task": task,
+            }
+            for row, task in zip(rows, TaskReadSerializer(rows, many=True).data)
+        ],
+        "last_seq": seq,
+        "has_more": has_more,
+        "after": rows[-1]["id"] if has_more else None,
+    }
+
+
+def prune_changes(before):
+    """
+    Delete the changes recorded before the `before` datetime, except the
+    latest one: it is the high-water mark that tells consumers whether they
+    missed changes, and the ETag of the task lists (App.conditional).
+    """
+    return TaskChange.objects.filter(
+        changed_at__lt=before, seq__lt=latest_seq()
+    ).delete()[0]
@@ -0,0 +1,102 @@
+"""
+Validators of conditional task requests.
+
+Every task write is stamped by App.changes with the sequence number of its
+outbox entry (`Task.version`) and its time (`Task.updated_at`). The ETag of
+a task is its version, and the ETag of any task list the sequence number of
+the latest change: the outbox never reuses one and pruning keeps the
+latest, so a list can only be served again under the same ETag if no task
+was written since. Telling
+whether a client's copy is current (If-None-Match, If-Modified-Since) or
+whether it updates the latest version (If-Match) thus costs one indexed
+lookup, without loading or serializing tasks.
+"""
+
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, parse_etags
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+from .models import Task, TaskChange
+
+CONDITIONAL_HEADERS = (
+    "If-Match",
+    "If-None-Match",
+    "If-Modified-Since",
+    "If-Unmodified-Since",
+)
+
+
+class PreconditionFailed(APIException):
+    status_code = status.HTTP_412_PRECONDITION_FAILED
+    default_detail = "The task was changed since, fetch it again."
+    default_code = "precondition_failed"
+
+
+def version_etag(version):
+    return f'"{version}"'
+
+
+def is_conditional(request):
+    return any(header in request.headers for header in CONDITIONAL_HEADERS)
+
+
+def task_validators(pk):
+    """Return the `(etag, last modified)` of the task `pk`, or None."""
+    try:
+        row = Task.objects.filter(pk=pk).values_list("version", "updated_at").first()
+    except (TypeError, ValueError):
+        return None
+    return row and (version_etag(row[0]), row[1])
+
+
+def list_validators():
+    """Return the `(etag, last modified)` shared by every task list."""
+    latest = TaskChange.objects.order_by("-seq").values_list("seq", "changed_at")
+    seq, changed_at = latest.first() or (0, None)
+    return version_etag(seq), changed_at
+
+
+def set_validators(response, etag, last_modified):
+    response["ETag"] = etag
+    if last_modified is not None:
+        response["Last-Modified"] = http_date(last_modified.timestamp())
+    return response
+
+
+def conditional_response(request, etag, last_modified):
+    """
+    Return the bodyless 304 (or 412) response the conditional headers of
+    `request` call for, or None when it must be answered in full.
+    """
+    response = get_conditional_response(
+        request,
+        etag=etag,
+        last_modified=last_modified and int(last_modified.timestamp()),
+    )
+    return response and set_validators(response, etag, last_modified)
+
+
+def check_if_match(request, pk):
+    """
+    Raise `PreconditionFailed` unless the `If-Match` header of a write to
+    the task `pk` names its current version. Call it in the transaction of
+    the write: the row is locked where the database supports it.
+    """
+    if "If-Match" not in request.headers:
+        return
+    try:
+        version = (
+            Task.objects.select_for_update()
+            .filter(pk=pk)
+            .values_list("version", flat=True)
+            .first()
+        )
+    except (TypeError, ValueError):
+        return
+    if version is None:
+        return  # Answered 404 by the view
+
+    etags = parse_etags(request.headers["If-Match"])
+    if "*" not in etags and version_etag(version) not in etags:
+        raise PreconditionFailed()
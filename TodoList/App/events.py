@@ -0,0 +1,170 @@
+"""
+Live task events for server-sent event and long-poll clients.
+
+Every process already appends its task writes to the `TaskChange` outbox
+(App.changes), so the events are read from there rather than from the
+signals of this process. Each worker runs one `TaskEventBroker` on its event
+loop: while it has subscribers, a single poller task reads the outbox every
+`TASK_EVENTS_POLL_INTERVAL` seconds (one query when nothing changed) and
+fans the new changes out to the subscribers whose filters match. An idle
+subscriber costs a coroutine and an empty queue, not a thread or a query.
+
+Each subscriber has a bounded queue. A subscriber that falls
+`TASK_EVENTS_QUEUE_SIZE` events behind is dropped instead of buffering
+without limit or slowing the others down; it reconnects from the sequence
+number of the last event it received and catches up from the outbox.
+"""
+
+import asyncio
+import weakref
+from contextlib import suppress
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+
+from .changes import MAX_BATCH_SIZE, ChangesExpired, latest_seq, read_changes
+
+# Queued for a waiting subscriber to wake it up when it is dropped
+DROPPED = object()
+
+
+class SubscriptionDropped(Exception):
+    """The subscriber fell too far behind, or the broker stopped."""
+
+
+class Subscription:
+    def __init__(self, statuses=(), tags=(), queue_size=100):
+        self.statuses = set(statuses)
+        self.tags = set(tags)
+        self.queue = asyncio.Queue(queue_size)
+        self.dropped = False
+        # Sequence number the subscription went live at, set by the broker
+        self.since = None
+
+    def matches(self, change):
+        """
+        Whether `change` passes the status and tag filters. They apply to the
+        task after the change, deletions are sent to every subscriber.
+        """
+        task = change["task"]
+        if task is None:
+            return True
+        if self.statuses and task["status"] not in self.statuses:
+            return False
+        return not self.tags or not self.tags.isdisjoint(task["tags"])
+
+    def put(self, change):
+        """Queue `change`, or return False when the queue is full."""
+        try:
+            self.queue.put_nowait(change)
+        except asyncio.QueueFull:
+            return False
+        return True
+
+    def drop(self):
+        self.dropped = True
+        # A full queue means nobody is waiting on it
+        with suppress(asyncio.QueueFull):
+            self.queue.put_nowait(DROPPED)
+
+    def get_nowait(self):
+        """Return the next queued change, or None."""
+        try:
+            change = self.queue.get_nowait()
+        except asyncio.QueueEmpty:
+            return None
+        return None if change is DROPPED else change
+
+    async def get(self, timeout):
+        """
+        Return the next change, or None if there is none within `timeout`
+        seconds. Raises `SubscriptionDropped` once the subscription is dropped.
+        """
+        if self.dropped:
+            raise SubscriptionDropped()
+        try:
+            change = await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+        if change is DROPPED:
+            raise SubscriptionDropped()
+        return change
+
+
+class TaskEventBroker:
+    def __init__(self, interval=1, queue_size=100, batch_size=MAX_BATCH_SIZE):
+        self.interval = interval
+        self.queue_size = queue_size
+        self.batch_size = batch_size
+        self.subscribers = set()
+        self.last_seq = None
+        self.poller = None
+        self.ready = asyncio.Event()
+
+    async def subscribe(self, statuses=(), tags=()):
+        """
+        Return a new subscription receiving the changes recorded after its
+        `since` sequence number, starting the poller if needed.
+        """
+        subscription = Subscription(statuses, tags, self.queue_size)
+        self.subscribers.add(subscription)
+        if self.poller is None or self.poller.done():
+            self.ready.clear()
+            self.poller = asyncio.create_task(self.poll())
+        await self.ready.wait()
+        # Changes published meanwhile may be queued already, `since` is at or
+        # after them, so consumers skip queued changes up to `since`.
+        subscription.since = self.last_seq
+        return subscription
+
+    def unsubscribe(self, subscription):
+        self.subscribers.discard(subscription)
+
+    def publish(self, changes):
+        for subscription in list(self.subscribers):
+            for change in changes:
+                if subscription.matches(change) and not subscription.put(change):
+                    self.unsubscribe(subscription)
+                    subscription.drop()
+                    break
+
+    async def poll(self):
+        try:
+            # Subscribers asking for older changes read them from the outbox
+            self.last_seq = await sync_to_async(latest_seq)()
+            self.ready.set()
+            while self.subscribers:
+                try:
+                    batch = await sync_to_async(read_changes)(
+                        self.last_seq, self.batch_size
+                    )
+                except ChangesExpired:
+                    # Pruned under a poller late by days, drop everyone
+                    break
+                # No await from here on: a subscriber either gets the batch
+                # or goes live after it
+                self.last_seq = batch["last_seq"]
+                self.publish(batch["changes"])
+                if not batch["has_more"]:
+                    await asyncio.sleep(self.interval)
+        finally:
+            for subscription in self.subscribers:
+                subscription.drop()
+            self.subscribers.clear()
+            # Let pending subscribe() calls return (to a dropped subscription)
+            self.ready.set()
+
+
+_brokers = weakref.WeakKeyDictionary()
+
+
+def get_broker():
+    """Return the broker of the running event loop."""
+    loop = asyncio.get_running_loop()
+    broker = _brokers.get(loop)
+    if broker is None:
+        broker = _brokers[loop] = TaskEventBroker(
+            interval=getattr(settings, "TASK_EVENTS_POLL_INTERVAL", 1),
+            queue_size=getattr(settings, "TASK_EVENTS_QUEUE_SIZE", 100),
+        )
+    return broker
@@ -0,0 +1,72 @@
+"""
+Streaming export of tasks as NDJSON or CSV.
+
+Tasks are read with `iterator(chunk_size=...)`, which fetches and prefetches
+the tags of one chunk at a time, and every line is produced by a generator,
+so memory stays flat whatever the size of the table.
+"""
+
+import csv
+import io
+import json
+
+from .serializers import TaskSerializer
+
+FORMATS = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+CSV_FIELDS = [
+    "id",
+    "title",
+    "description",
+    "timestamp",
+    "due_date",
+    "status",
+    "version",
+    "updated_at",
+    "tags",
+]
+
+# Tasks fetched (and tags prefetched) per database round trip
+CHUNK_SIZE = 2000
+
+
+def export_rows(queryset, chunk_size=CHUNK_SIZE):
+    """Yield the serialized representation of every task in `queryset`."""
+    queryset = queryset.prefetch_related("tags").order_by("pk")
+    serializer = TaskSerializer()
+    for task in queryset.iterator(chunk_size=chunk_size):
+        yield serializer.to_representation(task)
+
+
+def ndjson_lines(rows):
+    for row in rows:
+        yield json.dumps(row, ensure_ascii=False) + "\n"
+
+
+def csv_lines(rows):
+    """Yield CSV lines, tags joined with commas inside a single column."""
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=CSV_FIELDS)
+
+    def flush():
+        line = buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+        return line
+
+    writer.writeheader()
+    yield flush()
+    for row in rows:
+        writer.writerow({**row, "tags": ",".join(row["tags"])})
+        yield flush()
+
+
+def export_lines(queryset, export_format, chunk_size=CHUNK_SIZE):
+    """Return a generator of the lines exporting `queryset` in `export_format`."""
+    rows = export_rows(queryset, chunk_size=chunk_size)
+    if export_format == "csv":
+        return csv_lines(rows)
+    return ndjson_lines(rows)
@@ -0,0 +1,175 @@
+from django.db.models import Count
+from rest_framework import serializers
+from rest_framework.exceptions import ValidationError
+from rest_framework.filters import BaseFilterBackend, SearchFilter
+
+from . import search
+from .models import Task
+
+
+class TaskSearchFilter(SearchFilter):
+    """
+    Search tasks through the full-text index when it is available.
+
+    The index covers titles, descriptions and tag names and returns ranked,
+    de-duplicated tasks. Without it (non SQLite databases or SQLite builds
+    lacking FTS5) this behaves like `SearchFilter` over `search_fields`.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        if not search.is_available(queryset.db):
+            return super().filter_queryset(request, queryset, view)
+
+        terms = self.get_search_terms(request)
+        if not terms:
+            return queryset
+        return search.search_tasks(queryset, " ".join(terms))
+
+
+class CommaSeparatedField(serializers.ListField):
+    """A list given either as repeated parameters or comma separated values."""
+
+    def to_internal_value(self, data):
+        values = [value.strip() for item in data for value in item.split(",")]
+        return super().to_internal_value([value for value in values if value])
+
+
+class TaskFilterSerializer(serializers.Serializer):
+    status = CommaSeparatedField(
+        child=serializers.ChoiceField(choices=Task.StatusChoices.choices),
+        required=False,
+        help_text="Only tasks in one of these statuses (comma separated).",
+    )
+    due_after = serializers.DateField(
+        required=False, help_text="Only tasks due on or after this date."
+    )
+    due_before = serializers.DateField(
+        required=False, help_text="Only tasks due on or before this date."
+    )
+    created_since = serializers.DateTimeField(
+        required=False, help_text="Only tasks created at or after this time."
+    )
+    tags_all = CommaSeparatedField(
+        child=serializers.CharField(max_length=30),
+        required=False,
+        help_text="Only tasks carrying every one of these tags (comma separated).",
+    )
+    tags_any = CommaSeparatedField(
+        child=serializers.CharField(max_length=30),
+        required=False,
+        help_text="Only tasks carrying any of these tags (comma separated).",
+    )
+    version_after = serializers.IntegerField(
+        min_value=0,
+        required=False,
+        help_text="Only tasks changed after this version (the ETag of a list).",
+    )
+
+
+class TaskEventFilterSerializer(serializers.Serializer):
+    status = CommaSeparatedField(
+        child=serializers.ChoiceField(choices=Task.StatusChoices.choices),
+        required=False,
+        help_text="Only changes leaving tasks in one of these statuses.",
+    )
+    tags_any = CommaSeparatedField(
+        child=serializers.CharField(max_length=30),
+        required=False,
+        help_text="Only changes leaving tasks with any of these tags.",
+    )
+    since = serializers.IntegerField(
+        min_value=0,
+        required=False,
+        help_text="Replay the changes after this sequence number first.",
+    )
+    wait = serializers.IntegerField(
+        min_value=1,
+        max_value=60,
+        required=False,
+        help_text="Long-poll: answer with JSON within this many seconds.",
+    )
+
+
+def validate_query_params(serializer_class, query_params):
+    """Validate the query parameters matching the fields of `serializer_class`."""
+    data = {}
+    for name, field in serializer_class().fields.items():
+        if name not in query_params:
+            continue
+        if isinstance(field, serializers.ListField):
+            data[name] = query_params.getlist(name)
+        else:
+            data[name] = query_params[name]
+
+    serializer = serializer_class(data=data)
+    if not serializer.is_valid():
+        raise ValidationError(serializer.errors)
+    return serializer.validated_data
+
+
+class TaskFilter(BaseFilterBackend):
+    """
+    Narrow the task list with structured query parameters.
+
+    Every parameter maps to an indexed lookup: `status` and the due date
+    range use the (status, due_date) and (due_date, id) indexes,
+    `created_since` the (timestamp, id) index, `version_after` the version
+    index, and the tag filters resolve
+    task ids from the through table without joining duplicates into the
+    result.
+    """
+
+    def get_filters(self, request):
+        return validate_query_params(TaskFilterSerializer, request.query_params)
+
+    def filter_queryset(self, request, queryset, view):
+        filters = self.get_filters(request)
+
+        if filters.get("status"):
+            queryset = queryset.filter(status__in=filters["status"])
+        if "due_after" in filters:
+            queryset = queryset.filter(due_date__gte=filters["due_after"])
+        if "due_before" in filters:
+            queryset = queryset.filter(due_date__lte=filters["due_before"])
+        if "created_since" in filters:
+            queryset = queryset.filter(timestamp__gte=filters["created_since"])
+        if "version_after" in filters:
+            queryset = queryset.filter(version__gt=filters["version_after"])
+
+        links = Task.tags.through.objects
+        if filters.get("tags_any"):
+            queryset = queryset.filter(
+                pk__in=links.filter(tag__name__in=filters["tags_any"]).values("task_id")
+            )
+        if filters.get("tags_all"):
+            names = set(filters["tags_all"])
+            queryset = queryset.filter(
+                pk__in=links.filter(tag__name__in=names)
+                .values("task_id")
+                .annotate(matches=Count("tag_id"))
+                .filter(matches=len(names))
+                .values("task_id")
+            )
+
+        return queryset
+
+    def get_schema_operation_parameters(self, view):
+        parameters = []
+        for name, field in TaskFilterSerializer().fields.items():
+            schema = {"type": "string"}
+            if isinstance(field, serializers.DateField):
+                schema["format"] = "date"
+            elif isinstance(field, serializers.DateTimeField):
+                schema["format"] = "date-time"
+            elif isinstance(field, serializers.IntegerField):
+                schema = {"type": "integer"}
+            parameters.append(
+                {
+                    "name": name,
+                    "required": False,
+                    "in": "query",
+                    "description": field.help_text,
+                    "schema": schema,
+                }
+            )
+        return parameters
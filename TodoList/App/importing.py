@@ -0,0 +1,155 @@
+"""
+Bulk import of tasks from NDJSON or CSV, the formats written by App.export.
+
+Rows are streamed from the file and handled in batches: each batch is
+validated in Python with the rules of `TaskSerializer.validate` and
+`Task.clean` (no per-row `full_clean()` or save), then inserted with one
+`bulk_create` for the tasks and one for their tag links inside a single
+transaction. Tag names are resolved once and cached for the whole import.
+"""
+
+import csv
+import json
+from itertools import islice
+
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.utils.timezone import now
+
+from .models import Task
+from .services import set_tags_in_bulk
+from .stats import count_created_tasks
+from .signals import tasks_changed
+
+FORMATS = ("ndjson", "csv")
+
+# Rows validated and inserted per transaction
+BATCH_SIZE = 5000
+
+# Serializer limit on TextField, not enforced by the model field itself
+DESCRIPTION_MAX_LENGTH = Task._meta.get_field("description").max_length
+TAG_MAX_LENGTH = 30
+
+
+def read_rows(lines, import_format):
+    """Yield `(line number, row dict)` for the rows of an open text file."""
+    if import_format == "csv":
+        reader = csv.DictReader(lines)
+        for row in reader:
+            tags = row.get("tags") or ""
+            row["tags"] = [tag for tag in tags.split(",") if tag]
+            yield reader.line_num, row
+        return
+
+    for number, line in enumerate(lines, 1):
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError:
+            row = None
+        yield number, row
+
+
+def batched(iterable, size):
+    iterator = iter(iterable)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+class RowValidator:
+    """Validate import rows the way the API would, without touching the DB."""
+
+    fields = ("title", "description", "due_date", "status")
+
+    def __init__(self, today=None):
+        self.today = today or now().date()
+        self.model_fields = {name: Task._meta.get_field(name) for name in self.fields}
+
+    def validate(self, row):
+        """Return `(task, tag names)` for a valid row, or raise ValidationError."""
+        if not isinstance(row, dict):
+            raise ValidationError("Expected an object.")
+
+        values, errors = {}, {}
+        for name, field in self.model_fields.items():
+            value = row.get(name)
+            if value in (None, "") and name in ("due_date", "status"):
+                continue
+            try:
+                values[name] = field.clean(value, None)
+            except ValidationError as error:
+                errors[name] = error.messages
+
+        description = values.get("description", "")
+        if len(description) > DESCRIPTION_MAX_LENGTH:
+            errors["description"] = [
+                f"Ensure this field has no more than {DESCRIPTION_MAX_LENGTH} "
+                "characters."
+            ]
+
+        tags = row.get("tags") or []
+        if not isinstance(tags, list) or not all(
+            isinstance(tag, str) and 0 < len(tag) <= TAG_MAX_LENGTH for tag in tags
+        ):
+            errors["tags"] = [
+                f"Expected a list of names of at most {TAG_MAX_LENGTH} characters."
+            ]
+
+        if errors:
+            raise ValidationError(errors)
+
+        # TaskSerializer.validate: a passed due date means overdue
+        due_date = values.get("due_date")
+        status = values.get("status", Task.StatusChoices.OPEN)
+        if (
+            due_date
+            and due_date < self.today
+            and status != Task.StatusChoices.COMPLETED
+        ):
+            status = Task.StatusChoices.OVERDUE
+        # Task.clean
+        if status == Task.StatusChoices.OVERDUE and (
+            not due_date or self.today <= due_date
+        ):
+            raise ValidationError("The Task cannot be marked overdue")
+        values["status"] = status
+
+        return Task(**values), tags
+
+
+def import_tasks(rows, batch_size=BATCH_SIZE, today=None):
+    """
+    Insert the tasks of `rows` (`(line number, row)` pairs) batch by batch.
+
+    Invalid rows are skipped. Yields `(imported, errors)` after every batch,
+    `errors` being a list of `(line number, ValidationError)`.
+    """
+    validator = RowValidator(today)
+    tags = {}  # name -> Tag, shared by every batch
+
+    for batch in batched(rows, batch_size):
+        tasks, tag_names, errors = [], [], []
+        for number, row in batch:
+            try:
+                task, names = validator.validate(row)
+            except ValidationError as error:
+                errors.append((number, error))
+                continue
+            tasks.append(task)
+            tag_names.append(names)
+
+        with transaction.atomic():
+            Task.objects.bulk_create(tasks)
+            count_created_tasks(tasks)
+            tags_by_task = {
+                task.pk: names for task, names in zip(tasks, tag_names) if names
+            }
+            if tags_by_task:
+                set_tags_in_bulk(tags_by_task, replace=False, resolved=tags)
+            if tasks:
+                tasks_changed.send(
+                    sender=Task, task_ids=[task.pk for task in tasks], action="created"
+                )
+
+        yield len(tasks), errors
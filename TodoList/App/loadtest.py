@@ -0,0 +1,324 @@
+"""
+Load generator for the task API.
+
+Every simulated client is a coroutine holding its own keep-alive HTTP/1.1
+connection. Clients loop on a weighted mix of operations (list, search,
+create, update, delete) until the deadline and record the latency and
+outcome of each request. Updates and deletes only touch tasks the run
+created itself, so the existing data is left alone. Only the standard
+library is used: `asyncio` streams and a small HTTP/1.1 client.
+"""
+
+import asyncio
+import base64
+import json
+import random
+import time
+from urllib.parse import urlencode, urlsplit
+
+OPERATIONS = ("list", "search", "create", "update", "delete")
+
+DEFAULT_MIX = {"list": 50, "search": 20, "create": 15, "update": 10, "delete": 5}
+
+SEARCH_TERMS = ["task", "fix", "review", "write", "report", "meeting", "bug"]
+TAGS = ["loadtest", "loadtest-work", "loadtest-home", "loadtest-urgent"]
+STATUSES = ["OPEN", "WORKING", "PENDING_REVIEW", "COMPLETED"]
+
+
+def parse_mix(value):
+    """Parse `list=50,search=20,...` into a {operation: weight} mapping."""
+    mix = {}
+    for item in filter(None, (part.strip() for part in value.split(","))):
+        operation, _, weight = item.partition("=")
+        if operation not in OPERATIONS:
+            raise ValueError(f"Unknown operation {operation!r}")
+        try:
+            mix[operation] = float(weight)
+        except ValueError:
+            raise ValueError(f"Invalid weight for {operation!r}: {weight!r}")
+        if mix[operation] < 0:
+            raise ValueError(f"Negative weight for {operation!r}")
+    if not any(mix.values()):
+        raise ValueError("The mix needs at least one positive weight")
+    return mix
+
+
+def percentile(values, fraction):
+    """Nearest-rank percentile of the sorted list `values`."""
+    if not values:
+        return 0
+    return values[min(int(len(values) * fraction), len(values) - 1)]
+
+
+class HttpError(Exception):
+    pass
+
+
+class HttpClient:
+    """A minimal HTTP/1.1 client reusing one connection between requests."""
+
+    def __init__(self, url, username, password, timeout=30):
+        parts = urlsplit(url)
+        self.host = parts.hostname
+        self.port = parts.port or 80
+        self.prefix = parts.path.rstrip("/")
+        self.timeout = timeout
+        token = base64.b64encode(f"{username}:{password}".encode()).decode()
+        self.authorization = f"Basic {token}"
+        self.reader = self.writer = None
+
+    async def request(self, method, path, params=None, data=None):
+        """Send a request and return its status code and body."""
+        return await asyncio.wait_for(
+            self._request(method, path, params, data), self.timeout
+        )
+
+    async def _request(self, method, path, params, data):
+        target = self.prefix + path
+        if params:
+            target += "?" + urlencode(params)
+        body = b"" if data is None else json.dumps(data).encode()
+        head = [
+            f"{method} {target} HTTP/1.1",
+            f"Host: {self.host}:{self.port}",
+            f"Authorization: {self.authorization}",
+            "Accept: application/json",
+            f"Content-Length: {len(body)}",
+        ]
+        if data is not None:
+            head.append("Content-Type: application/json")
+
+        if self.writer is None:
+            self.reader, self.writer = await asyncio.open_connection(
+                self.host, self.port
+            )
+        try:
+            self.writer.write(("\r\n".join(head) + "\r\n\r\n").encode() + body)
+            await self.writer.drain()
+            status, headers, content = await self.read_response()
+        except (OSError, asyncio.IncompleteReadError) as error:
+            await self.close()
+            raise HttpError(f"connection failed: {error!r}")
+
+        if headers.get("connection", "").lower() == "close" or (
+            "content-length" not in headers
+            and headers.get("transfer-encoding") != "chunked"
+        ):
+            await self.close()
+        return status, content
+
+    async def read_response(self):
+        status_line = await self.reader.readline()
+        if not status_line:
+            raise asyncio.IncompleteReadError(b"", None)
+        status = int(status_line.split()[1])
+
+        headers = {}
+        while True:
+            line = (await self.reader.readline()).decode("latin-1").strip()
+            if not line:
+                break
+            name, _, value = line.partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        if "content-length" in headers:
+            content = await self.reader.readexactly(int(headers["content-length"]))
+        elif headers.get("transfer-encoding") == "chunked":
+            content = await self.read_chunks()
+        else:
+            content = await self.reader.read()
+        return status, headers, content
+
+    async def read_chunks(self):
+        chunks = []
+        while True:
+            size = int((await self.reader.readline()).split(b";")[0], 16)
+            if size == 0:
+                await self.reader.readline()
+                return b"".join(chunks)
+            chunks.append(await self.reader.readexactly(size))
+            await self.reader.readline()
+
+    async def close(self):
+        if self.writer is not None:
+            self.writer.close()
+            try:
+                await self.writer.wait_closed()
+            except OSError:
+                pass
+        self.reader = self.writer = None
+
+
+class Results:
+    """Latencies and outcomes of the requests, per operation."""
+
+    def __init__(self):
+        self.latencies = {operation: [] for operation in OPERATIONS}
+        self.errors = {operation: {} for operation in OPERATIONS}
+        self.elapsed = 0
+
+    def record(self, operation, latency, error=None):
+        self.latencies[operation].append(latency)
+        if error is not None:
+            errors = self.errors[operation]
+            errors[error] = errors.get(error, 0) + 1
+
+    def summary(self):
+        """Return the throughput, error rate and latency percentiles (in ms)."""
+        operations = {}
+        for operation in OPERATIONS:
+            latencies = sorted(self.latencies[operation])
+            if not latencies:
+                continue
+            errors = sum(self.errors[operation].values())
+            operations[operation] = {
+                "requests": len(latencies),
+                "errors": errors,
+                "error_rate": errors / len(latencies),
+                "error_kinds": dict(sorted(self.errors[operation].items())),
+                "p50_ms": percentile(latencies, 0.5) * 1000,
+                "p90_ms": percentile(latencies, 0.9) * 1000,
+                "p99_ms": percentile(latencies, 0.99) * 1000,
+                "max_ms": latencies[-1] * 1000,
+            }
+
+        everything = sorted(
+            latency for latencies in self.latencies.values() for latency in latencies
+        )
+        errors = sum(stats["errors"] for stats in operations.values())
+        return {
+            "elapsed": self.elapsed,
+            "requests": len(everything),
+            "throughput": len(everything) / self.elapsed if self.elapsed else 0,
+            "errors": errors,
+            "error_rate": errors / len(everything) if everything else 0,
+            "p50_ms": percentile(everything, 0.5) * 1000,
+            "p90_ms": percentile(everything, 0.9) * 1000,
+            "p99_ms": percentile(everything, 0.99) * 1000,
+            "operations": operations,
+        }
+
+
+class LoadTest:
+    """
+    Run `clients` concurrent clients against the API at `url` for
+    `duration` seconds. `users` is a list of (username, password) pairs
+    shared round-robin between the clients.
+    """
+
+    def __init__(self, url, users, clients=50, duration=10, mix=None, seed=None):
+        self.url = url
+        self.users = users
+        self.clients = clients
+        self.duration = duration
+        mix = mix or DEFAULT_MIX
+        self.operations = [operation for operation in mix if mix[operation] > 0]
+        self.weights = [mix[operation] for operation in self.operations]
+        self.seed = seed
+        self.created = []  # ids of the tasks created and not deleted yet
+        self.pages = 1
+        self.results = Results()
+
+    def run(self):
+        return asyncio.run(self.main())
+
+    async def main(self):
+        await self.warm_up()
+        rng = random.Random(self.seed)
+        started = time.perf_counter()
+        deadline = started + self.duration
+        await asyncio.gather(
+            *(
+                self.client(index, deadline, random.Random(rng.getrandbits(32)))
+                for index in range(self.clients)
+            )
+        )
+        self.results.elapsed = time.perf_counter() - started
+        return self.results
+
+    async def warm_up(self):
+        """
+        Authenticate every user once, so the password hashing is cached by
+        the server before the clock starts, and count the pages of tasks.
+        """
+        for username, password in self.users:
+            http = HttpClient(self.url, username, password)
+            try:
+                status, content = await http.request("GET", "/tasks/")
+            finally:
+                await http.close()
+            if status != 200:
+                raise HttpError(f"GET /tasks/ as {username} returned HTTP {status}")
+
+        page = json.loads(content)
+        if page["results"]:
+            self.pages = -(-page["count"] // len(page["results"]))
+
+    async def client(self, index, deadline, rng):
+        username, password = self.users[index % len(self.users)]
+        http = HttpClient(self.url, username, password)
+        try:
+            while time.perf_counter() < deadline:
+                operation = rng.choices(self.operations, self.weights)[0]
+                await self.perform(http, operation, rng)
+        finally:
+            await http.close()
+
+    async def perform(self, http, operation, rng):
+        # Updates and deletes need a task of this run, create one otherwise
+        if operation in ("update", "delete") and not self.created:
+            operation = "create"
+        method, path, params, data, expected = self.build(operation, rng)
+
+        started = time.perf_counter()
+        error = None
+        try:
+            status, content = await http.request(method, path, params, data)
+        except asyncio.TimeoutError:
+            error = "timeout"
+        except HttpError:
+            error = "connection error"
+        else:
+            if status != expected:
+                error = f"HTTP {status}"
+        self.results.record(operation, time.perf_counter() - started, error)
+
+        if operation == "create" and error is None:
+            self.created.append(json.loads(content)["id"])
+
+    def build(self, operation, rng):
+        """Return the method, path, query, body and expected status of a request."""
+        if operation == "list":
+            # Filtered lists have fewer pages, they only ask for the first one
+            if rng.random() < 0.3:
+                params = {"status": rng.choice(STATUSES)}
+            else:
+                params = {"page": rng.randint(1, self.pages)}
+            return "GET", "/tasks/", params, None, 200
+        if operation == "search":
+            return "GET", "/tasks/", {"search": rng.choice(SEARCH_TERMS)}, None, 200
+        if operation == "create":
+            data = {
+                "title": f"Load test {rng.choice(SEARCH_TERMS)}",
+                "description": "Created by the load test",
+                "tags": rng.sample(TAGS, rng.randint(0, 2)),
+            }
+            return "POST", "/tasks/", None, data, 201
+        if operation == "update":
+            pk = rng.choice(self.created)
+            data = {"status": rng.choice(STATUSES), "tags": rng.sample(TAGS, 1)}
+            return "PATCH", f"/tasks/{pk}/", None, data, 200
+        # Popped up front so two clients never delete the same task
+        pk = self.created.pop(rng.randrange(len(self.created)))
+        return "DELETE", f"/tasks/{pk}/", None, None, 204
+
+    async def cleanup(self, batch_size=500):
+        """Delete the tasks created by the run, through the bulk endpoint."""
+        http = HttpClient(self.url, *self.users[0])
+        try:
+            while self.created:
+                ids = self.created[-batch_size:]
+                del self.created[-batch_size:]
+                await http.request("DELETE", "/tasks/bulk/", data={"ids": ids})
+        finally:
+            await http.close()
@@ -0,0 +1,163 @@
+import random
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import OperationalError, connections, transaction
+
+from App.models import Task
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure mixed read/write throughput of concurrent clients against a "
+        "scratch SQLite database for each DATABASE_PROFILES entry."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--profiles",
+            nargs="+",
+            default=list(settings.DATABASE_PROFILES),
+            help="Profiles to compare (default: all of DATABASE_PROFILES).",
+        )
+        parser.add_argument(
+            "--threads", type=int, default=8, help="Concurrent clients (default: 8)."
+        )
+        parser.add_argument(
+            "--duration",
+            type=float,
+            default=5,
+            help="Seconds to run each profile for (default: 5).",
+        )
+        parser.add_argument(
+            "--write-ratio",
+            type=float,
+            default=0.2,
+            help="Share of requests that write (default: 0.2).",
+        )
+        parser.add_argument(
+            "--tasks",
+            type=int,
+            default=2000,
+            help="Tasks in the scratch database (default: 2000).",
+        )
+
+    def handle(self, *args, **options):
+        unknown = set(options["profiles"]) - set(settings.DATABASE_PROFILES)
+        if unknown:
+            raise CommandError(f"Unknown profile(s): {', '.join(sorted(unknown))}")
+
+        self.stdout.write(
+            f"{options['threads']} client(s), {options['duration']}s per profile, "
+            f"{options['write_ratio']:.0%} writes"
+        )
+        with tempfile.TemporaryDirectory() as directory:
+            for profile in options["profiles"]:
+                path = Path(directory) / f"{profile}.sqlite3"
+                alias = self.add_database(profile, path)
+                try:
+                    self.seed(alias, options["tasks"])
+                    result = self.run(alias, options)
+                finally:
+                    self.remove_database(alias)
+                self.report(profile, result, options["duration"])
+
+    def add_database(self, profile, path):
+        """Register a connection alias for `profile` on the file at `path`."""
+        alias = f"benchmark_{profile}"
+        databases = {
+            **connections.settings,
+            alias: {
+                "ENGINE": "django.db.backends.sqlite3",
+                "NAME": str(path),
+                **settings.DATABASE_PROFILES[profile],
+            },
+        }
+        connections.settings[alias] = connections.configure_settings(databases)[alias]
+        return alias
+
+    def remove_database(self, alias):
+        """Close and forget the connection alias registered by `add_database`."""
+        connections[alias].close()
+        # The wrapper is cached per thread, it would outlive its settings
+        del connections[alias]
+        del connections.settings[alias]
+
+    def seed(self, alias, count):
+        call_command("migrate", database=alias, verbosity=0)
+        # bulk_create skips the model signals, which write to "default"
+        Task.objects.using(alias).bulk_create(
+            Task(title=f"Task {i}", description="Benchmark task") for i in range(count)
+        )
+        connections[alias].close()
+
+    def run(self, alias, options):
+        deadline = time.monotonic() + options["duration"]
+        results = []
+        lock = threading.Lock()
+
+        def client():
+            result = self.client(alias, deadline, options["write_ratio"])
+            with lock:
+                results.append(result)
+
+        threads = [threading.Thread(target=client) for _ in range(options["threads"])]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        total = {"reads": 0, "writes": 0, "errors": 0, "latencies": []}
+        for result in results:
+            for key, value in result.items():
+                total[key] += value
+        return total
+
+    def client(self, alias, deadline, write_ratio):
+        """Issue requests until `deadline`, like one server worker thread."""
+        connection = connections[alias]
+        rng = random.Random()
+        result = {"reads": 0, "writes": 0, "errors": 0, "latencies": []}
+        tasks = Task.objects.using(alias)
+        last_id = tasks.order_by("-pk").values_list("pk", flat=True).first()
+
+        while time.monotonic() < deadline:
+            # What the request_started/request_finished handlers do
+            connection.close_if_unusable_or_obsolete()
+            started = time.perf_counter()
+            try:
+                if rng.random() < write_ratio:
+                    with transaction.atomic(using=alias):
+                        # Read before writing, as validation would
+                        task = tasks.get(pk=rng.randint(1, last_id))
+                        tasks.filter(pk=task.pk).update(title=f"Task {rng.random()}")
+                        tasks.bulk_create(
+                            [Task(title="New task", description="Benchmark task")]
+                        )
+                    result["writes"] += 1
+                else:
+                    start = rng.randint(0, max(last_id - 10, 0))
+                    end = start + 10
+                    list(tasks.prefetch_related("tags")[start:end])
+                    result["reads"] += 1
+                result["latencies"].append(time.perf_counter() - started)
+            except OperationalError:
+                result["errors"] += 1
+            connection.close_if_unusable_or_obsolete()
+
+        connection.close()
+        return result
+
+    def report(self, profile, result, duration):
+        latencies = sorted(result["latencies"]) or [0]
+        p95 = latencies[int((len(latencies) - 1) * 0.95)]
+        self.stdout.write(
+            f"{profile:>12}: {result['reads'] / duration:8.0f} reads/s "
+            f"{result['writes'] / duration:8.0f} writes/s "
+            f"{result['errors']:6d} errors  p95 {p95 * 1000:.1f}ms"
+        )
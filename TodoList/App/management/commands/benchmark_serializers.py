@@ -0,0 +1,99 @@
+import random
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from App.importing import import_tasks
+from App.models import Task
+from App.serializers import TaskReadSerializer, TaskSerializer
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare the time TaskSerializer and the TaskReadSerializer fast path "
+        "take to load and serialize pages of tasks. Scratch tasks are created "
+        "in a transaction that is rolled back."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--page-sizes",
+            nargs="+",
+            type=int,
+            default=[100, 250, 500, 1000],
+            help="Page sizes to measure (default: 100 250 500 1000).",
+        )
+        parser.add_argument(
+            "--repeat",
+            type=int,
+            default=20,
+            help="Pages serialized per page size and path (default: 20).",
+        )
+        parser.add_argument(
+            "--tags",
+            type=int,
+            default=3,
+            help="Tags drawn for each scratch task (default: 3).",
+        )
+
+    def handle(self, *args, **options):
+        page_sizes = options["page_sizes"]
+        if min(page_sizes) < 1 or options["repeat"] < 1:
+            raise CommandError("Page sizes and --repeat must be at least 1.")
+
+        with transaction.atomic():
+            self.seed(max(page_sizes), options["tags"])
+            self.stdout.write(
+                f"{'page size':>9} {'serializer':>15} {'fast path':>15} {'speedup':>8}"
+            )
+            for page_size in page_sizes:
+                self.compare(page_size, options["repeat"])
+            transaction.set_rollback(True)
+
+    def seed(self, count, max_tags):
+        rng = random.Random(0)
+        rows = (
+            (
+                number,
+                {
+                    "title": f"Benchmark task {number}",
+                    "description": "A task created to benchmark serialization",
+                    "due_date": None,
+                    "status": "OPEN",
+                    "tags": [f"benchmark{rng.randrange(50)}" for _ in range(max_tags)],
+                },
+            )
+            for number in range(count)
+        )
+        for _ in import_tasks(rows):
+            pass
+
+    def compare(self, page_size, repeat):
+        queryset = Task.objects.order_by("-pk")
+
+        def serializer():
+            page = list(queryset.prefetch_related("tags")[:page_size])
+            return TaskSerializer(page, many=True).data
+
+        def fast_path():
+            page = list(TaskReadSerializer.rows(queryset)[:page_size])
+            return TaskReadSerializer(page, many=True).data
+
+        if serializer() != fast_path():
+            raise CommandError(f"The outputs differ for pages of {page_size} tasks.")
+
+        slow, fast = self.measure(serializer, repeat), self.measure(fast_path, repeat)
+        self.stdout.write(
+            f"{page_size:9d} {page_size / slow:8.0f} tasks/s "
+            f"{page_size / fast:8.0f} tasks/s {slow / fast:7.1f}x"
+        )
+
+    def measure(self, serialize, repeat):
+        """Return the best time out of `repeat` runs of `serialize`."""
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            serialize()
+            timings.append(time.perf_counter() - started)
+        return min(timings)
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from App.services import remove_orphan_tags
+
+
+class Command(BaseCommand):
+    help = "Delete every tag that is not attached to any task."
+
+    def handle(self, *args, **options):
+        deleted = remove_orphan_tags()
+        self.stdout.write(self.style.SUCCESS(f"Deleted {deleted} orphan tag(s)"))
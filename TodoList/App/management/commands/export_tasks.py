@@ -0,0 +1,50 @@
+from django.core.management.base import BaseCommand
+
+from App.export import CHUNK_SIZE, FORMATS, export_lines
+from App.models import Task
+
+
+class Command(BaseCommand):
+    help = "Export every task as NDJSON or CSV, streamed chunk by chunk."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--format",
+            choices=sorted(FORMATS),
+            default="ndjson",
+            dest="export_format",
+            help="Output format (default: ndjson).",
+        )
+        parser.add_argument(
+            "--output",
+            "-o",
+            help="File to write to (default: standard output).",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=CHUNK_SIZE,
+            help=f"Tasks fetched per query (default: {CHUNK_SIZE}).",
+        )
+
+    def handle(self, *args, **options):
+        lines = export_lines(
+            Task.objects.all(),
+            options["export_format"],
+            chunk_size=options["chunk_size"],
+        )
+        if not options["output"]:
+            for line in lines:
+                self.stdout.write(line, ending="")
+            return
+
+        count = 0
+        with open(options["output"], "w", encoding="utf-8", newline="") as output:
+            for line in lines:
+                output.write(line)
+                count += 1
+        if options["export_format"] == "csv":
+            count -= 1  # header
+        self.stderr.write(
+            self.style.SUCCESS(f"Exported {count} task(s) to {options['output']}")
+        )
@@ -0,0 +1,73 @@
+import sys
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from App.importing import BATCH_SIZE, FORMATS, import_tasks, read_rows
+
+
+class Command(BaseCommand):
+    help = (
+        "Import tasks from an NDJSON or CSV file (as written by export_tasks). "
+        "Rows are validated and inserted in batches, invalid rows are skipped."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="File to import, or - for standard input.")
+        parser.add_argument(
+            "--format",
+            choices=FORMATS,
+            dest="import_format",
+            help="Input format (default: guessed from the file extension).",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=BATCH_SIZE,
+            help=f"Rows inserted per transaction (default: {BATCH_SIZE}).",
+        )
+
+    def handle(self, *args, **options):
+        path = options["path"]
+        import_format = options["import_format"] or (
+            "csv" if path.lower().endswith(".csv") else "ndjson"
+        )
+
+        if path == "-":
+            self.load(sys.stdin, import_format, options)
+            return
+        try:
+            lines = open(path, encoding="utf-8", newline="")
+        except OSError as error:
+            raise CommandError(error)
+        with lines:
+            self.load(lines, import_format, options)
+
+    def load(self, lines, import_format, options):
+        verbosity = options["verbosity"]
+        started = time.perf_counter()
+        imported = invalid = batches = 0
+
+        rows = read_rows(lines, import_format)
+        for count, errors in import_tasks(rows, batch_size=options["batch_size"]):
+            imported += count
+            invalid += len(errors)
+            batches += 1
+            for number, error in errors:
+                if verbosity >= 1:
+                    self.stderr.write(f"line {number}: {'; '.join(error.messages)}")
+            if verbosity >= 2:
+                elapsed = time.perf_counter() - started
+                self.stdout.write(
+                    f"batch {batches}: {imported} task(s), "
+                    f"{imported / elapsed:.0f} rows/s"
+                )
+
+        elapsed = time.perf_counter() - started
+        rate = (imported + invalid) / elapsed if elapsed else 0
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Imported {imported} task(s), skipped {invalid} invalid row(s) "
+                f"in {elapsed:.2f}s ({rate:.0f} rows/s)"
+            )
+        )
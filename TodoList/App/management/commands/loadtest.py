@@ -0,0 +1,248 @@
+import asyncio
+import importlib.util
+import json
+import secrets
+import socket
+import subprocess
+import sys
+import time
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+
+from App.loadtest import DEFAULT_MIX, OPERATIONS, HttpError, LoadTest, parse_mix
+
+# Servers --server=auto tries, in order. runserver is the fallback: it is
+# single process and not meant for production, so its numbers only compare
+# runs with each other.
+PRODUCTION_SERVERS = ("uvicorn", "daphne", "gunicorn")
+SERVERS = ("auto", *PRODUCTION_SERVERS, "runserver")
+
+
+class Command(BaseCommand):
+    help = (
+        "Drive a mix of list/search/create/update/delete requests against the "
+        "task API with concurrent clients, and report throughput, latency "
+        "percentiles and error rates. Starts a local server unless --url is "
+        "given: the ASGI application under uvicorn or daphne, or the WSGI one "
+        "under gunicorn, whichever is installed, else runserver."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--url",
+            help="Base URL of a running API, e.g. http://127.0.0.1:8000/api "
+            "(default: start --server on a free port for the run).",
+        )
+        parser.add_argument(
+            "--server",
+            choices=SERVERS,
+            default="auto",
+            help="Server to start when no --url is given (default: the first "
+            f"installed of {', '.join(PRODUCTION_SERVERS)}, else runserver).",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=1,
+            help="Worker processes of the started uvicorn or gunicorn (default: 1).",
+        )
+        parser.add_argument(
+            "--clients", type=int, default=50, help="Concurrent clients (default: 50)."
+        )
+        parser.add_argument(
+            "--duration",
+            type=float,
+            default=10,
+            help="Seconds to run for (default: 10).",
+        )
+        parser.add_argument(
+            "--mix",
+            default=",".join(
+                f"{name}={weight}" for name, weight in DEFAULT_MIX.items()
+            ),
+            help="Relative weight of each operation (default: %(default)s).",
+        )
+        parser.add_argument(
+            "--users",
+            type=int,
+            default=5,
+            help="Basic auth users created for the run (default: 5).",
+        )
+        parser.add_argument(
+            "--seed", type=int, help="Random seed, to replay the same traffic."
+        )
+        parser.add_argument("--output", help="Also write the results as JSON here.")
+        parser.add_argument(
+            "--keep",
+            action="store_true",
+            help="Keep the users and tasks created by the run.",
+        )
+
+    def handle(self, *args, **options):
+        try:
+            mix = parse_mix(options["mix"])
+        except ValueError as error:
+            raise CommandError(error)
+        if min(options["clients"], options["users"], options["workers"]) < 1:
+            raise CommandError("--clients, --users and --workers must be at least 1.")
+        name = None if options["url"] else self.pick_server(options["server"])
+
+        users = self.create_users(options["users"])
+        server = None
+        try:
+            url = options["url"]
+            if not url:
+                server, url = self.start_server(name, options["workers"])
+            loadtest = LoadTest(
+                url,
+                users,
+                clients=options["clients"],
+                duration=options["duration"],
+                mix=mix,
+                seed=options["seed"],
+            )
+            self.stdout.write(
+                f"{options['clients']} client(s) for {options['duration']}s "
+                f"against {url}"
+            )
+            try:
+                summary = loadtest.run().summary()
+            except HttpError as error:
+                raise CommandError(error)
+            summary.update(self.describe_server(name, options["workers"]))
+            if not options["keep"]:
+                asyncio.run(loadtest.cleanup())
+        finally:
+            if server is not None:
+                server.terminate()
+                server.wait()
+            if not options["keep"]:
+                User.objects.filter(username__in=[name for name, _ in users]).delete()
+
+        self.report(summary)
+        if options["output"]:
+            with open(options["output"], "w") as output:
+                json.dump(summary, output, indent=2)
+                output.write("\n")
+
+    def create_users(self, count):
+        """Create `count` users with random credentials for this run."""
+        run = secrets.token_hex(4)
+        users = [
+            (f"loadtest-{run}-{number}", secrets.token_urlsafe(16))
+            for number in range(count)
+        ]
+        for username, password in users:
+            User.objects.create_user(username=username, password=password)
+        return users
+
+    def pick_server(self, name):
+        """Resolve --server to an installed server."""
+        if name == "runserver":
+            return name
+        candidates = PRODUCTION_SERVERS if name == "auto" else (name,)
+        for candidate in candidates:
+            if importlib.util.find_spec(candidate) is not None:
+                return candidate
+        if name != "auto":
+            raise CommandError(f"{name} is not installed.")
+        self.stderr.write(
+            f"None of {', '.join(PRODUCTION_SERVERS)} is installed, falling back "
+            "to runserver: its numbers do not reflect a production deployment."
+        )
+        return "runserver"
+
+    def server_command(self, name, port, workers):
+        """The command line serving the project with `name` on `port`."""
+        host, port, workers = "127.0.0.1", str(port), str(workers)
+        if name == "runserver":
+            manage = str(settings.BASE_DIR / "manage.py")
+            return [sys.executable, manage, "runserver", "--noreload", f"{host}:{port}"]
+
+        if name == "uvicorn":
+            args = ["TodoList.asgi:application", "--host", host, "--port", port]
+            args += ["--workers", workers, "--no-access-log"]
+        elif name == "daphne":
+            args = ["-b", host, "-p", port, "TodoList.asgi:application"]
+        else:
+            # --threads switches to threaded workers, like the thread pool
+            # Django runs sync views in
+            args = ["TodoList.wsgi:application", "--bind", f"{host}:{port}"]
+            args += ["--workers", workers, "--threads", "8"]
+        return [sys.executable, "-m", name, *args]
+
+    def describe_server(self, name, workers):
+        """The server and database setup measured, reported with the results."""
+        if name is None:
+            return {"server": "external", "database_profile": None}
+        if name in ("uvicorn", "gunicorn"):
+            server = f"{name} ({workers} worker(s))"
+        else:
+            server = name
+        return {
+            "server": server,
+            "application": "WSGI" if name in ("gunicorn", "runserver") else "ASGI",
+            "database_profile": settings.DATABASE_PROFILE,
+            "database_replicas": len(settings.DATABASE_REPLICAS),
+        }
+
+    def start_server(self, name, workers, timeout=30):
+        """Start the `name` server on a free local port and wait until it accepts."""
+        with socket.socket() as probe:
+            probe.bind(("127.0.0.1", 0))
+            port = probe.getsockname()[1]
+
+        # The children read the same settings, database profile included
+        server = subprocess.Popen(
+            self.server_command(name, port, workers),
+            cwd=settings.BASE_DIR,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if server.poll() is not None:
+                raise CommandError(f"{name} exited before accepting connections.")
+            try:
+                socket.create_connection(("127.0.0.1", port), timeout=1).close()
+                return server, f"http://127.0.0.1:{port}/api"
+            except OSError:
+                time.sleep(0.1)
+        server.terminate()
+        raise CommandError(f"{name} did not start within {timeout}s.")
+
+    def report(self, summary):
+        if summary["database_profile"] is not None:
+            self.stdout.write(
+                f"server: {summary['server']} ({summary['application']}), "
+                f"database profile: {summary['database_profile']}, "
+                f"{summary['database_replicas']} replica(s)"
+            )
+        else:
+            self.stdout.write("server: external")
+        self.stdout.write(
+            f"{'operation':>10} {'requests':>9} {'errors':>7} "
+            f"{'p50':>8} {'p90':>8} {'p99':>8} {'max':>8}"
+        )
+        for operation in OPERATIONS:
+            stats = summary["operations"].get(operation)
+            if stats is None:
+                continue
+            self.stdout.write(
+                f"{operation:>10} {stats['requests']:9d} {stats['error_rate']:7.1%} "
+                f"{stats['p50_ms']:6.1f}ms {stats['p90_ms']:6.1f}ms "
+                f"{stats['p99_ms']:6.1f}ms {stats['max_ms']:6.1f}ms"
+            )
+            for kind, count in stats["error_kinds"].items():
+                self.stdout.write(f"{'':>10} {count:9d} {kind}")
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{summary['requests']} request(s) in {summary['elapsed']:.1f}s: "
+                f"{summary['throughput']:.0f} req/s, "
+                f"{summary['error_rate']:.1%} errors, "
+                f"p50 {summary['p50_ms']:.1f}ms p99 {summary['p99_ms']:.1f}ms"
+            )
+        )
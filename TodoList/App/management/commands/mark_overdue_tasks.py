@@ -0,0 +1,55 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from App.services import mark_overdue_tasks
+
+
+class Command(BaseCommand):
+    help = (
+        "Mark every past due task that is not completed as OVERDUE. "
+        "Run it periodically (cron) or keep it running with --interval."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=1000,
+            help="Number of tasks switched by each UPDATE (default: 1000).",
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=0,
+            help="Sweep again every INTERVAL seconds instead of exiting.",
+        )
+
+    def handle(self, *args, **options):
+        self.verbosity = options["verbosity"]
+        while True:
+            self.sweep(options["chunk_size"])
+            if not options["interval"]:
+                return
+            time.sleep(options["interval"])
+
+    def sweep(self, chunk_size):
+        started = time.perf_counter()
+        total = chunks = 0
+
+        for last_id, updated in mark_overdue_tasks(chunk_size=chunk_size):
+            total += updated
+            chunks += 1
+            if self.verbosity >= 2:
+                self.stdout.write(
+                    f"chunk {chunks}: up to id {last_id}, {updated} task(s)"
+                )
+
+        elapsed = time.perf_counter() - started
+        rate = total / elapsed if elapsed else 0
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Marked {total} task(s) overdue in {chunks} chunk(s), "
+                f"{elapsed:.2f}s ({rate:.0f} tasks/s)"
+            )
+        )
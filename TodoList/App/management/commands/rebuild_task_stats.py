@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+
+from App.services import reconcile_tag_usage
+from App.stats import rebuild_task_stats
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute the task statistics summary from the task table and repair "
+        "the tag usage counts the per-tag statistics are read from."
+    )
+
+    def handle(self, *args, **options):
+        rows = rebuild_task_stats()
+        repaired = reconcile_tag_usage()
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Rebuilt {rows} summary row(s), repaired {repaired} tag count(s)"
+            )
+        )
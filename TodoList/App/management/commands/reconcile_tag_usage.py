@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from App.services import reconcile_tag_usage
+
+
+class Command(BaseCommand):
+    help = "Recount the number of tasks carrying each tag where it drifted."
+
+    def handle(self, *args, **options):
+        repaired = reconcile_tag_usage()
+        self.stdout.write(self.style.SUCCESS(f"Repaired {repaired} tag count(s)"))
@@ -0,0 +1,40 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from App.replication import sync_replicas
+from App.routers import get_replicas
+
+
+class Command(BaseCommand):
+    help = (
+        "Copy the primary SQLite database into the DATABASE_REPLICAS files. "
+        "For local replica setups; run it once or keep it running with --interval."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "aliases", nargs="*", help="Replicas to sync (default: all of them)."
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=0,
+            help="Sync again every INTERVAL seconds instead of exiting.",
+        )
+
+    def handle(self, *args, **options):
+        unknown = set(options["aliases"]) - set(get_replicas())
+        if unknown:
+            raise CommandError(f"Not a replica: {', '.join(sorted(unknown))}")
+
+        while True:
+            started = time.perf_counter()
+            synced = sync_replicas(options["aliases"])
+            elapsed = time.perf_counter() - started
+            self.stdout.write(
+                self.style.SUCCESS(f"Synced {len(synced)} replica(s) in {elapsed:.2f}s")
+            )
+            if not options["interval"]:
+                return
+            time.sleep(options["interval"])
@@ -0,0 +1,215 @@
+"""
+Per route performance metrics.
+
+`PerformanceMiddleware` (enabled with `PERFORMANCE_METRICS`) times every
+request and counts its database queries and the time spent serializing.
+The figures are sent back in a `Server-Timing` header and aggregated, per
+route name (`task-list`, `task-detail`...), into in-process histograms.
+`/api/metrics/` serves them in the Prometheus text format. Each process
+keeps its own histograms, so scrape every worker.
+
+Queries are counted by an execute wrapper installed on every database
+connection (see App.receivers), which also sees the queries async views
+run in the ORM's worker thread.
+"""
+
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+
+PREFIX = "todolist"
+
+
+class Histogram:
+    def __init__(self, name, documentation, buckets):
+        self.name = f"{PREFIX}_{name}"
+        self.documentation = documentation
+        self.buckets = tuple(buckets)
+        self._series = {}  # route -> [bucket counts..., sum, count]
+        self._lock = threading.Lock()
+
+    def observe(self, route, value):
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(route)
+            if series is None:
+                series = self._series[route] = [0] * (len(self.buckets) + 2)
+            if index < len(self.buckets):
+                series[index] += 1
+            series[-2] += value
+            series[-1] += 1
+
+    def reset(self):
+        with self._lock:
+            self._series.clear()
+
+    def collect(self):
+        """Yield the lines of the histogram in the Prometheus text format."""
+        yield f"# HELP {self.name} {self.documentation}"
+        yield f"# TYPE {self.name} histogram"
+        with self._lock:
+            series = {route: list(values) for route, values in self._series.items()}
+
+        for route, values in sorted(series.items()):
+            label = f'route="{escape(route)}"'
+            cumulative = 0
+            for bound, count in zip(self.buckets, values):
+                cumulative += count
+                yield f'{self.name}_bucket{{{label},le="{bound:g}"}} {cumulative}'
+            yield f'{self.name}_bucket{{{label},le="+Inf"}} {values[-1]}'
+            yield f"{self.name}_sum{{{label}}} {values[-2]:g}"
+            yield f"{self.name}_count{{{label}}} {values[-1]}"
+
+
+def escape(value):
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+SECONDS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+REQUEST_DURATION = Histogram(
+    "request_duration_seconds", "Wall time spent handling requests.", SECONDS
+)
+DB_QUERIES = Histogram(
+    "db_queries", "Database queries run per request.", (0, 1, 2, 3, 5, 10, 20, 50, 100)
+)
+DB_DURATION = Histogram(
+    "db_duration_seconds", "Time spent in database queries per request.", SECONDS
+)
+SERIALIZER_DURATION = Histogram(
+    "serializer_duration_seconds",
+    "Time spent serializing response data per request.",
+    SECONDS,
+)
+RESPONSE_SIZE = Histogram(
+    "response_size_bytes",
+    "Size of the response bodies (streamed responses are not counted).",
+    (100, 1_000, 10_000, 100_000, 1_000_000, 10_000_000),
+)
+HISTOGRAMS = [
+    REQUEST_DURATION,
+    DB_QUERIES,
+    DB_DURATION,
+    SERIALIZER_DURATION,
+    RESPONSE_SIZE,
+]
+
+
+def render_metrics():
+    lines = [line for histogram in HISTOGRAMS for line in histogram.collect()]
+    return "\n".join(lines) + "\n"
+
+
+def reset_metrics():
+    for histogram in HISTOGRAMS:
+        histogram.reset()
+
+
+class RequestTimings:
+    __slots__ = ("queries", "db_time", "serializer_time")
+
+    def __init__(self):
+        self.queries = 0
+        self.db_time = 0.0
+        self.serializer_time = 0.0
+
+
+_current = ContextVar("request_timings", default=None)
+
+
+def record_query(execute, sql, params, many, context):
+    """Execute wrapper adding every query to the current request's timings."""
+    timings = _current.get()
+    if timings is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        timings.db_time += time.perf_counter() - started
+        timings.queries += 1
+
+
+def instrument_connection(connection):
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+@contextmanager
+def timing_serializer():
+    """Add the time spent in the block to the current request's timings."""
+    timings = _current.get()
+    if timings is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings.serializer_time += time.perf_counter() - started
+
+
+class TimedSerializerMixin:
+    """Count the time spent building `serializer.data` as serializer time."""
+
+    @property
+    def data(self):
+        with timing_serializer():
+            return super().data
+
+
+class PerformanceMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        timings = RequestTimings()
+        token = _current.set(timings)
+        started = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        return self.process_response(request, response, timings, started)
+
+    async def __acall__(self, request):
+        timings = RequestTimings()
+        token = _current.set(timings)
+        started = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            _current.reset(token)
+        return self.process_response(request, response, timings, started)
+
+    def process_response(self, request, response, timings, started):
+        elapsed = time.perf_counter() - started
+        match = getattr(request, "resolver_match", None)
+        route = (match and match.view_name) or "unmatched"
+
+        REQUEST_DURATION.observe(route, elapsed)
+        DB_QUERIES.observe(route, timings.queries)
+        DB_DURATION.observe(route, timings.db_time)
+        SERIALIZER_DURATION.observe(route, timings.serializer_time)
+        if not response.streaming:
+            RESPONSE_SIZE.observe(route, len(response.content))
+
+        response["Server-Timing"] = ", ".join(
+            [
+                f"total;dur={elapsed * 1000:.1f}",
+                f'db;dur={timings.db_time * 1000:.1f};desc="{timings.queries} queries"',
+                f"serialize;dur={timings.serializer_time * 1000:.1f}",
+            ]
+        )
+        return response
@@ -0,0 +1,68 @@
+# Full-text index over task titles, descriptions and tag names.
+#
+# The index is an SQLite FTS5 table keyed by the task id, filled here from the
+# existing tasks and kept in sync by the signal receivers of App.receivers.
+# There are no triggers: SQLite rebuilds a table to alter most of its columns,
+# which would drop or break them on later schema changes of Task or Tag.
+# Other databases (or SQLite builds without FTS5) skip it and search falls
+# back to `LIKE` lookups.
+
+from django.db import migrations
+
+TASK_TAG_NAMES = """
+    coalesce((
+        SELECT group_concat(tag.name, ' ')
+        FROM "App_tag" tag
+        JOIN "App_task_tags" link ON link.tag_id = tag.id
+        WHERE link.task_id = {task_id}
+    ), '')
+"""
+
+CREATE_INDEX = [
+    """
+    CREATE VIRTUAL TABLE "App_task_fts" USING fts5(
+        title, description, tags, tokenize = 'unicode61 remove_diacritics 2'
+    )
+    """,
+    f"""
+    INSERT INTO "App_task_fts" (rowid, title, description, tags)
+    SELECT task.id, task.title, task.description,
+        {TASK_TAG_NAMES.format(task_id="task.id")}
+    FROM "App_task" task
+    """,
+]
+
+DROP_INDEX = [
+    'DROP TABLE IF EXISTS "App_task_fts"',
+]
+
+
+def fts5_available(connection):
+    if connection.vendor != "sqlite":
+        return False
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT sqlite_compileoption_used('ENABLE_FTS5')")
+        return bool(cursor.fetchone()[0])
+
+
+def create_index(apps, schema_editor):
+    if fts5_available(schema_editor.connection):
+        for statement in CREATE_INDEX:
+            schema_editor.execute(statement)
+
+
+def drop_index(apps, schema_editor):
+    if schema_editor.connection.vendor == "sqlite":
+        for statement in DROP_INDEX:
+            schema_editor.execute(statement)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("App", "0004_remove_tag_taskcount"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_index, drop_index),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 5.1.4 on 2026-10-18 18:38
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def count_tag_usage(apps, schema_editor):
+    Tag = apps.get_model("App", "Tag")
+    Task = apps.get_model("App", "Task")
+    db_alias = schema_editor.connection.alias
+    usage = (
+        Task.tags.through.objects.using(db_alias)
+        .filter(tag_id=OuterRef("pk"))
+        .values("tag_id")
+        .annotate(count=Count("pk"))
+        .values("count")
+    )
+    Tag.objects.using(db_alias).update(usage_count=Coalesce(Subquery(usage), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("App", "0006_task_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="tag",
+            name="usage_count",
+            field=models.PositiveIntegerField(db_index=True, default=0),
+        ),
+        migrations.RunPython(count_tag_usage, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,73 @@
+# Generated by Django 5.1.4 on 2026-10-18 19:23
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def summarize_tasks(apps, schema_editor):
+    Task = apps.get_model("App", "Task")
+    TaskSummary = apps.get_model("App", "TaskSummary")
+    db_alias = schema_editor.connection.alias
+    rows = (
+        Task.objects.using(db_alias)
+        .order_by()
+        .values_list("status", "due_date")
+        .annotate(count=Count("pk"))
+    )
+    TaskSummary.objects.using(db_alias).bulk_create(
+        TaskSummary(status=status, due_date=due_date, count=count)
+        for status, due_date, count in rows
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("App", "0008_tag_usage_count"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="TaskSummary",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("OPEN", "Open"),
+                            ("WORKING", "Working"),
+                            ("PENDING_REVIEW", "Pending Review"),
+                            ("COMPLETED", "Completed"),
+                            ("OVERDUE", "Overdue"),
+                            ("CANCELLED", "Cancelled"),
+                        ],
+                        max_length=16,
+                    ),
+                ),
+                ("due_date", models.DateField(blank=True, null=True)),
+                ("count", models.IntegerField(default=0)),
+            ],
+            options={
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("status", "due_date"), name="task_summary_key"
+                    ),
+                    models.UniqueConstraint(
+                        condition=models.Q(("due_date__isnull", True)),
+                        fields=("status",),
+                        name="task_summary_no_due_date_key",
+                    ),
+                ],
+            },
+        ),
+        migrations.RunPython(summarize_tasks, migrations.RunPython.noop),
+    ]
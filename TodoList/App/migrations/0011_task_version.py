@@ -0,0 +1,46 @@
+# Generated by Django 5.1.4 on 2026-10-18 19:45
+
+import django.utils.timezone
+from django.db import migrations, models
+from django.db.models import F, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def stamp_tasks(apps, schema_editor):
+    """Stamp every task with its latest logged change, or its creation."""
+    Task = apps.get_model("App", "Task")
+    TaskChange = apps.get_model("App", "TaskChange")
+    db_alias = schema_editor.connection.alias
+    latest = TaskChange.objects.using(db_alias).filter(task_id=OuterRef("pk"))
+    latest = latest.order_by("-seq")[:1]
+    Task.objects.using(db_alias).update(
+        version=Coalesce(Subquery(latest.values("seq")), 0),
+        updated_at=Coalesce(Subquery(latest.values("changed_at")), F("timestamp")),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("App", "0010_task_change"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="task",
+            name="updated_at",
+            field=models.DateTimeField(
+                default=django.utils.timezone.now, editable=False
+            ),
+        ),
+        migrations.AddField(
+            model_name="task",
+            name="version",
+            field=models.PositiveBigIntegerField(default=0, editable=False),
+        ),
+        migrations.AddIndex(
+            model_name="task",
+            index=models.Index(fields=["version"], name="task_version_idx"),
+        ),
+        migrations.RunPython(stamp_tasks, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 5.1.4 on 2026-10-18 20:44
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("App", "0011_task_version"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="TaskSearchEntry",
+            fields=[
+                (
+                    "task",
+                    models.OneToOneField(
+                        db_column="rowid",
+                        db_constraint=False,
+                        on_delete=django.db.models.deletion.DO_NOTHING,
+                        primary_key=True,
+                        related_name="search_entry",
+                        serialize=False,
+                        to="App.task",
+                    ),
+                ),
+                ("title", models.TextField()),
+                ("description", models.TextField()),
+                ("tags", models.TextField()),
+                ("document", models.TextField(db_column="App_task_fts")),
+            ],
+            options={
+                "db_table": "App_task_fts",
+                "managed": False,
+            },
+        ),
+    ]
@@ -23,10 +23,24 @@ class Task(models.Model):
         null=False,
         blank=False,
     )
+    # Sequence number and time of the latest change of the task (including
+    # its tag set), stamped by App.changes on every write
+    version = models.PositiveBigIntegerField(default=0, editable=False)
+    updated_at = models.DateTimeField(default=now, editable=False)
     tags = models.ManyToManyField("Tag", blank=True, default=[])
 
     class Meta:
         ordering = ["id"]  # Order by the ID field by default
+        indexes = [
+            # "my OVERDUE tasks due this week" style filters
+            models.Index(fields=["status", "due_date"], name="task_status_due_idx"),
+            # due date ranges and keyset pagination on (due_date, id)
+            models.Index(fields=["due_date", "id"], name="task_due_date_idx"),
+            # created-since filters and keyset pagination on (timestamp, id)
+            models.Index(fields=["timestamp", "id"], name="task_timestamp_idx"),
+            # delta sync filters on version
+            models.Index(fields=["version"], name="task_version_idx"),
+        ]
 
     def clean(self):
         super().clean()
@@ -55,6 +69,94 @@ class Task(models.Model):
 
 class Tag(models.Model):
     name = models.CharField(max_length=30, unique=True)
+    # Number of tasks carrying the tag, maintained by App.receivers and the
+    # bulk paths in App.services (see `reconcile_tag_usage` to repair drift)
+    usage_count = models.PositiveIntegerField(default=0, db_index=True)
+
+    def save(self, *args, **kwargs):
+        # Never write back a usage count that may have changed in the database
+        if not self._state.adding and kwargs.get("update_fields") is None:
+            kwargs["update_fields"] = [
+                field.name
+                for field in self._meta.concrete_fields
+                if not field.primary_key and field.name != "usage_count"
+            ]
+        super().save(*args, **kwargs)
 
     def __str__(self):
         return self.name
+
+
+class TaskSearchEntry(models.Model):
+    """
+    Entry of the full-text index, the SQLite FTS5 table created by migration
+    0005 and maintained by App.search. Only exists where FTS5 is available.
+    """
+
+    task = models.OneToOneField(
+        Task,
+        on_delete=models.DO_NOTHING,
+        primary_key=True,
+        db_column="rowid",
+        db_constraint=False,
+        related_name="search_entry",
+    )
+    title = models.TextField()
+    description = models.TextField()
+    tags = models.TextField()
+    # FTS5 hidden column named after the table, the left operand of MATCH
+    document = models.TextField(db_column="App_task_fts")
+
+    class Meta:
+        managed = False
+        db_table = "App_task_fts"
+
+
+class TaskSummary(models.Model):
+    """
+    Number of tasks per (status, due date).
+
+    Maintained on every task write (see App.stats) so the statistics never
+    scan the task table; `rebuild_task_stats` recomputes it from scratch.
+    """
+
+    status = models.CharField(max_length=16, choices=Task.StatusChoices.choices)
+    due_date = models.DateField(null=True, blank=True)
+    count = models.IntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["status", "due_date"], name="task_summary_key"
+            ),
+            # NULLs never conflict in the constraint above
+            models.UniqueConstraint(
+                fields=["status"],
+                condition=models.Q(due_date__isnull=True),
+                name="task_summary_no_due_date_key",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.status} {self.due_date}: {self.count}"
+
+
+class TaskChange(models.Model):
+    """
+    Append-only log of task writes, recorded in the transaction of the write
+    (see App.changes) and served by the change feed.
+    """
+
+    class Action(models.TextChoices):
+        CREATED = "created", "Created"
+        UPDATED = "updated", "Updated"
+        DELETED = "deleted", "Deleted"
+
+    # AUTOINCREMENT on SQLite, sequence numbers are never reused
+    seq = models.BigAutoField(primary_key=True)
+    task_id = models.IntegerField()  # Not a foreign key, deletions are logged
+    action = models.CharField(max_length=7, choices=Action.choices)
+    changed_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"#{self.seq} task {self.task_id} {self.action}"
@@ -0,0 +1,145 @@
+import base64
+import binascii
+import json
+
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db.models import F, Q
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+class TaskKeysetPagination(BasePagination):
+    """
+    Keyset (seek) pagination for tasks.
+
+    Pages are located with a `WHERE (key, id) > (last_key, last_id)` filter
+    on an indexed ordering instead of an OFFSET, and the total is never
+    counted, so every page costs the same as the first one. Only forward
+    `next` links are produced. Nullable keys (`due_date`) sort last in both
+    directions.
+    """
+
+    page_size = 10
+    page_size_query_param = "page_size"
+    max_page_size = 1000
+    cursor_query_param = "cursor"
+    ordering_query_param = "ordering"
+    ordering_fields = ("id", "due_date", "timestamp")
+    default_ordering = "id"
+    invalid_cursor_message = "Invalid cursor"
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.field, self.descending = self.get_ordering(request)
+        page_size = self.get_page_size(request)
+        model_field = queryset.model._meta.get_field(self.field)
+
+        suffix = "lt" if self.descending else "gt"
+        ordering = [self.order_expression("pk")]
+        if self.field != "id":
+            ordering.insert(0, self.order_expression(self.field))
+        queryset = queryset.order_by(*ordering)
+
+        cursor = self.decode_cursor(request)
+        if cursor is not None:
+            value, pk = cursor
+            after_pk = Q(**{f"pk__{suffix}": pk})
+            if self.field == "id":
+                queryset = queryset.filter(after_pk)
+            elif value is None:
+                queryset = queryset.filter(after_pk, **{f"{self.field}__isnull": True})
+            else:
+                # Cursors come from the client, the value may be of any JSON type
+                try:
+                    value = model_field.to_python(value)
+                except (TypeError, ValueError, DjangoValidationError):
+                    raise NotFound(self.invalid_cursor_message)
+                after = Q(**{f"{self.field}__{suffix}": value}) | Q(
+                    after_pk, **{self.field: value}
+                )
+                if model_field.null:
+                    after |= Q(**{f"{self.field}__isnull": True})
+                queryset = queryset.filter(after)
+
+        page = list(queryset[: page_size + 1])
+        self.has_next = len(page) > page_size
+        self.page = page[:page_size]
+        return self.page
+
+    def get_paginated_response(self, data):
+        return Response({"next": self.get_next_link(), "results": data})
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "results": schema,
+            },
+        }
+
+    def get_ordering(self, request):
+        ordering = request.query_params.get(
+            self.ordering_query_param, self.default_ordering
+        )
+        descending = ordering.startswith("-")
+        field = ordering[1:] if descending else ordering
+        if field not in self.ordering_fields:
+            raise ValidationError(
+                {
+                    self.ordering_query_param: [
+                        f"Choose one of {', '.join(self.ordering_fields)}, "
+                        "optionally prefixed with '-'."
+                    ]
+                }
+            )
+        return field, descending
+
+    def get_page_size(self, request):
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        if page_size <= 0:
+            return self.page_size
+        return min(page_size, self.max_page_size)
+
+    def order_expression(self, field):
+        expression = F(field)
+        if self.descending:
+            return expression.desc(nulls_last=True)
+        return expression.asc(nulls_last=True)
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        last = self.page[-1]
+        # Pages hold Task instances or `.values()` rows
+        if isinstance(last, dict):
+            value, pk = last[self.field], last["id"]
+        else:
+            value, pk = getattr(last, self.field), last.pk
+        if self.field != "id" and value is not None:
+            value = value.isoformat()
+        return replace_query_param(
+            self.base_url, self.cursor_query_param, self.encode_cursor(value, pk)
+        )
+
+    def encode_cursor(self, value, pk):
+        data = json.dumps([value, pk], separators=(",", ":")).encode()
+        return base64.urlsafe_b64encode(data).decode()
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            value, pk = json.loads(base64.urlsafe_b64decode(encoded.encode()))
+            pk = int(pk)
+        except (TypeError, ValueError, binascii.Error):
+            raise NotFound(self.invalid_cursor_message)
+        return value, pk
@@ -0,0 +1,193 @@
+from functools import partial
+
+from django.db import transaction
+from django.db.backends.signals import connection_created
+from django.db.models import F
+from django.db.models.signals import (
+    m2m_changed,
+    post_delete,
+    post_save,
+    pre_delete,
+    pre_save,
+)
+from django.dispatch import receiver
+
+from . import changes, metrics, search, stats
+from .autocomplete import tag_index
+from .models import Task, TaskChange, Tag
+from .services import deleting_in_bulk, task_writes
+from .signals import tags_created, tasks_changed
+
+
+@receiver(tasks_changed)
+def on_tasks_changed(
+    sender, task_ids, fields=None, action=TaskChange.Action.UPDATED, **kwargs
+):
+    changes.record_changes(task_ids, action)
+    if action == TaskChange.Action.DELETED:
+        search.unindex_tasks(task_ids)
+    elif fields is None or search.INDEXED_FIELDS.intersection(fields):
+        search.index_tasks(task_ids)
+
+
+@receiver(pre_save, sender=Task)
+def on_task_pre_save(sender, instance, update_fields=None, **kwargs):
+    # The stored values, the instance already holds the new ones
+    if not instance._state.adding and (
+        update_fields is None or stats.SUMMARY_FIELDS.intersection(update_fields)
+    ):
+        instance._stored_stats_key = (
+            Task.objects.filter(pk=instance.pk)
+            .values_list("status", "due_date")
+            .first()
+        )
+
+
+@receiver(post_save, sender=Task)
+def on_task_save(sender, instance, created, update_fields=None, **kwargs):
+    stored_key = instance.__dict__.pop("_stored_stats_key", None)
+    if created:
+        stats.count_created_tasks([instance])
+    elif stored_key is not None and stored_key != stats.task_key(instance):
+        stats.adjust_task_stats({stored_key: -1, stats.task_key(instance): 1})
+
+    action = TaskChange.Action.CREATED if created else TaskChange.Action.UPDATED
+    writes = task_writes()
+    if writes is not None:
+        writes.add(instance, action, update_fields)
+        return
+
+    stamp_task(instance, changes.record_changes([instance.pk], action))
+
+    if created:
+        search.index_new_task(instance)
+    elif update_fields is None or search.INDEXED_FIELDS.intersection(update_fields):
+        search.index_tasks([instance.pk])
+
+
+@receiver(pre_delete, sender=Task)
+def on_task_delete(sender, instance, **kwargs):
+    # The through rows are cascaded without m2m_changed
+    if not deleting_in_bulk():
+        Tag.objects.filter(task=instance).update(usage_count=F("usage_count") - 1)
+        stats.adjust_task_stats({stats.task_key(instance): -1})
+
+
+@receiver(post_delete, sender=Task)
+def on_task_deleted(sender, instance, **kwargs):
+    if deleting_in_bulk():
+        return
+    writes = task_writes()
+    if writes is not None:
+        writes.add(instance, TaskChange.Action.DELETED)
+    else:
+        changes.record_changes([instance.pk], TaskChange.Action.DELETED)
+        search.unindex_tasks([instance.pk])
+
+
+@receiver(m2m_changed, sender=Task.tags.through)
+def on_task_tags_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    # Every action runs in the same transaction as the through-table write
+    if not reverse:
+        count_task_tags_change(instance, action, pk_set)
+        if action.startswith("post_"):
+            writes = task_writes()
+            if writes is not None:
+                if pk_set or action == "post_clear":
+                    writes.add(instance, TaskChange.Action.UPDATED, ["tags"])
+                return
+            if pk_set or action == "post_clear":
+                stamp_task(
+                    instance,
+                    changes.record_changes([instance.pk], TaskChange.Action.UPDATED),
+                )
+            search.index_tasks([instance.pk])
+        return
+
+    count_tag_tasks_change(instance, action, pk_set)
+    if action == "pre_clear":
+        # Clearing tag.task_set does not say which tasks it held
+        instance._cleared_task_ids = list(
+            Task.objects.filter(tags=instance).values_list("pk", flat=True)
+        )
+    elif action.startswith("post_"):
+        task_ids = pk_set or instance.__dict__.pop("_cleared_task_ids", ())
+        changes.record_changes(task_ids, TaskChange.Action.UPDATED)
+        search.index_tasks(task_ids)
+
+
+def stamp_task(task, stamp):
+    """Bring the in-memory `task` to the version its change stamped."""
+    task.version, task.updated_at = stamp
+
+
+def count_task_tags_change(task, action, pk_set):
+    """Keep `Tag.usage_count` in sync with `task.tags` changes."""
+    if action == "post_add" and pk_set:
+        Tag.objects.filter(pk__in=pk_set).update(usage_count=F("usage_count") + 1)
+    elif action == "pre_remove" and pk_set:
+        Tag.objects.filter(pk__in=pk_set, task=task).update(
+            usage_count=F("usage_count") - 1
+        )
+    elif action == "pre_clear":
+        Tag.objects.filter(task=task).update(usage_count=F("usage_count") - 1)
+
+
+def count_tag_tasks_change(tag, action, pk_set):
+    """Keep `Tag.usage_count` in sync with `tag.task_set` changes."""
+    if action == "post_add" and pk_set:
+        change = len(pk_set)
+    elif action == "pre_remove" and pk_set:
+        change = -Task.objects.filter(pk__in=pk_set, tags=tag).count()
+    elif action == "pre_clear":
+        change = -Task.objects.filter(tags=tag).count()
+    else:
+        return
+    Tag.objects.filter(pk=tag.pk).update(usage_count=F("usage_count") + change)
+
+
+def tagged_task_ids(tag):
+    return list(
+        Task.tags.through.objects.filter(tag_id=tag.pk).values_list(
+            "task_id", flat=True
+        )
+    )
+
+
+@receiver(tags_created)
+def on_tags_created(sender, tags, **kwargs):
+    # The index is shared by the process, only committed tags go in it
+    for tag in tags:
+        transaction.on_commit(partial(tag_index.add, tag.pk, tag.name, tag.usage_count))
+
+
+@receiver(post_save, sender=Tag)
+def on_tag_save(sender, instance, created, **kwargs):
+    transaction.on_commit(
+        partial(tag_index.add, instance.pk, instance.name, instance.usage_count)
+    )
+    task_ids = [] if created else tagged_task_ids(instance)
+    if task_ids:
+        changes.record_changes(task_ids, TaskChange.Action.UPDATED)
+        search.index_tasks(task_ids)
+
+
+@receiver(pre_delete, sender=Tag)
+def on_tag_delete(sender, instance, **kwargs):
+    # Orphan collection deletes tags that no task carries
+    if not deleting_in_bulk():
+        instance._deleted_task_ids = tagged_task_ids(instance)
+
+
+@receiver(post_delete, sender=Tag)
+def on_tag_deleted(sender, instance, **kwargs):
+    transaction.on_commit(partial(tag_index.remove, instance.pk))
+    task_ids = instance.__dict__.pop("_deleted_task_ids", ())
+    if task_ids:
+        changes.record_changes(task_ids, TaskChange.Action.UPDATED)
+        search.index_tasks(task_ids)
+
+
+@receiver(connection_created)
+def on_connection_created(sender, connection, **kwargs):
+    metrics.instrument_connection(connection)
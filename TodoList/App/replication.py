@@ -0,0 +1,39 @@
+"""
+Copy the primary SQLite database into its replicas.
+
+Meant for local setups and tests where the replicas of `DATABASE_REPLICAS`
+are plain SQLite files: each one is refreshed with SQLite's online backup
+API, which copies a consistent snapshot of the primary in a single step
+(in WAL mode this does not block the primary's writers).
+"""
+
+import sqlite3
+
+from django.db import DEFAULT_DB_ALIAS, connections
+
+from .routers import get_replicas
+
+
+def sync_replica(alias, source=DEFAULT_DB_ALIAS):
+    """Overwrite the SQLite database of `alias` with a copy of `source`."""
+    primary = connections[source]
+    replica = connections[alias]
+    if primary.vendor != "sqlite" or replica.vendor != "sqlite":
+        raise ValueError("Only SQLite replicas can be synced with a backup.")
+
+    # Open connections to the replica would keep reading the old snapshot
+    replica.close()
+    primary.ensure_connection()
+    target = sqlite3.connect(str(replica.settings_dict["NAME"]))
+    try:
+        primary.connection.backup(target)
+    finally:
+        target.close()
+
+
+def sync_replicas(aliases=None):
+    """Refresh every replica (or `aliases`), returning the synced aliases."""
+    aliases = list(aliases or get_replicas())
+    for alias in aliases:
+        sync_replica(alias)
+    return aliases
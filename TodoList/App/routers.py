@@ -0,0 +1,144 @@
+"""
+Primary/replica database routing.
+
+Writes always go to the primary (`default`). Reads are spread over the
+aliases listed in `DATABASE_REPLICAS` unless the current request is pinned
+to the primary; all the reads of a request go to the same replica, so
+they see one state of the data. A request is pinned as soon as it writes,
+so it reads its own writes. `ReplicaPinningMiddleware` also pins unsafe
+requests up front and, through a cookie, the client's next `REPLICA_PIN_SECONDS` of
+requests, which covers the lag of the replicas. Code running outside of a
+request (management commands, shells) always uses the primary.
+"""
+
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+
+_pinned = ContextVar("pinned_to_primary", default=True)
+_replica = ContextVar("replica", default=None)
+
+PIN_COOKIE = "primary_pin"
+
+
+def pin_to_primary():
+    """Send the reads of the current request (or task) to the primary."""
+    _pinned.set(True)
+
+
+def is_pinned():
+    return _pinned.get()
+
+
+@contextmanager
+def pinning_scope(pinned=False):
+    """Start a fresh pinning state, restored on exit (one per request)."""
+    token = _pinned.set(pinned)
+    replica_token = _replica.set(None)
+    try:
+        yield
+    finally:
+        _replica.reset(replica_token)
+        _pinned.reset(token)
+
+
+def get_replicas():
+    return getattr(settings, "DATABASE_REPLICAS", [])
+
+
+def other_database(hints):
+    """
+    The database of the hinted instance when it is neither the primary nor a
+    replica (a scratch database used explicitly, as in `benchmark_database`).
+    """
+    instance = hints.get("instance")
+    db = instance is not None and instance._state.db
+    if db and db != DEFAULT_DB_ALIAS and db not in get_replicas():
+        return db
+    return None
+
+
+class PrimaryReplicaRouter:
+    def db_for_read(self, model, **hints):
+        # Related managers and prefetches follow the instance they start from
+        db = other_database(hints)
+        if db is not None:
+            return db
+        replicas = get_replicas()
+        if not replicas or is_pinned():
+            return DEFAULT_DB_ALIAS
+        replica = _replica.get()
+        if replica not in replicas:
+            replica = random.choice(replicas)
+            _replica.set(replica)
+        return replica
+
+    def db_for_write(self, model, **hints):
+        db = other_database(hints)
+        if db is not None:
+            return db
+        pin_to_primary()
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        databases = {DEFAULT_DB_ALIAS, *get_replicas()}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # Replicas are copies of the primary, schema included
+        if db in get_replicas():
+            return False
+        return None
+
+
+class ReplicaPinningMiddleware:
+    """
+    Give every request its own pinning state, pin the unsafe ones and keep
+    the client on the primary for `REPLICA_PIN_SECONDS` after a write.
+    Works with both sync and async views.
+    """
+
+    sync_capable = True
+    async_capable = True
+    unsafe_methods = {"POST", "PUT", "PATCH", "DELETE"}
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        cookie_pinned, unsafe = self.pinned_on_entry(request)
+        with pinning_scope(cookie_pinned or unsafe):
+            response = self.get_response(request)
+            wrote = unsafe or (not cookie_pinned and is_pinned())
+        return self.process_response(response, wrote)
+
+    async def __acall__(self, request):
+        cookie_pinned, unsafe = self.pinned_on_entry(request)
+        with pinning_scope(cookie_pinned or unsafe):
+            response = await self.get_response(request)
+            wrote = unsafe or (not cookie_pinned and is_pinned())
+        return self.process_response(response, wrote)
+
+    def pinned_on_entry(self, request):
+        return PIN_COOKIE in request.COOKIES, request.method in self.unsafe_methods
+
+    def process_response(self, response, wrote):
+        if wrote and get_replicas():
+            response.set_cookie(
+                PIN_COOKIE,
+                "1",
+                max_age=getattr(settings, "REPLICA_PIN_SECONDS", 15),
+                httponly=True,
+                samesite="Lax",
+            )
+        return response
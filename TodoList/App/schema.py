@@ -0,0 +1,7 @@
+from drf_spectacular.authentication import BasicScheme
+
+
+class CachedBasicScheme(BasicScheme):
+    """Document `CachedBasicAuthentication` as plain HTTP Basic."""
+
+    target_class = "App.authentication.CachedBasicAuthentication"
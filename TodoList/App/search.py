@@ -0,0 +1,148 @@
+import re
+from collections import defaultdict
+
+from django.db import connections, router
+from django.db.models import Lookup
+from django.db.models.expressions import RawSQL
+
+from .models import Task, TaskSearchEntry
+
+SEARCH_TABLE = TaskSearchEntry._meta.db_table
+
+# bm25 weights of the indexed columns: title, description, tags
+COLUMN_WEIGHTS = (10.0, 1.0, 5.0)
+
+# Task fields the index depends on
+INDEXED_FIELDS = {"title", "description", "tags"}
+
+# Ids per DELETE statement when refreshing the index
+BATCH_SIZE = 500
+
+_available = {}
+
+
+def is_available(using="default"):
+    """Return whether the full-text index exists on the `using` database."""
+    connection = connections[using]
+    key = (using, str(connection.settings_dict["NAME"]))
+    if key not in _available:
+        _available[key] = (
+            connection.vendor == "sqlite"
+            and SEARCH_TABLE in connection.introspection.table_names()
+        )
+    return _available[key]
+
+
+class Match(Lookup):
+    """`document__match=expression`, an FTS5 MATCH on the whole index row."""
+
+    lookup_name = "match"
+
+    def as_sql(self, compiler, connection):
+        lhs, lhs_params = self.process_lhs(compiler, connection)
+        rhs, rhs_params = self.process_rhs(compiler, connection)
+        return f"{lhs} MATCH {rhs}", [*lhs_params, *rhs_params]
+
+
+TaskSearchEntry._meta.get_field("document").register_lookup(Match)
+
+
+def build_match_expression(text):
+    """
+    Turn free text into an FTS5 query matching every word as a prefix.
+
+    Words are quoted so user input can never be interpreted as FTS5 syntax.
+    Returns None when `text` has nothing to search for.
+    """
+    words = re.findall(r"\w+", text)
+    if not words:
+        return None
+    return " ".join(f'"{word}"*' for word in words)
+
+
+def search_tasks(queryset, text):
+    """
+    Restrict `queryset` to the tasks matching `text`, best matches first.
+
+    The index is joined to the task table so the MATCH runs once and its
+    bm25 rank comes with every hit; the cost depends on the number of hits
+    rather than on the size of the task table. Each task appears once
+    however many of its tags match.
+    """
+    expression = build_match_expression(text)
+    if expression is None:
+        return queryset
+
+    weights = ", ".join(str(weight) for weight in COLUMN_WEIGHTS)
+    # bm25() reads the row the MATCH of the joined index just found; a
+    # correlated rank subquery would re-run the MATCH for every hit
+    return (
+        queryset.filter(search_entry__document__match=expression)
+        .annotate(search_rank=RawSQL(f'bm25("{SEARCH_TABLE}", {weights})', ()))
+        .order_by("search_rank", "pk")
+    )
+
+
+def index_tasks(task_ids):
+    """
+    Refresh the index entries of `task_ids` from the database.
+
+    Tasks that no longer exist are dropped from the index. The whole batch
+    costs two reads, a DELETE per `BATCH_SIZE` tasks and one insert.
+    """
+    task_ids = list(task_ids)
+    using = router.db_for_write(Task)
+    if not task_ids or not is_available(using):
+        return
+
+    tags = defaultdict(list)
+    links = Task.tags.through.objects.using(using).filter(task_id__in=task_ids)
+    for task_id, name in links.values_list("task_id", "tag__name"):
+        tags[task_id].append(name)
+    rows = [
+        (pk, title, description, " ".join(tags[pk]))
+        for pk, title, description in Task.objects.using(using)
+        .filter(pk__in=task_ids)
+        .values_list("pk", "title", "description")
+    ]
+
+    unindex_tasks(task_ids)
+    if rows:
+        with connections[using].cursor() as cursor:
+            cursor.executemany(
+                f'INSERT INTO "{SEARCH_TABLE}" (rowid, title, description, tags) '
+                "VALUES (%s, %s, %s, %s)",
+                rows,
+            )
+
+
+def index_new_task(task):
+    """Add a task that was just created, and has no tags yet, to the index."""
+    using = router.db_for_write(Task)
+    if not is_available(using):
+        return
+
+    with connections[using].cursor() as cursor:
+        cursor.execute(
+            f'INSERT INTO "{SEARCH_TABLE}" (rowid, title, description, tags) '
+            "VALUES (%s, %s, %s, '')",
+            [task.pk, task.title, task.description],
+        )
+
+
+def unindex_tasks(task_ids):
+    """Drop `task_ids` from the index without looking them up."""
+    task_ids = list(task_ids)
+    using = router.db_for_write(Task)
+    if not task_ids or not is_available(using):
+        return
+
+    with connections[using].cursor() as cursor:
+        for start in range(0, len(task_ids), BATCH_SIZE):
+            end = start + BATCH_SIZE
+            batch = task_ids[start:end]
+            cursor.execute(
+                f'DELETE FROM "{SEARCH_TABLE}" WHERE rowid IN '
+                f"({', '.join(['%s'] * len(batch))})",
+                batch,
+            )
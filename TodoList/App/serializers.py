@@ -1,16 +1,109 @@
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db import transaction
+from django.db.models import prefetch_related_objects
 from rest_framework import serializers
 from rest_framework.exceptions import ValidationError
+from .metrics import TimedSerializerMixin, timing_serializer
 from .models import Task, Tag
-from django.utils.timezone import now
+from .services import (
+    collect_orphan_tags,
+    recording_task_writes,
+    refresh_versions,
+    resolve_tags,
+    set_tags_in_bulk,
+)
+from .signals import tasks_changed
+from .stats import SUMMARY_FIELDS, count_created_tasks, tracking_task_stats
+from django.utils.timezone import get_current_timezone, now
 
 
-class TagSerializer(serializers.ModelSerializer):
+class TagSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = Tag
         fields = "__all__"
+        read_only_fields = ["usage_count"]
+
+
+class TaskListSerializer(TimedSerializerMixin, serializers.ListSerializer):
+    """
+    Create or partially update many tasks with a fixed number of queries.
+
+    For updates, `instance` is a dict mapping task ids to Task objects and
+    every item must carry the `id` of the task it changes.
+    """
+
+    def run_child_validation(self, data):
+        if self.instance is not None:
+            task = self.instance.get(data.get("id")) if isinstance(data, dict) else None
+            if task is None:
+                raise ValidationError({"id": "Task not found."})
+            self.child.instance = task
+            self.child.initial_data = data
+
+        attrs = super().run_child_validation(data)
+        if self.instance is not None:
+            attrs["id"] = task.pk
+
+        # Run the model level rules (Task.clean) that Task.save() would enforce
+        try:
+            self.child.build_task(attrs).full_clean()
+        except DjangoValidationError as e:
+            raise ValidationError(serializers.as_serializer_error(e))
+        return attrs
+
+    def create(self, validated_data):
+        tasks = [self.child.build_task(item) for item in validated_data]
+        Task.objects.bulk_create(tasks)
+        count_created_tasks(tasks)
 
+        set_tags_in_bulk(
+            {
+                task.pk: item["tags"]
+                for task, item in zip(tasks, validated_data)
+                if item.get("tags")
+            },
+            replace=False,
+        )
+        tasks_changed.send(
+            sender=Task, task_ids=[task.pk for task in tasks], action="created"
+        )
+        refresh_versions(tasks)
+        prefetch_related_objects(tasks, "tags")
+        return tasks
 
-class TaskSerializer(serializers.ModelSerializer):
+    def update(self, instance, validated_data):
+        tasks = [self.child.build_task(item) for item in validated_data]
+        fields = {
+            field
+            for item in validated_data
+            for field in item
+            if field not in ("id", "tags")
+        }
+        if SUMMARY_FIELDS.intersection(fields):
+            with tracking_task_stats([task.pk for task in tasks]):
+                Task.objects.bulk_update(tasks, list(fields))
+        elif fields:
+            Task.objects.bulk_update(tasks, list(fields))
+
+        tags_by_task = {
+            item["id"]: item["tags"] for item in validated_data if "tags" in item
+        }
+        if tags_by_task:
+            collect_orphan_tags(set_tags_in_bulk(tags_by_task))
+            fields.add("tags")
+
+        tasks_changed.send(
+            sender=Task, task_ids=[task.pk for task in tasks], fields=fields
+        )
+        refresh_versions(tasks)
+        prefetch_related_objects(tasks, "tags")
+        return tasks
+
+
+class TaskSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     tags = serializers.ListField(
         child=serializers.CharField(max_length=30), write_only=True, default=[]
     )
@@ -18,6 +111,7 @@ class TaskSerializer(serializers.ModelSerializer):
     class Meta:
         model = Task
         fields = "__all__"
+        list_serializer_class = TaskListSerializer
 
     def validate(self, attrs):
         due_date = attrs.get("due_date", None)
@@ -33,6 +127,31 @@ class TaskSerializer(serializers.ModelSerializer):
 
         return super().validate(attrs)
 
+    def build_task(self, validated_data):
+        """
+        Return the Task described by `validated_data` without saving it.
+
+        Used by the bulk paths: an existing task (`validated_data["id"]`) is
+        updated in memory, otherwise a new OPEN task is built.
+        """
+        fields = {
+            attr: value
+            for attr, value in validated_data.items()
+            if attr not in ("id", "tags")
+        }
+
+        if "id" in validated_data:
+            task = self.parent.instance[validated_data["id"]]
+            for attr, value in fields.items():
+                setattr(task, attr, value)
+            return task
+
+        if fields.get("due_date") and fields["due_date"] < now().date():
+            raise ValidationError({"status": "Cannot complete a task before creation"})
+        fields["status"] = Task.StatusChoices.OPEN
+        return Task(**fields)
+
+    @transaction.atomic
     def create(self, validated_data):
         tags = validated_data.pop("tags", [])
         validated_data["status"] = Task.StatusChoices.OPEN
@@ -42,14 +161,16 @@ class TaskSerializer(serializers.ModelSerializer):
             and validated_data.get("due_date") < now().date()
         ):
             raise ValidationError({"status": "Cannot complete a task before creation"})
-        task = Task.objects.create(**validated_data)
 
-        for tag_name in tags:
-            tag, _ = Tag.objects.get_or_create(name=tag_name)
-            task.tags.add(tag)
+        # Logged as a single creation, tags included
+        with recording_task_writes():
+            task = Task.objects.create(**validated_data)
+            if tags:
+                task.tags.add(*resolve_tags(tags))
 
         return task
 
+    @transaction.atomic
     def update(self, instance, validated_data):
 
         # if validated_data.get("status", "") == Task.StatusChoices.OVERDUE:
@@ -61,24 +182,110 @@ class TaskSerializer(serializers.ModelSerializer):
         for attr, value in validated_data.items():
             setattr(instance, attr, value)
 
-        if tags_data is not None:
-            for tag in instance.tags.all():
-                if tag.name not in tags_data and tag.task_set.count() == 1:
-                    tag.delete()
+        # Logged as a single change, tags included
+        with recording_task_writes():
+            if tags_data is not None:
+                removed_tag_ids = [
+                    tag.pk for tag in instance.tags.all() if tag.name not in tags_data
+                ]
 
-            # Convert tags to Tag objects and set them
-            tags = [
-                Tag.objects.get_or_create(name=tag_name)[0] for tag_name in tags_data
-            ]
-            instance.tags.set(tags)
+                # Convert tags to Tag objects and set them
+                instance.tags.set(resolve_tags(tags_data))
+                collect_orphan_tags(removed_tag_ids)
 
-        instance.save()
+            instance.save()
         return instance
 
     def to_representation(self, instance):
         representation = super().to_representation(instance)
 
-        # Transform tags to only return their names (instead of full Tag objects)
+        # Transform tags to only return their names (instead of full Tag objects).
+        # `tags.all()` is served from the prefetch cache when the queryset used
+        # `prefetch_related("tags")`, so no extra query is issued per task.
         representation["tags"] = [tag.name for tag in instance.tags.all()]
 
         return representation
+
+
+def format_datetime(value, tz):
+    """Render a datetime the way DRF's DateTimeField does (ISO 8601)."""
+    if not value:
+        return None
+    if tz is not None:
+        value = value.astimezone(tz)
+    value = value.isoformat()
+    if value.endswith("+00:00"):
+        value = value[:-6] + "Z"
+    return value
+
+
+class TaskReadSerializer:
+    """
+    Read-only fast path producing exactly what `TaskSerializer` returns.
+
+    Works on `.values()` rows (see `rows()`) rather than Task instances and
+    loads the tag names of all the rows with a single query on the through
+    table, so serializing a page builds neither model instances nor DRF
+    fields. Used by the task list and detail endpoints.
+    """
+
+    fields = (
+        "id",
+        "title",
+        "description",
+        "timestamp",
+        "due_date",
+        "status",
+        "version",
+        "updated_at",
+    )
+
+    def __init__(self, instance, many=False):
+        self.instance = instance
+        self.many = many
+
+    @classmethod
+    def rows(cls, queryset):
+        """Turn a task queryset into the `.values()` rows this serializer reads."""
+        # Annotations (such as the search rank) must be kept to order by them
+        return queryset.prefetch_related(None).values(
+            *cls.fields, *queryset.query.annotation_select
+        )
+
+    @staticmethod
+    def tag_names(task_ids):
+        names = defaultdict(list)
+        links = Task.tags.through.objects.filter(task_id__in=task_ids)
+        for task_id, name in links.order_by("task_id", "tag_id").values_list(
+            "task_id", "tag__name"
+        ):
+            names[task_id].append(name)
+        return names
+
+    @property
+    def data(self):
+        with timing_serializer():
+            rows = self.instance if self.many else [self.instance]
+            tags = self.tag_names([row["id"] for row in rows]) if rows else {}
+            tz = get_current_timezone() if settings.USE_TZ else None
+            data = [
+                {
+                    "id": row["id"],
+                    "title": row["title"],
+                    "description": row["description"],
+                    "timestamp": format_datetime(row["timestamp"], tz),
+                    "due_date": row["due_date"] and row["due_date"].isoformat(),
+                    "status": row["status"],
+                    "version": row["version"],
+                    "updated_at": format_datetime(row["updated_at"], tz),
+                    "tags": tags.get(row["id"], []),
+                }
+                for row in rows
+            ]
+        return data if self.many else data[0]
+
+
+class TaskBulkDeleteSerializer(serializers.Serializer):
+    ids = serializers.ListField(
+        child=serializers.IntegerField(), allow_empty=False, max_length=1000
+    )
@@ -0,0 +1,334 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Case, Count, F, IntegerField, OuterRef, Subquery
+from django.db.models import Value, When
+from django.db.models.functions import Coalesce
+from django.utils.timezone import now
+
+from .models import Task, Tag
+from .signals import tags_created, tasks_changed
+from .stats import adjust_task_stats, count_task_keys, tracking_task_stats
+
+
+def resolve_tags(names):
+    """
+    Return the Tag objects for `names`, creating the missing ones.
+
+    Existing tags are fetched with a single lookup and the missing names are
+    inserted with one `bulk_create`. Conflicts raised by concurrent writers
+    creating the same names are ignored and the rows are read back, so the
+    whole resolution costs at most three queries however many names are given.
+    The result follows the order of `names`, without duplicates.
+    """
+    names = list(dict.fromkeys(names))
+    if not names:
+        return []
+
+    tags = {tag.name: tag for tag in Tag.objects.filter(name__in=names)}
+    missing = [name for name in names if name not in tags]
+
+    if missing:
+        Tag.objects.bulk_create(
+            [Tag(name=name) for name in missing], ignore_conflicts=True
+        )
+        # Primary keys are not returned when conflicts are ignored
+        created = list(Tag.objects.filter(name__in=missing))
+        tags.update({tag.name: tag for tag in created})
+        tags_created.send(sender=Tag, tags=created)
+
+    return [tags[name] for name in names]
+
+
+def tag_ids_for_tasks(tasks):
+    """Return the ids of the tags attached to `tasks` (a queryset or pks)."""
+    return list(
+        Task.tags.through.objects.filter(task__in=tasks)
+        .values_list("tag_id", flat=True)
+        .distinct()
+    )
+
+
+def remove_orphan_tags(tag_ids=None):
+    """
+    Delete the tags that are no longer attached to any task.
+
+    Candidates are found through the `usage_count` index and confirmed with
+    an anti-join on the through table, so a drifted counter can never delete
+    a tag that is still in use. They are removed in one delete, limited to
+    `tag_ids` when given. Returns the number of deleted tags.
+    """
+    queryset = Tag.objects.filter(usage_count=0, task__isnull=True)
+    if tag_ids is not None:
+        if not tag_ids:
+            return 0
+        queryset = queryset.filter(pk__in=tag_ids)
+
+    # No task carries these tags, skip the per-tag bookkeeping
+    token = _deleting_in_bulk.set(True)
+    try:
+        return queryset.delete()[1].get(Tag._meta.label, 0)
+    finally:
+        _deleting_in_bulk.reset(token)
+
+
+def collect_orphan_tags(tag_ids):
+    """
+    Garbage collect the tags in `tag_ids` once the tasks using them changed.
+
+    With `TAG_ORPHAN_COLLECTION = "deferred"` nothing is done inline and the
+    orphans are left for the `collect_orphan_tags` management command.
+    """
+    if getattr(settings, "TAG_ORPHAN_COLLECTION", "inline") == "deferred":
+        return 0
+    return remove_orphan_tags(tag_ids)
+
+
+def set_tags_in_bulk(tags_by_task, replace=True, resolved=None):
+    """
+    Set the tags of many tasks at once.
+
+    `tags_by_task` maps task pks to lists of tag names. Every name is resolved
+    with a single `resolve_tags` call and the links are written with one
+    through-table insert, and the tag usage counters follow with one UPDATE.
+    With `replace`, the previous links of those tasks are removed first and the
+    ids of the tags they pointed to are returned so the caller can collect the
+    orphans. `resolved` is an optional `{name: Tag}` cache shared between
+    calls; only the names missing from it are looked up, and it is filled in.
+    """
+    through = Task.tags.through
+    task_ids = list(tags_by_task)
+    usage = {}
+
+    if replace and task_ids:
+        links = through.objects.filter(task_id__in=task_ids)
+        usage = {tag_id: -count for tag_id, count in count_links(links).items()}
+        links.delete()
+
+    tags = {} if resolved is None else resolved
+    tags.update(
+        (tag.name, tag)
+        for tag in resolve_tags(
+            name
+            for names in tags_by_task.values()
+            for name in names
+            if name not in tags
+        )
+    )
+    new_links = [
+        through(task_id=task_id, tag_id=tags[name].pk)
+        for task_id, names in tags_by_task.items()
+        for name in dict.fromkeys(names)
+    ]
+    through.objects.bulk_create(new_links)
+
+    previous_tag_ids = list(usage)
+    for link in new_links:
+        usage[link.tag_id] = usage.get(link.tag_id, 0) + 1
+    adjust_tag_usage(usage)
+    return previous_tag_ids
+
+
+def refresh_versions(tasks):
+    """Reload the version stamps of `tasks` after a bulk write, with one query."""
+    stamps = {
+        pk: (version, updated_at)
+        for pk, version, updated_at in Task.objects.filter(
+            pk__in=[task.pk for task in tasks]
+        ).values_list("pk", "version", "updated_at")
+    }
+    for task in tasks:
+        task.version, task.updated_at = stamps[task.pk]
+
+
+def count_links(links):
+    """Return `{tag_id: number of links}` for a queryset of through rows."""
+    return dict(
+        links.values("tag_id")
+        .annotate(count=Count("pk"))
+        .values_list("tag_id", "count")
+    )
+
+
+def adjust_tag_usage(deltas):
+    """
+    Apply `deltas` (tag id -> change) to `Tag.usage_count` in one UPDATE.
+
+    The counters are changed with F() expressions so concurrent writers never
+    overwrite each other.
+    """
+    deltas = {tag_id: delta for tag_id, delta in deltas.items() if delta}
+    if not deltas:
+        return
+
+    if len(set(deltas.values())) == 1:
+        change = Value(next(iter(deltas.values())))
+    else:
+        change = Case(
+            *[When(pk=tag_id, then=Value(delta)) for tag_id, delta in deltas.items()],
+            output_field=IntegerField(),
+        )
+    Tag.objects.filter(pk__in=deltas).update(usage_count=F("usage_count") + change)
+
+
+_deleting_in_bulk = ContextVar("deleting_tasks_in_bulk", default=False)
+
+
+def deleting_in_bulk():
+    """
+    Whether the rows being deleted are accounted for by the caller
+    (`deleting_tasks` or orphan collection) rather than per row.
+    """
+    return _deleting_in_bulk.get()
+
+
+@contextmanager
+def deleting_tasks(tasks):
+    """
+    Wrap the deletion of the `tasks` queryset and do its tag and statistics
+    bookkeeping.
+
+    The links and tasks about to be deleted are counted with a GROUP BY each
+    before the block runs and the per-task signal bookkeeping is skipped
+    inside it. Afterwards the usage counters and the task summary are
+    decremented with one UPDATE each, the
+    orphaned tags are collected and `tasks_changed` is sent once, so the cost
+    does not grow with the number of deleted tasks.
+    """
+    task_ids = list(tasks.values_list("pk", flat=True))
+    removed = count_links(Task.tags.through.objects.filter(task_id__in=task_ids))
+    removed_keys = count_task_keys(task_ids)
+    token = _deleting_in_bulk.set(True)
+    try:
+        yield
+    finally:
+        _deleting_in_bulk.reset(token)
+
+    adjust_tag_usage({tag_id: -count for tag_id, count in removed.items()})
+    adjust_task_stats({key: -count for key, count in removed_keys.items()})
+    collect_orphan_tags(list(removed))
+    tasks_changed.send(sender=Task, task_ids=task_ids, action="deleted")
+
+
+class TaskWrites:
+    """The tasks written within a `recording_task_writes` block."""
+
+    def __init__(self):
+        self.tasks = {}  # pk -> Task, stamped once the changes are recorded
+        self.actions = {}  # pk -> action
+        self.fields = set()  # None once a write may have changed any field
+
+    def add(self, task, action, fields=None):
+        previous = self.actions.get(task.pk)
+        if action == "deleted":
+            self.tasks.pop(task.pk, None)
+        else:
+            self.tasks[task.pk] = task
+        if previous != "created" or action == "deleted":
+            self.actions[task.pk] = action
+        if fields is None or self.fields is None:
+            self.fields = None
+        else:
+            self.fields.update(fields)
+
+    def send(self):
+        by_action = {}
+        for pk, action in self.actions.items():
+            by_action.setdefault(action, []).append(pk)
+        for action, task_ids in by_action.items():
+            tasks_changed.send(
+                sender=Task,
+                task_ids=task_ids,
+                fields=self.fields if action == "updated" else None,
+                action=action,
+            )
+        if self.tasks:
+            refresh_versions(list(self.tasks.values()))
+
+
+_task_writes = ContextVar("task_writes", default=None)
+
+
+def task_writes():
+    """The `TaskWrites` of the enclosing `recording_task_writes`, or None."""
+    return _task_writes.get()
+
+
+@contextmanager
+def recording_task_writes():
+    """
+    Record the task writes of the block as one change per task.
+
+    A single API write fires several model signals: saving a task with tags
+    sends post_save and m2m_changed. Inside the block the receivers only
+    note the written tasks, fields and actions, and `tasks_changed` is sent
+    once per action on the way out. The tasks are then logged, stamped with
+    a new version and reindexed once each. Use it inside the
+    transaction of the write; nested blocks join the outer one.
+    """
+    if _task_writes.get() is not None:
+        yield
+        return
+
+    writes = TaskWrites()
+    token = _task_writes.set(writes)
+    try:
+        yield
+    finally:
+        _task_writes.reset(token)
+    writes.send()
+
+
+def reconcile_tag_usage():
+    """
+    Recount `Tag.usage_count` from the through table where it drifted.
+
+    Returns the number of repaired tags.
+    """
+    actual = Coalesce(
+        Subquery(
+            Task.tags.through.objects.filter(tag_id=OuterRef("pk"))
+            .values("tag_id")
+            .annotate(count=Count("pk"))
+            .values("count")
+        ),
+        0,
+    )
+    drifted = Tag.objects.annotate(actual=actual).exclude(usage_count=F("actual"))
+    return Tag.objects.filter(pk__in=drifted.values("pk")).update(usage_count=actual)
+
+
+def overdue_candidates(today=None):
+    """Tasks whose due date has passed but which are not yet marked overdue."""
+    today = today or now().date()
+    return Task.objects.filter(due_date__lt=today).exclude(
+        status__in=[Task.StatusChoices.COMPLETED, Task.StatusChoices.OVERDUE]
+    )
+
+
+def mark_overdue_tasks(chunk_size=1000, today=None):
+    """
+    Move every past due, non completed task to OVERDUE.
+
+    The candidates are walked in primary key order, `chunk_size` ids at a
+    time, and each chunk is switched with a single UPDATE in its own
+    transaction so the table is never locked for long. Yields
+    `(last_id, updated)` after every chunk.
+    """
+    today = today or now().date()
+    last_id = 0
+    while True:
+        candidates = overdue_candidates(today).filter(pk__gt=last_id)
+        ids = list(candidates.order_by("pk").values_list("pk", flat=True)[:chunk_size])
+        if not ids:
+            return
+
+        with transaction.atomic(), tracking_task_stats(ids):
+            updated = candidates.filter(pk__in=ids).update(
+                status=Task.StatusChoices.OVERDUE
+            )
+            tasks_changed.send(sender=Task, task_ids=ids, fields=["status"])
+        last_id = ids[-1]
+        yield last_id, updated
@@ -0,0 +1,9 @@
+from django.dispatch import Signal
+
+# Sent with `task_ids` after writes that bypass the model signals
+# (bulk_create, bulk_update, queryset updates and through-table inserts),
+# and the `action` when the tasks were "created" or "deleted".
+tasks_changed = Signal()
+
+# Sent with `tags` after tags are created with bulk_create.
+tags_created = Signal()
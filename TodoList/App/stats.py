@@ -0,0 +1,160 @@
+"""
+Task statistics.
+
+Counts by status and by due date come from `TaskSummary`, which holds one
+row per (status, due date) pair. Every write path adjusts it with F()
+expressions in the transaction of the write, like `Tag.usage_count`: the
+model signals (App.receivers) for single tasks, the bulk helpers for bulk
+writes. Counts by tag are `Tag.usage_count` itself. Reading the statistics
+costs two queries on small tables whatever the number of tasks.
+"""
+
+from collections import Counter
+from contextlib import contextmanager
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import Case, Count, F, IntegerField, Q, Sum, Value, When
+from django.utils.timezone import now
+
+from .models import Tag, Task, TaskSummary
+
+# Task fields the summary depends on
+SUMMARY_FIELDS = {"status", "due_date"}
+
+# Tags listed by default, most used first
+TAG_LIMIT = 50
+
+
+def task_key(task):
+    return str(task.status), task.due_date
+
+
+def count_task_keys(task_ids):
+    """Return how many of `task_ids` there are per (status, due date)."""
+    rows = (
+        Task.objects.filter(pk__in=task_ids)
+        .order_by()
+        .values_list("status", "due_date")
+        .annotate(count=Count("pk"))
+    )
+    return Counter({(status, due_date): count for status, due_date, count in rows})
+
+
+def adjust_task_stats(deltas):
+    """
+    Apply `deltas` ((status, due date) -> change) to the summary.
+
+    Rows about to grow are inserted first when missing (a row a concurrent
+    writer inserted meanwhile is left alone), then every count is changed
+    with one UPDATE.
+    """
+    deltas = {key: delta for key, delta in deltas.items() if delta}
+    if not deltas:
+        return
+
+    TaskSummary.objects.bulk_create(
+        [
+            TaskSummary(status=status, due_date=due_date)
+            for (status, due_date), delta in deltas.items()
+            if delta > 0
+        ],
+        ignore_conflicts=True,
+    )
+
+    whens = []
+    for (status, due_date), delta in deltas.items():
+        if due_date is None:
+            whens.append(When(status=status, due_date__isnull=True, then=delta))
+        else:
+            whens.append(When(status=status, due_date=due_date, then=delta))
+    # A superset of the rows to change, OR-ing every key would nest too deep
+    dates = {due_date for _, due_date in deltas if due_date is not None}
+    on_date = Q(due_date__in=dates)
+    if len(dates) < len({due_date for _, due_date in deltas}):
+        on_date |= Q(due_date__isnull=True)
+    TaskSummary.objects.filter(
+        on_date, status__in={status for status, _ in deltas}
+    ).update(
+        count=F("count") + Case(*whens, default=Value(0), output_field=IntegerField())
+    )
+
+
+def count_created_tasks(tasks):
+    adjust_task_stats(Counter(map(task_key, tasks)))
+
+
+@contextmanager
+def tracking_task_stats(task_ids):
+    """Adjust the summary for whatever the block does to the `task_ids` tasks."""
+    before = count_task_keys(task_ids)
+    yield
+    deltas = count_task_keys(task_ids)
+    deltas.subtract(before)
+    adjust_task_stats(deltas)
+
+
+@transaction.atomic
+def rebuild_task_stats():
+    """Recompute the summary from the task table. Returns its number of rows."""
+    TaskSummary.objects.all().delete()
+    rows = (
+        Task.objects.order_by()
+        .values_list("status", "due_date")
+        .annotate(count=Count("pk"))
+    )
+    return len(
+        TaskSummary.objects.bulk_create(
+            TaskSummary(status=status, due_date=due_date, count=count)
+            for status, due_date, count in rows
+        )
+    )
+
+
+def due_date_buckets(today):
+    week_end = today + timedelta(days=7)
+    return {
+        "past": Q(due_date__lt=today),
+        "today": Q(due_date=today),
+        "next_7_days": Q(due_date__gt=today, due_date__lte=week_end),
+        "later": Q(due_date__gt=week_end),
+        "none": Q(due_date__isnull=True),
+    }
+
+
+def task_stats(tag_limit=TAG_LIMIT, today=None):
+    """
+    Return the number of tasks overall, per status, per due date bucket
+    (relative to `today`) and for the `tag_limit` most used tags.
+    """
+    buckets = due_date_buckets(today or now().date())
+    rows = (
+        TaskSummary.objects.order_by()
+        .values("status")
+        .annotate(
+            total=Sum("count"),
+            **{
+                f"due_{name}": Sum("count", filter=condition)
+                for name, condition in buckets.items()
+            },
+        )
+    )
+
+    by_status = dict.fromkeys(Task.StatusChoices.values, 0)
+    by_due_date = dict.fromkeys(buckets, 0)
+    for row in rows:
+        by_status[row["status"]] = row["total"] or 0
+        for name in buckets:
+            by_due_date[name] += row[f"due_{name}"] or 0
+
+    tags = (
+        Tag.objects.filter(usage_count__gt=0)
+        .order_by("-usage_count", "name")
+        .values_list("name", "usage_count")
+    )
+    return {
+        "total": sum(by_status.values()),
+        "by_status": by_status,
+        "by_due_date": by_due_date,
+        "by_tag": dict(tags[:tag_limit]),
+    }
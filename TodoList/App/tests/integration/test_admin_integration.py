@@ -1,7 +1,7 @@
 from django.contrib.auth import get_user_model
 from rest_framework.test import APITestCase
 from django.test import Client
-from App.models import Task, Tag
+from App.models import Task, TaskChange, Tag
 import base64
 
 
@@ -60,6 +60,30 @@ class AdminIntegrationTest(APITestCase):
 
         self.assertEqual(Task.objects.count(), 3)
 
+    def test_admin_writes_are_logged_once(self):
+        data = {
+            "title": "Tagged",
+            "description": "task",
+            "due_date": "",
+            "status": Task.StatusChoices.OPEN,
+            "tags": [self.tag1.pk],
+            "_save": "Save",
+        }
+        response = self.admin_client.post("/admin/App/task/add/", data=data)
+        self.assertEqual(response.status_code, 302)
+        task = Task.objects.get(title="Tagged")
+
+        data["tags"] = [self.tag2.pk]
+        self.admin_client.post(f"/admin/App/task/{task.pk}/change/", data=data)
+        self.assertEqual(
+            list(
+                TaskChange.objects.filter(task_id=task.pk).values_list(
+                    "action", flat=True
+                )
+            ),
+            ["created", "updated"],
+        )
+
     def test_add_invalid_task_via_admin(self):
         data = {
             "title": "task 1",
@@ -1,5 +1,7 @@
 import base64
 from django.core.exceptions import ValidationError
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from App.models import Task, Tag
 from App.serializers import TaskSerializer
@@ -143,3 +145,106 @@ class IntegrationTest(APITestCase):
         self.assertEqual(response.status_code, 204)
         self.assertFalse(Task.objects.filter(id=self.task1.id).exists())
         self.assertFalse(Tag.objects.filter(id=self.tag1.id).exists())
+
+    def test_bulk_create_tasks(self):
+        self.client.credentials(HTTP_AUTHORIZATION=self.basic_auth)
+
+        url = reverse("task-bulk")
+        data = [
+            {"title": "Bulk 1", "description": "Bulk", "tags": ["python", "go"]},
+            {"title": "Bulk 2", "description": "Bulk", "status": "COMPLETED"},
+        ]
+        response = self.client.post(url, data, format="json")
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(
+            [task["title"] for task in response.json()], ["Bulk 1", "Bulk 2"]
+        )
+        self.assertEqual(response.json()[0]["tags"], ["python", "go"])
+
+        task = Task.objects.get(title="Bulk 2")
+        self.assertEqual(task.status, Task.StatusChoices.OPEN)
+        self.assertEqual(Tag.objects.filter(name="go").count(), 1)
+
+    def test_bulk_create_queries_do_not_scale_with_tasks(self):
+        self.client.credentials(HTTP_AUTHORIZATION=self.basic_auth)
+
+        def bulk_create_query_count(count):
+            data = [
+                {"title": f"Bulk {i}", "description": "Bulk", "tags": [f"t{count}-{i}"]}
+                for i in range(count)
+            ]
+            with CaptureQueriesContext(connection) as ctx:
+                response = self.client.post(reverse("task-bulk"), data, format="json")
+            self.assertEqual(response.status_code, 201)
+            return len(ctx.captured_queries)
+
+        # Warm up the credential cache so both requests authenticate alike.
+        # Both stay within one batch of the task INSERT (142 rows on SQLite).
+        self.client.get(reverse("task-list"))
+        self.assertEqual(bulk_create_query_count(5), bulk_create_query_count(140))
+
+    def test_bulk_create_reports_errors_per_item(self):
+        self.client.credentials(HTTP_AUTHORIZATION=self.basic_auth)
+
+        data = [
+            {"title": "Bulk 1", "description": "Bulk"},
+            {"title": "", "description": "Bulk"},
+            {
+                "title": "Bulk 3",
+                "description": "Bulk",
+                "due_date": str(now().date() - timedelta(days=2)),
+            },
+        ]
+        response = self.client.post(reverse("task-bulk"), data, format="json")
+
+        self.assertEqual(response.status_code, 400)
+        errors = response.json()
+        self.assertEqual(errors[0], {})
+        self.assertIn("title", errors[1])
+        self.assertIn("status", errors[2])
+        self.assertEqual(Task.objects.count(), 2)
+
+    def test_bulk_update_tasks(self):
+        self.client.credentials(HTTP_AUTHORIZATION=self.basic_auth)
+
+        data = [
+            {"id": self.task1.id, "title": "Updated 1", "tags": ["python"]},
+            {"id": self.task2.id, "status": Task.StatusChoices.COMPLETED},
+        ]
+        response = self.client.patch(reverse("task-bulk"), data, format="json")
+
+        self.assertEqual(response.status_code, 200)
+        self.task1.refresh_from_db()
+        self.task2.refresh_from_db()
+        self.assertEqual(self.task1.title, "Updated 1")
+        self.assertEqual(list(self.task1.tags.all()), [self.tag1])
+        self.assertEqual(self.task2.status, Task.StatusChoices.COMPLETED)
+        self.assertEqual(response.json()[0]["tags"], ["python"])
+
+        # react is no longer used by any task
+        self.assertFalse(Tag.objects.filter(id=self.tag2.id).exists())
+
+    def test_bulk_update_unknown_task(self):
+        self.client.credentials(HTTP_AUTHORIZATION=self.basic_auth)
+
+        data = [{"id": self.task1.id, "title": "Updated"}, {"id": 0, "title": "x"}]
+        response = self.client.patch(reverse("task-bulk"), data, format="json")
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("id", response.json()[1])
+        self.task1.refresh_from_db()
+        self.assertEqual(self.task1.title, "Task 1")
+
+    def test_bulk_delete_tasks(self):
+        self.client.credentials(HTTP_AUTHORIZATION=self.basic_auth)
+
+        data = {"ids": [self.task1.id, 0]}
+        response = self.client.delete(reverse("task-bulk"), data, format="json")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response.json(), {"deleted": [self.task1.id], "not_found": [0]}
+        )
+        self.assertEqual(list(Task.objects.all()), [self.task2])
+        self.assertEqual(Tag.objects.count(), 0)
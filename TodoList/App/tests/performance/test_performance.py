@@ -0,0 +1,303 @@
+"""
+Performance regression tests.
+
+A realistic volume of tasks is seeded once (tags follow a Zipf distribution,
+a few very popular tags and a long tail), then every hot path is measured:
+its query count must stay within a budget that does not depend on the
+volume, and its median latency under a ceiling.
+
+Tune with environment variables:
+    PERF_TASKS            tasks to seed (default 5000, e.g. 100000 nightly)
+    PERF_TAGS             distinct tags (default 500)
+    PERF_REPEAT           timed runs per scenario (default 5)
+    PERF_LATENCY_FACTOR   multiplier applied to every latency ceiling
+    PERF_REPORT           JSON report path (default perf-report.json)
+
+The report lists, per scenario, the query count, median and max latency
+and the budgets, so runs of two releases can be diffed.
+"""
+
+import base64
+import json
+import os
+import platform
+import random
+import statistics
+import time
+from datetime import timedelta
+from django.contrib.admin.sites import site
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import RequestFactory
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils.timezone import now
+from rest_framework.test import APITestCase
+from App import caching
+from App.importing import import_tasks
+from App.models import Task
+
+TASKS = int(os.environ.get("PERF_TASKS", 5000))
+TAGS = int(os.environ.get("PERF_TAGS", 500))
+REPEAT = int(os.environ.get("PERF_REPEAT", 5))
+LATENCY_FACTOR = float(os.environ.get("PERF_LATENCY_FACTOR", 1))
+REPORT = os.environ.get("PERF_REPORT", "perf-report.json")
+
+# Zipf exponent of the tag popularity
+ZIPF_EXPONENT = 1.1
+
+# scenario -> (query budget, median latency ceiling in ms)
+BUDGETS = {
+    "list": (5, 100),
+    "list_deep_page": (5, 150),
+    "list_cursor": (4, 100),
+    "list_filtered": (5, 300),
+    "list_cached": (2, 20),
+    "list_not_modified": (2, 20),
+    "search": (5, 150),
+    "retrieve": (4, 50),
+    "retrieve_not_modified": (2, 20),
+    "create": (20, 100),
+    "update": (25, 150),
+    "destroy": (12, 100),
+    "bulk_create": (17, 300),
+    "bulk_update": (25, 400),
+    "bulk_destroy": (17, 300),
+    "admin_delete_queryset": (15, 300),
+    "tag_autocomplete": (1, 20),
+    "stats": (3, 30),
+}
+
+
+def seed_rows(rng):
+    """Yield import rows for TASKS tasks with Zipf distributed tags."""
+    tags = [f"tag{rank}" for rank in range(TAGS)]
+    weights = [1 / (rank + 1) ** ZIPF_EXPONENT for rank in range(TAGS)]
+    statuses = ["OPEN", "WORKING", "PENDING_REVIEW", "COMPLETED", "CANCELLED"]
+    today = now().date()
+
+    for number in range(TASKS):
+        due_date = today + timedelta(days=rng.randint(0, 365))
+        yield number, {
+            "title": f"Task {number} {rng.choice(['fix', 'write', 'review'])}",
+            "description": f"Description of task {number} about {rng.choice(tags)}",
+            "due_date": str(due_date) if rng.random() < 0.7 else None,
+            "status": rng.choice(statuses),
+            "tags": sorted(set(rng.choices(tags, weights, k=rng.randint(0, 4)))),
+        }
+
+
+class TaskPerformanceTest(APITestCase):
+    results = {}
+
+    @classmethod
+    def setUpTestData(cls):
+        started = time.perf_counter()
+        for _ in import_tasks(seed_rows(random.Random(42))):
+            pass
+        cls.seed_seconds = time.perf_counter() - started
+        User.objects.create_superuser(username="test", password="test")
+
+    @classmethod
+    def tearDownClass(cls):
+        write_report(cls)
+        super().tearDownClass()
+
+    def setUp(self):
+        self.basic_auth = "Basic " + base64.b64encode(b"test:test").decode("utf-8")
+        self.client.credentials(HTTP_AUTHORIZATION=self.basic_auth)
+        # Authenticate once so the credential cache is warm
+        self.client.get(reverse("tag-list"))
+        self.ids = list(Task.objects.values_list("pk", flat=True))
+        self.rng = random.Random(7)
+
+    def measure(self, name, run, prepare=None, cached=False):
+        """
+        Time `run` REPEAT times and check it against the budgets of `name`.
+
+        `prepare` runs before each (untimed) run and returns its arguments.
+        The response cache is cleared first unless `cached`.
+        """
+        queries, durations = [], []
+        for _ in range(REPEAT):
+            args = prepare() if prepare else ()
+            if not cached:
+                caching.get_cache().clear()
+            with CaptureQueriesContext(connection) as context:
+                started = time.perf_counter()
+                run(*args)
+                durations.append((time.perf_counter() - started) * 1000)
+            queries.append(len(context))
+
+        budget, ceiling = BUDGETS[name]
+        ceiling *= LATENCY_FACTOR
+        median = statistics.median(durations)
+        self.results[name] = {
+            "queries": max(queries),
+            "query_budget": budget,
+            "median_ms": round(median, 2),
+            "max_ms": round(max(durations), 2),
+            "ceiling_ms": ceiling,
+        }
+        self.assertLessEqual(max(queries), budget, f"{name}: query budget")
+        self.assertLessEqual(median, ceiling, f"{name}: latency ceiling")
+
+    def get(self, url, params=None):
+        response = self.client.get(url, params or {})
+        self.assertEqual(response.status_code, 200, response.content[:200])
+        return response
+
+    def get_not_modified(self, url, etag):
+        response = self.client.get(url, headers={"If-None-Match": etag})
+        self.assertEqual(response.status_code, 304)
+        return response
+
+    def pop_id(self):
+        return (self.ids.pop(self.rng.randrange(len(self.ids))),)
+
+    def test_list(self):
+        self.measure("list", lambda: self.get(reverse("task-list")))
+        last_page = max(TASKS // 10, 1)
+        self.measure(
+            "list_deep_page",
+            lambda: self.get(reverse("task-list"), {"page": last_page}),
+        )
+        self.measure(
+            "list_cursor",
+            lambda: self.get(
+                reverse("task-list"), {"pagination": "cursor", "ordering": "due_date"}
+            ),
+        )
+        self.measure(
+            "list_filtered",
+            lambda: self.get(
+                reverse("task-list"),
+                {"status": "OPEN,WORKING", "tags_any": "tag0,tag5", "tags_all": "tag1"},
+            ),
+        )
+        self.get(reverse("task-list"))
+        self.measure("list_cached", lambda: self.get(reverse("task-list")), cached=True)
+
+        etag = self.get(reverse("task-list"))["ETag"]
+        self.measure(
+            "list_not_modified",
+            lambda: self.get_not_modified(reverse("task-list"), etag),
+        )
+
+    def test_search(self):
+        self.measure(
+            "search", lambda: self.get(reverse("task-list"), {"search": "review tag3"})
+        )
+
+    def test_retrieve(self):
+        self.measure(
+            "retrieve",
+            lambda pk: self.get(reverse("task-detail", args=[pk])),
+            prepare=lambda: (self.rng.choice(self.ids),),
+        )
+
+        def prepare_not_modified():
+            url = reverse("task-detail", args=[self.rng.choice(self.ids)])
+            return url, self.get(url)["ETag"]
+
+        self.measure(
+            "retrieve_not_modified",
+            self.get_not_modified,
+            prepare=prepare_not_modified,
+            cached=True,
+        )
+
+    def test_writes(self):
+        def create():
+            response = self.client.post(
+                reverse("task-list"),
+                {"title": "New", "description": "New task", "tags": ["tag0", "new"]},
+                format="json",
+            )
+            self.assertEqual(response.status_code, 201)
+
+        def update(pk):
+            response = self.client.patch(
+                reverse("task-detail", args=[pk]),
+                {"title": "Updated", "tags": ["tag1", "tag2"]},
+                format="json",
+            )
+            self.assertEqual(response.status_code, 200, response.content)
+
+        def destroy(pk):
+            response = self.client.delete(reverse("task-detail", args=[pk]))
+            self.assertEqual(response.status_code, 204)
+
+        self.measure("create", create)
+        self.measure("update", update, prepare=lambda: (self.rng.choice(self.ids),))
+        self.measure("destroy", destroy, prepare=self.pop_id)
+
+    def test_bulk(self):
+        def bulk_create():
+            items = [
+                {"title": f"Bulk {i}", "description": "Bulk", "tags": [f"tag{i}"]}
+                for i in range(100)
+            ]
+            response = self.client.post(reverse("task-bulk"), items, format="json")
+            self.assertEqual(response.status_code, 201)
+
+        def bulk_update(ids):
+            items = [{"id": pk, "status": "WORKING", "tags": ["tag3"]} for pk in ids]
+            response = self.client.patch(reverse("task-bulk"), items, format="json")
+            self.assertEqual(response.status_code, 200)
+
+        def bulk_destroy(ids):
+            response = self.client.delete(
+                reverse("task-bulk"), {"ids": ids}, format="json"
+            )
+            self.assertEqual(response.status_code, 200)
+
+        def sample():
+            return (self.rng.sample(self.ids, 100),)
+
+        def pop_sample():
+            return ([self.pop_id()[0] for _ in range(100)],)
+
+        self.measure("bulk_create", bulk_create)
+        self.measure("bulk_update", bulk_update, prepare=sample)
+        self.measure("bulk_destroy", bulk_destroy, prepare=pop_sample)
+
+    def test_admin_delete_queryset(self):
+        admin = site._registry[Task]
+        request = RequestFactory().post("/admin/App/task/")
+        request.user = User.objects.get(username="test")
+
+        def pop_queryset():
+            return (Task.objects.filter(pk__in=[self.pop_id()[0] for _ in range(100)]),)
+
+        self.measure(
+            "admin_delete_queryset",
+            lambda queryset: admin.delete_queryset(request, queryset),
+            prepare=pop_queryset,
+        )
+
+    def test_tag_autocomplete(self):
+        self.get(reverse("tag-autocomplete"), {"q": "tag"})
+        self.measure(
+            "tag_autocomplete",
+            lambda: self.get(reverse("tag-autocomplete"), {"q": "tag1"}),
+        )
+
+    def test_stats(self):
+        self.measure("stats", lambda: self.get(reverse("task-stats")))
+
+
+def write_report(test_class):
+    report = {
+        "tasks": TASKS,
+        "tags": TAGS,
+        "repeat": REPEAT,
+        "latency_factor": LATENCY_FACTOR,
+        "seed_seconds": round(getattr(test_class, "seed_seconds", 0), 2),
+        "python": platform.python_version(),
+        "sqlite": connection.Database.sqlite_version,
+        "scenarios": dict(sorted(test_class.results.items())),
+    }
+    with open(REPORT, "w") as output:
+        json.dump(report, output, indent=2)
+        output.write("\n")
@@ -1,6 +1,8 @@
 # from django.forms import ValidationError
 from unittest.mock import MagicMock
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from django.contrib.admin.sites import site
 from django.urls import reverse
 from App.models import Tag, Task
@@ -99,3 +101,37 @@ class TaskAdminTests(TestCase):
 
         # Check if the task was deleted
         self.assertEqual(response.status_code, 302)
+
+    def test_delete_model_removes_orphan_tags(self):
+        model_admin = site._registry[Task]
+        request = HttpRequest()
+        request.user = self.user
+
+        shared = Tag.objects.create(name="shared")
+        other = Task.objects.create(title="Task 2", description="Test task")
+        self.task.tags.add(shared)
+        other.tags.add(shared)
+
+        model_admin.delete_model(request, self.task)
+
+        self.assertFalse(Tag.objects.filter(id=self.tag1.id).exists())
+        self.assertTrue(Tag.objects.filter(id=shared.id).exists())
+
+    def test_delete_queryset_queries_do_not_scale_with_tasks(self):
+        model_admin = site._registry[Task]
+        request = HttpRequest()
+        request.user = self.user
+
+        def delete_all_query_count(count):
+            for i in range(count):
+                task = Task.objects.create(title=f"Task {i}", description="Test")
+                task.tags.add(Tag.objects.create(name=f"tag {count}-{i}"))
+
+            with CaptureQueriesContext(connection) as ctx:
+                model_admin.delete_queryset(request, Task.objects.all())
+
+            self.assertEqual(Task.objects.count(), 0)
+            self.assertEqual(Tag.objects.count(), 0)
+            return len(ctx.captured_queries)
+
+        self.assertEqual(delete_all_query_count(2), delete_all_query_count(20))
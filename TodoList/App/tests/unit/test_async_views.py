@@ -0,0 +1,111 @@
+import base64
+from asgiref.sync import sync_to_async
+from datetime import timedelta
+from unittest import mock
+from django.contrib.auth.models import User
+from django.test import TestCase
+from django.urls import reverse
+from django.utils.timezone import now
+from rest_framework.test import APIClient
+from App.authentication import credential_cache
+from App.models import Task, Tag
+
+
+class AsyncTaskViewTest(TestCase):
+    def setUp(self):
+        credential_cache.clear()
+        python = Tag.objects.create(name="python")
+        self.tasks = [
+            Task.objects.create(title=f"Task {i}", description="Description")
+            for i in range(12)
+        ]
+        self.tasks[0].tags.add(python)
+
+        self.user = User.objects.create_user(username="test", password="test")
+        self.basic_auth = "Basic " + base64.b64encode(b"test:test").decode("utf-8")
+        self.api_client = APIClient()
+        self.api_client.credentials(HTTP_AUTHORIZATION=self.basic_auth)
+
+    async def _get(self, url, params=None, **headers):
+        headers.setdefault("authorization", self.basic_auth)
+        return await self.async_client.get(url, params or {}, headers=headers)
+
+    async def test_list_matches_the_sync_api(self):
+        for params in ({}, {"page": 2}, {"page_size": 5, "page": 2}):
+            response = await self._get(reverse("async-task-list"), params)
+            self.assertEqual(response.status_code, 200)
+            expected = await self._sync_get(reverse("task-list"), params)
+            data = response.json()
+            self.assertEqual(data["results"], expected["results"])
+            self.assertEqual(data["count"], expected["count"])
+            self.assertEqual(
+                [data["next"] is None, data["previous"] is None],
+                [expected["next"] is None, expected["previous"] is None],
+            )
+
+        response = await self._get(reverse("async-task-list"), {"page": 5})
+        self.assertEqual(response.status_code, 404)
+
+    async def test_list_filters(self):
+        response = await self._get(reverse("async-task-list"), {"tags_any": "python"})
+        self.assertEqual(
+            [task["id"] for task in response.json()["results"]], [self.tasks[0].id]
+        )
+        response = await self._get(reverse("async-task-list"), {"status": "DONE"})
+        self.assertEqual(response.status_code, 400)
+
+    async def test_retrieve(self):
+        url = reverse("async-task-detail", args=[self.tasks[0].id])
+        response = await self._get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response.json(),
+            await self._sync_get(reverse("task-detail", args=[self.tasks[0].id])),
+        )
+
+        response = await self._get(reverse("async-task-detail", args=[0]))
+        self.assertEqual(response.status_code, 404)
+
+    async def test_create(self):
+        response = await self.async_client.post(
+            reverse("async-task-list"),
+            {"title": "New", "description": "Description", "tags": ["python", "new"]},
+            content_type="application/json",
+            headers={"authorization": self.basic_auth},
+        )
+        self.assertEqual(response.status_code, 201)
+        data = response.json()
+        self.assertEqual(data["status"], "OPEN")
+        self.assertEqual(data["tags"], ["python", "new"])
+        self.assertEqual(await Tag.objects.filter(name="new").acount(), 1)
+
+        past = str(now().date() - timedelta(days=1))
+        response = await self.async_client.post(
+            reverse("async-task-list"),
+            {"title": "Late", "description": "Description", "due_date": past},
+            content_type="application/json",
+            headers={"authorization": self.basic_auth},
+        )
+        self.assertEqual(response.status_code, 400)
+
+    async def test_create_is_atomic(self):
+        with mock.patch("App.serializers.resolve_tags", side_effect=RuntimeError):
+            with self.assertRaises(RuntimeError):
+                await self.async_client.post(
+                    reverse("async-task-list"),
+                    {"title": "New", "description": "Description", "tags": ["new"]},
+                    content_type="application/json",
+                    headers={"authorization": self.basic_auth},
+                )
+        self.assertFalse(await Task.objects.filter(title="New").aexists())
+
+    async def test_authentication(self):
+        response = await self._get(reverse("async-task-list"), authorization="")
+        self.assertEqual(response.status_code, 401)
+        wrong = "Basic " + base64.b64encode(b"test:wrong").decode("utf-8")
+        response = await self._get(reverse("async-task-list"), authorization=wrong)
+        self.assertEqual(response.status_code, 401)
+
+    async def _sync_get(self, url, params=None):
+        response = await sync_to_async(self.api_client.get)(url, params or {})
+        return response.json()
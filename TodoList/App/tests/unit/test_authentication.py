@@ -0,0 +1,78 @@
+import base64
+from unittest.mock import patch
+from django.contrib.auth.models import User
+from django.test import SimpleTestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from App.authentication import CredentialCache, credential_cache
+
+
+class CachedBasicAuthenticationTest(APITestCase):
+    def setUp(self):
+        credential_cache.clear()
+        self.user = User.objects.create_user(username="test", password="test")
+        self.url = reverse("task-list")
+
+    def _get(self, password="test"):
+        credentials = base64.b64encode(f"test:{password}".encode()).decode("utf-8")
+        self.client.credentials(HTTP_AUTHORIZATION="Basic " + credentials)
+        return self.client.get(self.url)
+
+    def test_password_is_hashed_once(self):
+        with patch.object(
+            User, "check_password", autospec=True, side_effect=User.check_password
+        ) as check_password:
+            self.assertEqual(self._get().status_code, status.HTTP_200_OK)
+            self.assertEqual(self._get().status_code, status.HTTP_200_OK)
+
+        self.assertEqual(check_password.call_count, 1)
+
+    def test_wrong_password_is_rejected(self):
+        self._get()
+        response = self._get(password="wrong")
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_password_change_invalidates_cache(self):
+        self._get()
+        self.user.set_password("changed")
+        self.user.save()
+
+        response = self._get()
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertEqual(self._get(password="changed").status_code, 200)
+
+    def test_inactive_user_is_rejected(self):
+        self._get()
+        self.user.is_active = False
+        self.user.save()
+
+        response = self._get()
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+
+class CredentialCacheTest(SimpleTestCase):
+    def setUp(self):
+        self.users = [User(username=f"user{i}", password=f"hash{i}") for i in range(3)]
+
+    def test_least_recently_used_entry_is_evicted(self):
+        cache = CredentialCache(max_entries=2)
+        cache.add(self.users[0], "secret")
+        cache.add(self.users[1], "secret")
+        self.assertEqual(cache.get("user0", "secret"), "hash0")
+
+        cache.add(self.users[2], "secret")
+
+        self.assertEqual(cache.get("user0", "secret"), "hash0")
+        self.assertIsNone(cache.get("user1", "secret"))
+        self.assertEqual(cache.get("user2", "secret"), "hash2")
+
+    def test_wrong_password_misses(self):
+        cache = CredentialCache()
+        cache.add(self.users[0], "secret")
+        self.assertIsNone(cache.get("user0", "other"))
+
+    def test_entries_expire(self):
+        cache = CredentialCache(ttl=0)
+        cache.add(self.users[0], "secret")
+        self.assertIsNone(cache.get("user0", "secret"))
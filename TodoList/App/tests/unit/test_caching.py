@@ -0,0 +1,120 @@
+import base64
+from django.core.cache import cache
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from App import caching, conditional
+from App.models import Task, Tag
+from django.contrib.auth.models import User
+
+
+class TaskCachingTest(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.tag1 = Tag.objects.create(name="python")
+        self.task1 = Task.objects.create(title="Task 1", description="Description")
+        self.task2 = Task.objects.create(title="Task 2", description="Description")
+        self.task1.tags.add(self.tag1)
+
+        self.user = User.objects.create_user(username="test", password="test")
+        self.basic_auth = "Basic " + base64.b64encode(b"test:test").decode("utf-8")
+        self.client.credentials(HTTP_AUTHORIZATION=self.basic_auth)
+
+        self.list_url = reverse("task-list")
+        self.detail_url = reverse("task-detail", kwargs={"pk": self.task1.pk})
+
+    def test_detail_is_served_from_cache(self):
+        first = self.client.get(self.detail_url)
+
+        # Only authentication and the version of the task touch the database
+        with self.assertNumQueries(2):
+            second = self.client.get(self.detail_url)
+
+        self.assertEqual(first.json(), second.json())
+        self.assertEqual(first["ETag"], second["ETag"])
+
+    def test_if_none_match_returns_not_modified(self):
+        etag = self.client.get(self.list_url)["ETag"]
+
+        response = self.client.get(self.list_url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response.content, b"")
+        self.assertEqual(response["ETag"], etag)
+
+    def test_task_write_invalidates_detail_and_list(self):
+        detail_etag = self.client.get(self.detail_url)["ETag"]
+        list_etag = self.client.get(self.list_url)["ETag"]
+
+        self.client.patch(self.detail_url, {"title": "Changed"}, format="json")
+
+        response = self.client.get(self.detail_url, HTTP_IF_NONE_MATCH=detail_etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()["title"], "Changed")
+        response = self.client.get(self.list_url, HTTP_IF_NONE_MATCH=list_etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_late_reader_can_not_cache_a_stale_detail(self):
+        etag = self.client.get(self.detail_url)["ETag"]
+        entry = caching.get_entry(caching.task_key(self.task1.pk, etag))
+
+        self.client.patch(self.detail_url, {"title": "Changed"}, format="json")
+        # A reader that loaded the task before the write stores it after
+        caching.set_entry(caching.task_key(self.task1.pk, etag), *entry)
+
+        response = self.client.get(self.detail_url)
+        self.assertEqual(response.json()["title"], "Changed")
+        response = self.client.get(self.detail_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.json()["title"], "Changed")
+
+    def test_late_reader_can_not_cache_a_stale_list(self):
+        url = "http://testserver" + self.list_url
+        self.client.get(self.list_url)
+        validators = conditional.list_validators()
+        entry = caching.get_entry(caching.list_key(url, *validators))
+
+        self.client.patch(self.detail_url, {"title": "Changed"}, format="json")
+        # A reader that read the page before the write, or from a lagging
+        # replica, stores it under the change it saw
+        caching.set_entry(caching.list_key(url, *validators), *entry)
+
+        results = self.client.get(self.list_url).json()["results"]
+        self.assertIn("Changed", [task["title"] for task in results])
+
+    def test_list_is_served_from_cache(self):
+        first = self.client.get(self.list_url)
+
+        # Only authentication and the latest change touch the database
+        with self.assertNumQueries(2):
+            second = self.client.get(self.list_url)
+
+        self.assertEqual(first.json(), second.json())
+
+    def test_other_task_detail_stays_cached(self):
+        other_url = reverse("task-detail", kwargs={"pk": self.task2.pk})
+        self.client.get(self.detail_url)
+
+        self.task2.title = "Changed"
+        self.task2.save()
+        self.client.get(other_url)
+
+        with self.assertNumQueries(2):
+            self.client.get(self.detail_url)
+
+    def test_tag_changes_invalidate_details(self):
+        self.client.get(self.detail_url)
+
+        self.tag1.name = "django"
+        self.tag1.save()
+        self.assertEqual(self.client.get(self.detail_url).json()["tags"], ["django"])
+
+        self.task1.tags.clear()
+        self.assertEqual(self.client.get(self.detail_url).json()["tags"], [])
+
+    def test_bulk_writes_invalidate_cache(self):
+        self.client.get(self.detail_url)
+
+        data = [{"id": self.task1.pk, "title": "Bulk"}]
+        self.client.patch(reverse("task-bulk"), data, format="json")
+
+        self.assertEqual(self.client.get(self.detail_url).json()["title"], "Bulk")
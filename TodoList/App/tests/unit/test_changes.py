@@ -0,0 +1,220 @@
+import base64
+from datetime import timedelta
+from io import StringIO
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.db import transaction
+from django.urls import reverse
+from django.utils.timezone import now
+from rest_framework.test import APITestCase
+from App.importing import import_tasks
+from App.models import Task, TaskChange, Tag
+
+
+class TaskChangeFeedTest(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="test", password="test")
+        self.basic_auth = "Basic " + base64.b64encode(b"test:test").decode("utf-8")
+        self.client.credentials(HTTP_AUTHORIZATION=self.basic_auth)
+
+    def _log(self):
+        return list(TaskChange.objects.values_list("task_id", "action"))
+
+    def _feed(self, **params):
+        response = self.client.get(reverse("task-changes"), params)
+        self.assertEqual(response.status_code, 200, response.content)
+        return response.data
+
+    def test_api_writes_are_logged(self):
+        response = self.client.post(
+            reverse("task-list"),
+            {"title": "Task", "description": "Task", "tags": ["python"]},
+            format="json",
+        )
+        pk = response.data["id"]
+        # The tags are added after the insert, in the same logical write
+        self.assertEqual(self._log(), [(pk, "created")])
+
+        TaskChange.objects.all().delete()
+        self.client.patch(
+            reverse("task-detail", args=[pk]),
+            {"title": "Renamed", "tags": ["django"]},
+            format="json",
+        )
+        self.client.delete(reverse("task-detail", args=[pk]))
+        self.assertEqual(self._log(), [(pk, "updated"), (pk, "deleted")])
+
+    def test_bulk_writes_are_logged(self):
+        response = self.client.post(
+            reverse("task-bulk"),
+            [{"title": f"Bulk {i}", "description": "Bulk"} for i in range(3)],
+            format="json",
+        )
+        ids = [item["id"] for item in response.data]
+        self.client.patch(
+            reverse("task-bulk"), [{"id": ids[0], "status": "WORKING"}], format="json"
+        )
+        self.client.delete(reverse("task-bulk"), {"ids": ids[1:]}, format="json")
+        list(import_tasks([(1, {"title": "Imported", "description": "Task"})]))
+        imported = Task.objects.get(title="Imported").pk
+
+        self.assertEqual(
+            self._log(),
+            [(pk, "created") for pk in ids]
+            + [(ids[0], "updated")]
+            + [(pk, "deleted") for pk in ids[1:]]
+            + [(imported, "created")],
+        )
+
+    def test_tag_rename_logs_the_tasks_carrying_it(self):
+        task = Task.objects.create(title="Task", description="Task")
+        tag = Tag.objects.create(name="python")
+        task.tags.add(tag)
+        TaskChange.objects.all().delete()
+
+        tag.name = "py"
+        tag.save()
+        self.assertEqual(self._log(), [(task.pk, "updated")])
+
+    def test_rolled_back_writes_are_not_logged(self):
+        with transaction.atomic():
+            Task.objects.create(title="Task", description="Task")
+            transaction.set_rollback(True)
+        self.assertEqual(self._log(), [])
+
+    def test_feed_batches_and_merges_changes(self):
+        Task.objects.create(title="Before", description="Task")
+        since = self._feed()["last_seq"]
+        first = Task.objects.create(title="First", description="Task")
+        second = Task.objects.create(title="Second", description="Task")
+        second_pk = second.pk
+        first.title = "First again"
+        first.save()
+        second.delete()
+        third = Task.objects.create(title="Third", description="Task")
+
+        data = self._feed(since=since, limit=3)
+        self.assertTrue(data["has_more"])
+        self.assertEqual(
+            [(change["task_id"], change["action"]) for change in data["changes"]],
+            [(second_pk, "created"), (first.pk, "created")],
+        )
+        self.assertEqual(data["changes"][1]["task"]["title"], "First again")
+        self.assertIsNone(data["changes"][0]["task"])  # deleted since
+
+        data = self._feed(since=data["last_seq"])
+        self.assertFalse(data["has_more"])
+        self.assertEqual(
+            [(change["task_id"], change["action"]) for change in data["changes"]],
+            [(second_pk, "deleted"), (third.pk, "created")],
+        )
+
+        last_seq = data["last_seq"]
+        data = self._feed(since=last_seq)
+        self.assertEqual(data, {"changes": [], "last_seq": last_seq, "has_more": False})
+
+    def test_feed_keeps_creations(self):
+        Task.objects.create(title="Before", description="Task")
+        since = self._feed()["last_seq"]
+        response = self.client.post(
+            reverse("task-list"),
+            {"title": "Task", "description": "Task", "tags": ["python"]},
+            format="json",
+        )
+        pk = response.data["id"]
+        self.client.patch(
+            reverse("task-detail", args=[pk]), {"title": "Renamed"}, format="json"
+        )
+        removed = Task.objects.create(title="Removed", description="Task")
+        removed.delete()
+
+        # Created then updated, the other one never showed up
+        changes = self._feed(since=since)["changes"]
+        self.assertEqual(
+            [(change["task_id"], change["action"]) for change in changes],
+            [(pk, "created")],
+        )
+        self.assertEqual(changes[0]["task"]["tags"], ["python"])
+
+    def test_feed_query_count(self):
+        for i in range(20):
+            Task.objects.create(title=f"Task {i}", description="Task")
+        self._feed()  # warm the credential cache
+
+        # The user, the oldest change, the changes, the tasks and their tags
+        with self.assertNumQueries(5):
+            self._feed(since=1)
+
+    def test_pruned_history_answers_gone(self):
+        for i in range(3):
+            Task.objects.create(title=f"Task {i}", description="Task")
+        seqs = list(TaskChange.objects.values_list("seq", flat=True))
+        TaskChange.objects.filter(seq__lt=seqs[-1]).update(
+            changed_at=now() - timedelta(days=40)
+        )
+
+        out = StringIO()
+        call_command("prune_task_changes", "--days", "30", stdout=out)
+        self.assertIn("Pruned 2 change(s)", out.getvalue())
+
+        response = self.client.get(reverse("task-changes"), {"since": seqs[0]})
+        self.assertEqual(response.status_code, 410)
+        self.assertEqual(len(self._feed(since=seqs[1])["changes"]), 1)
+
+        response = self.client.get(reverse("task-changes"), {"since": "latest"})
+        self.assertEqual(response.status_code, 400)
+
+    def test_snapshot_recovers_pruned_tasks(self):
+        tasks = [
+            Task.objects.create(title=f"Task {i}", description="Task") for i in range(3)
+        ]
+        tasks[0].tags.add(Tag.objects.create(name="python"))
+        seqs = list(TaskChange.objects.values_list("seq", flat=True))
+        call_command("prune_task_changes", "--days", "0", stdout=StringIO())
+        response = self.client.get(reverse("task-changes"), {"since": seqs[0]})
+        self.assertEqual(response.status_code, 410)
+
+        # The snapshot is continued as of the sequence number it started at
+        data = self._feed(since=0, limit=2)
+        self.assertEqual((data["last_seq"], data["has_more"]), (seqs[-1], True))
+        changes = data["changes"]
+        Task.objects.create(title="Later", description="Task")
+        data = self._feed(since=data["last_seq"], after=data["after"], limit=2)
+        self.assertEqual((data["has_more"], data["after"]), (False, None))
+        changes += data["changes"]
+
+        self.assertEqual(
+            [(change["task_id"], change["action"]) for change in changes[:3]],
+            [(task.pk, "created") for task in tasks],
+        )
+        self.assertEqual(changes[0]["task"]["tags"], ["python"])
+        self.assertEqual(changes[3]["task"]["title"], "Later")
+
+        # Then the changes after the snapshot, the new task among them
+        data = self._feed(since=data["last_seq"])
+        self.assertEqual(
+            [change["task"]["title"] for change in data["changes"]], ["Later"]
+        )
+
+    def test_pruning_keeps_the_latest_change(self):
+        task = Task.objects.create(title="Task", description="Task")
+        pk = task.pk
+        since = self._feed()["last_seq"]
+        etag = self.client.get(reverse("task-list"))["ETag"]
+        task.delete()
+
+        out = StringIO()
+        call_command("prune_task_changes", "--days", "0", stdout=out)
+        self.assertIn("Pruned 1 change(s)", out.getvalue())
+        self.assertEqual(self._log(), [(pk, "deleted")])
+
+        # Still in sync with what is left, the list changed
+        self.assertEqual(len(self._feed(since=since)["changes"]), 1)
+        response = self.client.get(
+            reverse("task-list"), headers={"If-None-Match": etag}
+        )
+        self.assertEqual(response.status_code, 200)
+
+        TaskChange.objects.all().delete()
+        response = self.client.get(reverse("task-changes"), {"since": since})
+        self.assertEqual(response.status_code, 410)
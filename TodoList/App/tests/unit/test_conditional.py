@@ -0,0 +1,159 @@
+import base64
+from django.contrib.auth.models import User
+from django.urls import reverse
+from rest_framework.test import APITestCase
+from App.models import Tag, Task
+from App.services import mark_overdue_tasks
+
+
+class TaskConditionalRequestTest(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="test", password="test")
+        self.basic_auth = "Basic " + base64.b64encode(b"test:test").decode("utf-8")
+        self.client.credentials(HTTP_AUTHORIZATION=self.basic_auth)
+        self.task = Task.objects.create(title="Task", description="Task")
+        self.url = reverse("task-detail", args=[self.task.pk])
+
+    def _version(self, task=None):
+        return Task.objects.get(pk=(task or self.task).pk).version
+
+    def test_every_write_bumps_the_version(self):
+        version = self._version()
+        self.assertEqual(self.task.version, version)
+        self.assertGreater(version, 0)
+
+        def assertBumped():
+            nonlocal version
+            new_version = self._version()
+            self.assertGreater(new_version, version)
+            version = new_version
+
+        self.task.title = "Renamed"
+        self.task.save()
+        self.assertEqual(self.task.version, self._version())
+        assertBumped()
+
+        tag = Tag.objects.create(name="python")
+        self.task.tags.add(tag)
+        assertBumped()
+        tag.name = "py"
+        tag.save()
+        assertBumped()
+        tag.task_set.clear()
+        assertBumped()
+
+        self.client.patch(
+            reverse("task-bulk"),
+            [{"id": self.task.pk, "status": "WORKING"}],
+            format="json",
+        )
+        assertBumped()
+
+        Task.objects.filter(pk=self.task.pk).update(due_date="2020-01-01")
+        list(mark_overdue_tasks())
+        assertBumped()
+
+    def test_responses_carry_the_version(self):
+        response = self.client.patch(self.url, {"tags": ["python"]}, format="json")
+        self.assertEqual(response.data["version"], self._version())
+        self.assertEqual(response["ETag"], f'"{self._version()}"')
+
+        response = self.client.get(self.url)
+        self.assertEqual(response.data["version"], self._version())
+        self.assertEqual(response["ETag"], f'"{self._version()}"')
+        self.assertIn("Last-Modified", response)
+
+        response = self.client.post(
+            reverse("task-bulk"),
+            [{"title": "Bulk", "description": "Bulk"}],
+            format="json",
+        )
+        task = Task.objects.get(pk=response.data[0]["id"])
+        self.assertEqual(response.data[0]["version"], task.version)
+
+    def test_unchanged_detail_answers_not_modified(self):
+        response = self.client.get(self.url)
+        etag, last_modified = response["ETag"], response["Last-Modified"]
+
+        # The user and the version of the task
+        with self.assertNumQueries(2):
+            response = self.client.get(self.url, headers={"If-None-Match": etag})
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response["ETag"], etag)
+        response = self.client.get(
+            self.url, headers={"If-Modified-Since": last_modified}
+        )
+        self.assertEqual(response.status_code, 304)
+
+        self.task.tags.add(Tag.objects.create(name="python"))
+        response = self.client.get(self.url, headers={"If-None-Match": etag})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["tags"], ["python"])
+        self.assertNotEqual(response["ETag"], etag)
+
+        response = self.client.get(
+            reverse("task-detail", args=[self.task.pk + 1]),
+            headers={"If-None-Match": etag},
+        )
+        self.assertEqual(response.status_code, 404)
+
+    def test_unchanged_list_answers_not_modified(self):
+        other = Task.objects.create(title="Other", description="Task")
+        response = self.client.get(reverse("task-list"), {"status": "OPEN"})
+        etag = response["ETag"]
+
+        with self.assertNumQueries(2):
+            response = self.client.get(
+                reverse("task-list"),
+                {"status": "OPEN"},
+                headers={"If-None-Match": etag},
+            )
+        self.assertEqual(response.status_code, 304)
+
+        # Deletions change the list too
+        other.delete()
+        response = self.client.get(
+            reverse("task-list"), {"status": "OPEN"}, headers={"If-None-Match": etag}
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["count"], 1)
+
+    def test_if_match_guards_updates(self):
+        stale = f'"{self._version()}"'
+        self.client.patch(self.url, {"title": "First"}, format="json")
+
+        response = self.client.patch(
+            self.url, {"title": "Second"}, format="json", headers={"If-Match": stale}
+        )
+        self.assertEqual(response.status_code, 412)
+        self.assertEqual(Task.objects.get(pk=self.task.pk).title, "First")
+        response = self.client.delete(self.url, headers={"If-Match": stale})
+        self.assertEqual(response.status_code, 412)
+
+        current = f'"{self._version()}"'
+        response = self.client.patch(
+            self.url, {"title": "Second"}, format="json", headers={"If-Match": current}
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["title"], "Second")
+        response = self.client.put(
+            self.url,
+            {"title": "Third", "description": "Task"},
+            format="json",
+            headers={"If-Match": "*"},
+        )
+        self.assertEqual(response.status_code, 200)
+
+    def test_version_after_filter(self):
+        response = self.client.get(reverse("task-list"))
+        list_version = response["ETag"].strip('"')
+        changed = Task.objects.create(title="Changed", description="Task")
+
+        response = self.client.get(
+            reverse("task-list"), {"version_after": list_version}
+        )
+        self.assertEqual(
+            [task["id"] for task in response.data["results"]], [changed.pk]
+        )
+        response = self.client.get(reverse("task-list"), {"version_after": "latest"})
+        self.assertEqual(response.status_code, 400)
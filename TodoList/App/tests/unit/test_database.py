@@ -0,0 +1,91 @@
+import re
+import sqlite3
+import tempfile
+from io import StringIO
+from pathlib import Path
+from django.conf import settings
+from django.core.management import CommandError, call_command
+from django.db import connections, transaction
+from django.test import SimpleTestCase
+from App.management.commands.benchmark_database import Command
+
+
+def add_benchmark_databases(test_class, directory):
+    """Register the scratch aliases of `benchmark_database` for `test_class`."""
+    aliases = {
+        Command().add_database(profile, Path(directory) / f"{profile}.sqlite3")
+        for profile in settings.DATABASE_PROFILES
+    }
+    # Test cases only let the aliases they declare connect
+    test_class.databases = aliases
+    for alias in aliases:
+        test_class.addClassCleanup(remove_database, alias)
+
+
+def remove_database(alias):
+    if alias in connections.settings:
+        Command().remove_database(alias)
+
+
+class DatabaseProfileTest(SimpleTestCase):
+    @classmethod
+    def setUpClass(cls):
+        directory = tempfile.TemporaryDirectory()
+        cls.addClassCleanup(directory.cleanup)
+        add_benchmark_databases(cls, directory.name)
+        cls.alias = "benchmark_production"
+        cls.path = Path(directory.name) / "production.sqlite3"
+        super().setUpClass()
+
+    def test_production_profile_uses_wal(self):
+        with connections[self.alias].cursor() as cursor:
+            cursor.execute("PRAGMA journal_mode")
+            self.assertEqual(cursor.fetchone()[0], "wal")
+            cursor.execute("PRAGMA synchronous")
+            self.assertEqual(cursor.fetchone()[0], 1)  # NORMAL
+
+    def test_production_profile_writes_begin_immediate(self):
+        connection = connections[self.alias]
+        with connection.cursor() as cursor:
+            cursor.execute("CREATE TABLE probe (id INTEGER PRIMARY KEY)")
+
+        other = sqlite3.connect(self.path, timeout=0)
+        self.addCleanup(other.close)
+        with transaction.atomic(using=self.alias):
+            # The write lock is taken before any statement of the block
+            self.assertTrue(connection.connection.in_transaction)
+            with self.assertRaises(sqlite3.OperationalError):
+                other.execute("BEGIN IMMEDIATE")
+        other.execute("BEGIN IMMEDIATE")
+        other.rollback()
+
+    def test_default_profile_is_untouched(self):
+        self.assertEqual(settings.DATABASE_PROFILES["default"], {})
+
+
+class BenchmarkDatabaseCommandTest(SimpleTestCase):
+    @classmethod
+    def setUpClass(cls):
+        directory = tempfile.TemporaryDirectory()
+        cls.addClassCleanup(directory.cleanup)
+        add_benchmark_databases(cls, directory.name)
+        super().setUpClass()
+
+    def test_runs_every_profile(self):
+        out = StringIO()
+        call_command(
+            "benchmark_database",
+            threads=2,
+            duration=0.2,
+            tasks=20,
+            stdout=out,
+        )
+        for profile in settings.DATABASE_PROFILES:
+            # Clients that crashed would report nothing at all
+            line = re.search(rf"{profile}: +(\d+) reads/s", out.getvalue())
+            self.assertGreater(int(line[1]), 0)
+        self.assertNotIn("benchmark_production", connections.settings)
+
+    def test_unknown_profile(self):
+        with self.assertRaisesMessage(CommandError, "Unknown profile(s): nope"):
+            call_command("benchmark_database", profiles=["nope"])
@@ -0,0 +1,146 @@
+import asyncio
+import base64
+import json
+from unittest import mock
+from asgiref.sync import sync_to_async
+from django.contrib.auth.models import User
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from App.async_views import AsyncTaskEventsView
+from App.authentication import credential_cache
+from App.events import SubscriptionDropped, TaskEventBroker
+from App.models import Tag, Task, TaskChange
+
+
+def parse_event(message):
+    fields = dict(line.split(": ", 1) for line in message.strip().splitlines())
+    return fields["id"], fields["event"], json.loads(fields["data"])
+
+
+@override_settings(TASK_EVENTS_POLL_INTERVAL=0.01)
+class TaskEventsTest(TestCase):
+    def setUp(self):
+        credential_cache.clear()
+        User.objects.create_user(username="test", password="test")
+        self.basic_auth = "Basic " + base64.b64encode(b"test:test").decode("utf-8")
+        self.python = Tag.objects.create(name="python")
+
+    async def _get(self, params=None, **headers):
+        headers.setdefault("authorization", self.basic_auth)
+        return await self.async_client.get(
+            reverse("async-task-events"), params or {}, headers=headers
+        )
+
+    async def _next(self, content):
+        return (await asyncio.wait_for(anext(content), 5)).decode()
+
+    @sync_to_async
+    def _create(self, title, status="OPEN", tags=()):
+        task = Task.objects.create(title=title, description="Task", status=status)
+        task.tags.add(*tags)
+        return task
+
+    async def test_stream_pushes_matching_changes(self):
+        response = await self._get({"status": "OPEN,WORKING"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Type"], "text/event-stream")
+        content = aiter(response.streaming_content)
+
+        await self._create("Done", status="COMPLETED")
+        task = await self._create("Open")
+        seq, action, data = parse_event(await self._next(content))
+        self.assertEqual(action, "created")
+        self.assertEqual(data["task"]["title"], "Open")
+        self.assertEqual(int(seq), data["seq"])
+
+        pk = task.pk
+        await sync_to_async(task.delete)()
+        _, action, data = parse_event(await self._next(content))
+        self.assertEqual((action, data["task_id"], data["task"]), ("deleted", pk, None))
+        await content.aclose()
+
+    async def test_stream_filters_by_tag_and_keeps_alive(self):
+        response = await self._get({"tags_any": "python"})
+        content = aiter(response.streaming_content)
+
+        await self._create("Untagged")
+        await self._create("Tagged", tags=[self.python])
+        _, _, data = parse_event(await self._next(content))
+        self.assertEqual(data["task"]["tags"], ["python"])
+
+        with mock.patch.object(AsyncTaskEventsView, "keepalive", 0.01):
+            self.assertEqual(await self._next(content), ": keepalive\n\n")
+        await content.aclose()
+
+    async def test_reconnect_replays_missed_changes(self):
+        first = await self._create("First")
+        seq = await TaskChange.objects.filter(task_id=first.pk).alatest("seq")
+        await self._create("Missed")
+
+        response = await self._get(**{"Last-Event-ID": str(seq.seq)})
+        content = aiter(response.streaming_content)
+        _, _, data = parse_event(await self._next(content))
+        self.assertEqual(data["task"]["title"], "Missed")
+
+        await self._create("Live")
+        _, _, data = parse_event(await self._next(content))
+        self.assertEqual(data["task"]["title"], "Live")
+        await content.aclose()
+
+    async def test_long_poll(self):
+        await self._create("Before")
+        response = await self._get({"wait": 1})
+        self.assertEqual(response.json()["changes"], [])
+        last_seq = response.json()["last_seq"]
+
+        await self._create("After")
+        response = await self._get({"wait": 1, "since": last_seq})
+        data = response.json()
+        self.assertEqual(
+            [change["task"]["title"] for change in data["changes"]], ["After"]
+        )
+        self.assertGreater(data["last_seq"], last_seq)
+
+    async def test_invalid_requests(self):
+        response = await self._get({"status": "DONE"})
+        self.assertEqual(response.status_code, 400)
+        response = await self._get(**{"Last-Event-ID": "latest"})
+        self.assertEqual(response.status_code, 400)
+        response = await self._get(authorization="")
+        self.assertEqual(response.status_code, 401)
+
+        for i in range(3):
+            await self._create(f"Task {i}")
+        seqs = [seq async for seq in TaskChange.objects.values_list("seq", flat=True)]
+        await TaskChange.objects.filter(seq__lt=seqs[-1]).adelete()
+        response = await self._get({"since": seqs[0], "wait": 1})
+        self.assertEqual(response.status_code, 410)
+
+
+class TaskEventBrokerTest(TestCase):
+    def change(self, seq, status="OPEN", tags=()):
+        task = {"status": status, "tags": list(tags)}
+        return {"seq": seq, "task_id": seq, "action": "updated", "task": task}
+
+    async def test_filters_and_backpressure(self):
+        broker = TaskEventBroker(interval=60, queue_size=2)
+        everything = await broker.subscribe()
+        working = await broker.subscribe(statuses=["WORKING"])
+        tagged = await broker.subscribe(tags=["python"])
+
+        broker.publish([self.change(1), self.change(2, tags=["python"])])
+        broker.publish([self.change(3, status="WORKING")])
+        self.assertEqual(working.get_nowait()["seq"], 3)
+        self.assertEqual(tagged.get_nowait()["seq"], 2)
+
+        # The third change overflowed the first queue, it was dropped while
+        # the others still receive
+        self.assertNotIn(everything, broker.subscribers)
+        with self.assertRaises(SubscriptionDropped):
+            await everything.get(1)
+        broker.publish([{"seq": 4, "task_id": 4, "action": "deleted", "task": None}])
+        self.assertEqual((await working.get(1))["seq"], 4)
+        self.assertEqual((await tagged.get(1))["seq"], 4)
+        self.assertIsNone(await tagged.get(0.01))
+
+        broker.poller.cancel()
@@ -0,0 +1,94 @@
+import base64
+import csv
+import io
+import json
+from io import StringIO
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APITestCase
+from App.export import export_lines
+from App.models import Task, Tag
+from App.serializers import TaskSerializer
+
+
+class TaskExportTest(APITestCase):
+    def setUp(self):
+        python = Tag.objects.create(name="python")
+        django = Tag.objects.create(name="django")
+        self.tasks = [
+            Task.objects.create(title=f"Task {i}", description="Line, with comma")
+            for i in range(5)
+        ]
+        self.tasks[0].tags.add(python, django)
+        self.tasks[3].tags.add(python)
+
+        self.user = User.objects.create_user(username="test", password="test")
+        self.basic_auth = "Basic " + base64.b64encode(b"test:test").decode("utf-8")
+        self.client.credentials(HTTP_AUTHORIZATION=self.basic_auth)
+
+    def _export(self, params=None):
+        response = self.client.get(reverse("task-export"), params or {})
+        self.assertEqual(response.status_code, 200)
+        return b"".join(response.streaming_content).decode()
+
+    def test_ndjson_matches_the_serializer(self):
+        rows = [json.loads(line) for line in self._export().splitlines()]
+        self.assertEqual(
+            rows,
+            [
+                json.loads(json.dumps(TaskSerializer(task).data))
+                for task in Task.objects.order_by("pk")
+            ],
+        )
+
+    def test_csv(self):
+        content = self._export({"export_format": "csv"})
+        rows = list(csv.DictReader(io.StringIO(content)))
+        self.assertEqual(len(rows), 5)
+        self.assertEqual(rows[0]["description"], "Line, with comma")
+        self.assertEqual(sorted(rows[0]["tags"].split(",")), ["django", "python"])
+
+    def test_filters_and_invalid_format(self):
+        rows = self._export({"tags_any": "python"}).splitlines()
+        self.assertEqual(
+            [json.loads(row)["id"] for row in rows],
+            [self.tasks[0].id, self.tasks[3].id],
+        )
+
+        response = self.client.get(reverse("task-export"), {"export_format": "xml"})
+        self.assertEqual(response.status_code, 400)
+
+    def test_queries_grow_with_chunks_not_tasks(self):
+        with CaptureQueriesContext(connection) as one_chunk:
+            list(export_lines(Task.objects.all(), "ndjson", chunk_size=5))
+        with CaptureQueriesContext(connection) as five_chunks:
+            list(export_lines(Task.objects.all(), "ndjson", chunk_size=1))
+        self.assertEqual(len(one_chunk), 2)
+        self.assertEqual(len(five_chunks), 6)
+
+    def test_export_command(self):
+        out = StringIO()
+        call_command("export_tasks", stdout=out)
+        self.assertEqual(len(out.getvalue().splitlines()), 5)
+
+        out = StringIO()
+        call_command("export_tasks", export_format="csv", stdout=out)
+        self.assertEqual(
+            out.getvalue().splitlines()[0],
+            ",".join(
+                [
+                    "id",
+                    "title",
+                    "description",
+                    "timestamp",
+                    "due_date",
+                    "status",
+                    "version",
+                    "updated_at",
+                    "tags",
+                ]
+            ),
+        )
@@ -0,0 +1,79 @@
+import base64
+from datetime import timedelta
+from django.urls import reverse
+from django.utils.timezone import now
+from rest_framework.test import APITestCase
+from App.models import Task, Tag
+from django.contrib.auth.models import User
+
+
+class TaskFilterTest(APITestCase):
+    def setUp(self):
+        today = now().date()
+        self.python = Tag.objects.create(name="python")
+        self.django = Tag.objects.create(name="django")
+
+        self.task1 = Task.objects.create(
+            title="Task 1", description="Description", due_date=today
+        )
+        self.task2 = Task.objects.create(
+            title="Task 2",
+            description="Description",
+            due_date=today + timedelta(days=10),
+            status=Task.StatusChoices.WORKING,
+        )
+        self.task3 = Task.objects.create(title="Task 3", description="Description")
+        self.task1.tags.add(self.python, self.django)
+        self.task2.tags.add(self.python)
+
+        self.user = User.objects.create_user(username="test", password="test")
+        self.basic_auth = "Basic " + base64.b64encode(b"test:test").decode("utf-8")
+        self.client.credentials(HTTP_AUTHORIZATION=self.basic_auth)
+
+    def _filter(self, params):
+        response = self.client.get(reverse("task-list"), params)
+        self.assertEqual(response.status_code, 200)
+        return [task["id"] for task in response.json()["results"]]
+
+    def test_filter_by_status(self):
+        self.assertEqual(self._filter({"status": "WORKING"}), [self.task2.id])
+        self.assertEqual(
+            self._filter({"status": "OPEN,WORKING"}),
+            [self.task1.id, self.task2.id, self.task3.id],
+        )
+        self.assertEqual(
+            self._filter({"status": ["COMPLETED", "WORKING"]}), [self.task2.id]
+        )
+
+    def test_filter_by_due_date_range(self):
+        today = now().date()
+        self.assertEqual(
+            self._filter({"due_after": today + timedelta(days=1)}), [self.task2.id]
+        )
+        self.assertEqual(self._filter({"due_before": today}), [self.task1.id])
+        self.assertEqual(
+            self._filter({"status": "OPEN", "due_after": today, "due_before": today}),
+            [self.task1.id],
+        )
+
+    def test_filter_by_creation_time(self):
+        self.assertEqual(
+            self._filter({"created_since": (now() + timedelta(minutes=1)).isoformat()}),
+            [],
+        )
+        self.assertEqual(len(self._filter({"created_since": now().date()})), 3)
+
+    def test_filter_by_tags(self):
+        self.assertEqual(
+            self._filter({"tags_any": "python,django"}), [self.task1.id, self.task2.id]
+        )
+        self.assertEqual(self._filter({"tags_all": "python,django"}), [self.task1.id])
+        self.assertEqual(self._filter({"tags_all": "python,missing"}), [])
+
+    def test_invalid_filters(self):
+        response = self.client.get(
+            reverse("task-list"), {"status": "DONE", "due_after": "soon"}
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("status", response.json())
+        self.assertIn("due_after", response.json())
@@ -0,0 +1,78 @@
+import json
+import os
+import tempfile
+from datetime import timedelta
+from io import StringIO
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils.timezone import now
+from App.importing import import_tasks, read_rows
+from App.models import Task, Tag
+
+
+class ImportTasksTest(TestCase):
+    def _import(self, rows, **kwargs):
+        lines = StringIO("".join(json.dumps(row) + "\n" for row in rows))
+        return list(import_tasks(read_rows(lines, "ndjson"), **kwargs))
+
+    def test_import_applies_the_api_rules(self):
+        yesterday = now().date() - timedelta(days=1)
+        results = self._import(
+            [
+                {"title": "Open", "description": "D", "tags": ["a", "b"]},
+                {"title": "Late", "description": "D", "due_date": str(yesterday)},
+                {"title": "", "description": "D"},
+                {"title": "Bad", "description": "D", "status": "DONE"},
+                {"title": "Early", "description": "D", "status": "OVERDUE"},
+                ["not", "an", "object"],
+            ]
+        )
+
+        self.assertEqual(results[0][0], 2)
+        self.assertEqual([number for number, _ in results[0][1]], [3, 4, 5, 6])
+        self.assertEqual(
+            dict(Task.objects.values_list("title", "status")),
+            {"Open": "OPEN", "Late": "OVERDUE"},
+        )
+        task = Task.objects.get(title="Open")
+        self.assertEqual(sorted(task.tags.values_list("name", flat=True)), ["a", "b"])
+        self.assertEqual(Tag.objects.get(name="a").usage_count, 1)
+
+    def test_queries_grow_with_batches_not_rows(self):
+        def rows(count, prefix):
+            return [
+                {"title": f"Task {i}", "description": "D", "tags": [f"{prefix}{i % 3}"]}
+                for i in range(count)
+            ]
+
+        with CaptureQueriesContext(connection) as few:
+            self._import(rows(5, "few"), batch_size=100)
+        with CaptureQueriesContext(connection) as many:
+            self._import(rows(100, "many"), batch_size=100)
+        self.assertEqual(len(many), len(few))
+        self.assertEqual(Tag.objects.get(name="many0").usage_count, 34)
+
+    def test_export_import_round_trip(self):
+        task = Task.objects.create(title="Task", description="Line, with comma")
+        task.tags.add(Tag.objects.create(name="python"))
+
+        for export_format in ("ndjson", "csv"):
+            with tempfile.TemporaryDirectory() as directory:
+                path = os.path.join(directory, f"tasks.{export_format}")
+                call_command(
+                    "export_tasks",
+                    export_format=export_format,
+                    output=path,
+                    stderr=StringIO(),
+                )
+                out = StringIO()
+                call_command("import_tasks", path, stdout=out)
+            self.assertIn(
+                f"Imported {Task.objects.count() // 2} task(s)", out.getvalue()
+            )
+
+        # One task, copied by the NDJSON import, then both copied from CSV
+        self.assertEqual(Task.objects.filter(description="Line, with comma").count(), 4)
+        self.assertEqual(Tag.objects.get(name="python").usage_count, 4)
@@ -0,0 +1,116 @@
+import asyncio
+from io import StringIO
+from unittest import mock
+from django.contrib.auth.models import User
+from django.core.management import CommandError
+from django.test import LiveServerTestCase, SimpleTestCase
+from App.loadtest import LoadTest, Results, parse_mix, percentile
+from App.management.commands.loadtest import Command
+from App.models import Task
+
+
+class LoadTestHelpersTest(SimpleTestCase):
+    def test_parse_mix(self):
+        self.assertEqual(
+            parse_mix("list=3, search=1,delete=0.5"),
+            {"list": 3, "search": 1, "delete": 0.5},
+        )
+        for value in ["list=3,nap=1", "list=many", "list=-1", "list=0", ""]:
+            with self.subTest(value=value), self.assertRaises(ValueError):
+                parse_mix(value)
+
+    def test_percentile(self):
+        values = list(range(1, 101))
+        self.assertEqual(percentile(values, 0.5), 51)
+        self.assertEqual(percentile(values, 0.99), 100)
+        self.assertEqual(percentile([], 0.5), 0)
+
+    def test_summary(self):
+        results = Results()
+        for latency in [0.01, 0.02, 0.03]:
+            results.record("list", latency)
+        results.record("create", 0.1, "HTTP 500")
+        results.elapsed = 2
+
+        summary = results.summary()
+        self.assertEqual(summary["requests"], 4)
+        self.assertEqual(summary["throughput"], 2)
+        self.assertEqual(summary["error_rate"], 0.25)
+        self.assertEqual(set(summary["operations"]), {"list", "create"})
+        self.assertEqual(summary["operations"]["list"]["p50_ms"], 20)
+        self.assertEqual(
+            summary["operations"]["create"]["error_kinds"], {"HTTP 500": 1}
+        )
+
+
+class LoadTestServerTest(SimpleTestCase):
+    def installed(self, *names):
+        return mock.patch(
+            "importlib.util.find_spec", lambda name: object() if name in names else None
+        )
+
+    def test_auto_prefers_a_production_server(self):
+        command = Command(stderr=StringIO())
+        with self.installed("daphne", "gunicorn"):
+            self.assertEqual(command.pick_server("auto"), "daphne")
+        with self.installed():
+            self.assertEqual(command.pick_server("auto"), "runserver")
+        self.assertIn("falling back to runserver", command.stderr.getvalue())
+
+    def test_requested_server_must_be_installed(self):
+        with self.installed(), self.assertRaisesMessage(
+            CommandError, "uvicorn is not installed."
+        ):
+            Command().pick_server("uvicorn")
+        self.assertEqual(Command().pick_server("runserver"), "runserver")
+
+    def test_server_command(self):
+        command = Command().server_command("uvicorn", 8123, 4)
+        self.assertEqual(command[1:4], ["-m", "uvicorn", "TodoList.asgi:application"])
+        self.assertIn("8123", command)
+        self.assertEqual(command[command.index("--workers") + 1], "4")
+
+        command = Command().server_command("gunicorn", 8123, 2)
+        self.assertIn("TodoList.wsgi:application", command)
+        self.assertIn("127.0.0.1:8123", command)
+
+    def test_report_names_the_server_and_database(self):
+        with self.settings(DATABASE_PROFILE="production", DATABASE_REPLICAS=[]):
+            description = Command().describe_server("uvicorn", 2)
+        self.assertEqual(
+            description,
+            {
+                "server": "uvicorn (2 worker(s))",
+                "application": "ASGI",
+                "database_profile": "production",
+                "database_replicas": 0,
+            },
+        )
+
+
+class LoadTestRunTest(LiveServerTestCase):
+    def setUp(self):
+        User.objects.create_user(username="load", password="test")
+        self.task = Task.objects.create(title="Existing", description="Kept")
+
+    def test_run_against_a_live_server(self):
+        loadtest = LoadTest(
+            f"{self.live_server_url}/api",
+            [("load", "test")],
+            # The live server shares one in-memory database connection
+            # between its threads, concurrent transactions would collide
+            clients=1,
+            duration=1,
+            mix={"list": 1, "search": 1, "create": 2, "update": 1, "delete": 1},
+            seed=1,
+        )
+        summary = loadtest.run().summary()
+
+        self.assertGreater(summary["requests"], 0)
+        self.assertEqual(summary["errors"], 0, summary["operations"])
+        self.assertIn("create", summary["operations"])
+
+        remaining = Task.objects.exclude(pk=self.task.pk).count()
+        self.assertEqual(remaining, len(loadtest.created))
+        asyncio.run(loadtest.cleanup())
+        self.assertEqual(list(Task.objects.all()), [self.task])
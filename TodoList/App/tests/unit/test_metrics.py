@@ -0,0 +1,86 @@
+import base64
+import re
+from django.contrib.auth.models import User
+from django.test import modify_settings
+from django.urls import reverse
+from rest_framework.test import APITestCase
+from App import caching
+from App.metrics import DB_QUERIES, Histogram, reset_metrics
+from App.models import Task, Tag
+
+
+class HistogramTest(APITestCase):
+    def test_collect(self):
+        histogram = Histogram("test_seconds", "Test.", (0.1, 1))
+        histogram.observe("task-list", 0.05)
+        histogram.observe("task-list", 0.5)
+        histogram.observe("task-list", 5)
+        self.assertEqual(
+            list(histogram.collect()),
+            [
+                "# HELP todolist_test_seconds Test.",
+                "# TYPE todolist_test_seconds histogram",
+                'todolist_test_seconds_bucket{route="task-list",le="0.1"} 1',
+                'todolist_test_seconds_bucket{route="task-list",le="1"} 2',
+                'todolist_test_seconds_bucket{route="task-list",le="+Inf"} 3',
+                'todolist_test_seconds_sum{route="task-list"} 5.55',
+                'todolist_test_seconds_count{route="task-list"} 3',
+            ],
+        )
+
+
+@modify_settings(MIDDLEWARE={"prepend": "App.metrics.PerformanceMiddleware"})
+class PerformanceMiddlewareTest(APITestCase):
+    def setUp(self):
+        reset_metrics()
+        caching.get_cache().clear()
+        tag = Tag.objects.create(name="python")
+        for i in range(3):
+            Task.objects.create(title=f"Task {i}", description="Description")
+        Task.objects.first().tags.add(tag)
+
+        self.user = User.objects.create_user(username="test", password="test")
+        self.basic_auth = "Basic " + base64.b64encode(b"test:test").decode("utf-8")
+        self.client.credentials(HTTP_AUTHORIZATION=self.basic_auth)
+
+    def _queries(self, response):
+        match = re.search(
+            r'db;dur=[\d.]+;desc="(\d+) queries"', response["Server-Timing"]
+        )
+        return int(match.group(1))
+
+    def test_server_timing(self):
+        response = self.client.get(reverse("task-list"))
+        self.assertEqual(response.status_code, 200)
+        timing = response["Server-Timing"]
+        self.assertRegex(timing, r"^total;dur=[\d.]+, db;dur=[\d.]+;desc=")
+        self.assertIn("serialize;dur=", timing)
+        self.assertGreater(self._queries(response), 0)
+
+        # Served from the cache: no serialization, fewer queries
+        cached = self.client.get(reverse("task-list"))
+        self.assertLess(self._queries(cached), self._queries(response))
+
+    def test_metrics_endpoint(self):
+        self.client.get(reverse("task-list"))
+        self.client.get(reverse("task-detail", args=[Task.objects.first().pk]))
+
+        response = self.client.get(reverse("metrics"))
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response["Content-Type"].startswith("text/plain"))
+        content = response.content.decode()
+        for route in ("task-list", "task-detail"):
+            self.assertIn(
+                f'todolist_request_duration_seconds_count{{route="{route}"}} 1', content
+            )
+            self.assertIn(f'todolist_db_queries_count{{route="{route}"}} 1', content)
+        self.assertIn('todolist_response_size_bytes_sum{route="task-list"}', content)
+
+        self.client.credentials()
+        self.assertEqual(self.client.get(reverse("metrics")).status_code, 401)
+
+    def test_async_views_are_measured(self):
+        response = self.client.get(reverse("async-task-list"))
+        self.assertEqual(response.status_code, 200)
+        self.assertGreater(self._queries(response), 0)
+        self.assertIn("async-task-list", "".join(DB_QUERIES.collect()))
@@ -0,0 +1,98 @@
+import base64
+import json
+from datetime import timedelta
+from django.urls import reverse
+from django.utils.timezone import now
+from rest_framework import status
+from rest_framework.test import APITestCase
+from App.models import Task
+from django.contrib.auth.models import User
+
+
+class TaskKeysetPaginationTest(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="test", password="test")
+        self.basic_auth = "Basic " + base64.b64encode(b"test:test").decode("utf-8")
+        self.client.credentials(HTTP_AUTHORIZATION=self.basic_auth)
+
+        today = now().date()
+        self.tasks = [
+            Task.objects.create(
+                title=f"Task {i}",
+                description="Description",
+                # a few shared and missing due dates to exercise the tie breaker
+                due_date=today + timedelta(days=i % 3) if i % 4 else None,
+            )
+            for i in range(11)
+        ]
+        self.url = reverse("task-list")
+
+    def _walk(self, **params):
+        ids = []
+        url = self.url
+        params = {"pagination": "cursor", "page_size": 3, **params}
+        while url:
+            response = self.client.get(url, params)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertNotIn("count", response.json())
+            ids.extend(task["id"] for task in response.json()["results"])
+            url, params = response.json()["next"], None
+        return ids
+
+    def test_walk_by_id(self):
+        self.assertEqual(self._walk(), [task.id for task in self.tasks])
+        self.assertEqual(
+            self._walk(ordering="-id"), [task.id for task in reversed(self.tasks)]
+        )
+
+    def test_walk_by_due_date(self):
+        with_date = sorted(
+            (task for task in self.tasks if task.due_date),
+            key=lambda task: (task.due_date, task.id),
+        )
+        without_date = [task for task in self.tasks if not task.due_date]
+
+        self.assertEqual(
+            self._walk(ordering="due_date"),
+            [task.id for task in with_date + without_date],
+        )
+        self.assertEqual(
+            self._walk(ordering="-due_date"),
+            [task.id for task in list(reversed(with_date)) + without_date[::-1]],
+        )
+
+    def test_walk_by_timestamp(self):
+        self.assertEqual(
+            self._walk(ordering="-timestamp"),
+            [task.id for task in reversed(self.tasks)],
+        )
+
+    def test_deep_page_does_not_count(self):
+        response = self.client.get(self.url, {"pagination": "cursor", "page_size": 5})
+        next_url = response.json()["next"]
+
+        # authentication, the list validators, the page and its prefetched tags
+        with self.assertNumQueries(4):
+            response = self.client.get(next_url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_invalid_cursor_and_ordering(self):
+        response = self.client.get(
+            self.url, {"pagination": "cursor", "cursor": "not-a-cursor"}
+        )
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+        response = self.client.get(
+            self.url, {"pagination": "cursor", "ordering": "title"}
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_forged_cursor(self):
+        for value in ([1, 2], {"year": 2024}, 1.5, "not-a-date"):
+            cursor = base64.urlsafe_b64encode(json.dumps([value, 1]).encode())
+            response = self.client.get(
+                self.url,
+                {"pagination": "cursor", "ordering": "due_date", "cursor": cursor},
+            )
+            self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+            self.assertEqual(response.json()["detail"], "Invalid cursor")
@@ -0,0 +1,133 @@
+import os
+import sqlite3
+import tempfile
+from django.db import connections
+from django.http import HttpResponse
+from django.test import (
+    RequestFactory,
+    TestCase,
+    TransactionTestCase,
+    override_settings,
+)
+from App.models import Task
+from App.replication import sync_replica
+from App.routers import (
+    PIN_COOKIE,
+    PrimaryReplicaRouter,
+    ReplicaPinningMiddleware,
+    pinning_scope,
+)
+
+
+@override_settings(DATABASE_REPLICAS=["replica1"])
+class PrimaryReplicaRouterTest(TestCase):
+    def setUp(self):
+        self.router = PrimaryReplicaRouter()
+
+    def test_reads_stick_to_the_primary_after_a_write(self):
+        with pinning_scope():
+            self.assertEqual(self.router.db_for_read(Task), "replica1")
+            self.assertEqual(self.router.db_for_write(Task), "default")
+            self.assertEqual(self.router.db_for_read(Task), "default")
+        with pinning_scope():
+            self.assertEqual(self.router.db_for_read(Task), "replica1")
+
+    @override_settings(DATABASE_REPLICAS=["replica1", "replica2"])
+    def test_reads_of_a_request_use_one_replica(self):
+        for _ in range(5):
+            with pinning_scope():
+                replica = self.router.db_for_read(Task)
+                for _ in range(5):
+                    self.assertEqual(self.router.db_for_read(Task), replica)
+
+    def test_outside_requests_everything_uses_the_primary(self):
+        self.assertEqual(self.router.db_for_read(Task), "default")
+
+    def test_instances_of_other_databases_keep_their_database(self):
+        task = Task(title="Scratch", description="Scratch")
+        task._state.db = "scratch"
+        with pinning_scope():
+            self.assertEqual(self.router.db_for_read(Task, instance=task), "scratch")
+            self.assertEqual(self.router.db_for_write(Task, instance=task), "scratch")
+            self.assertEqual(self.router.db_for_read(Task), "replica1")
+
+        task._state.db = "replica1"
+        with pinning_scope():
+            self.assertEqual(self.router.db_for_read(Task, instance=task), "replica1")
+
+    def test_replicas_are_not_migrated(self):
+        self.assertFalse(self.router.allow_migrate("replica1", "App"))
+        self.assertIsNone(self.router.allow_migrate("default", "App"))
+
+    @override_settings(DATABASE_REPLICAS=[])
+    def test_without_replicas(self):
+        with pinning_scope():
+            self.assertEqual(self.router.db_for_read(Task), "default")
+
+
+@override_settings(DATABASE_REPLICAS=["replica1"])
+class ReplicaPinningMiddlewareTest(TestCase):
+    def setUp(self):
+        self.factory = RequestFactory()
+        self.router = PrimaryReplicaRouter()
+
+    def get_response(self, request):
+        response = HttpResponse()
+        response.database = self.router.db_for_read(Task)
+        if request.GET.get("write"):
+            self.router.db_for_write(Task)
+        return response
+
+    def test_pinning(self):
+        middleware = ReplicaPinningMiddleware(self.get_response)
+
+        response = middleware(self.factory.get("/"))
+        self.assertEqual(response.database, "replica1")
+        self.assertNotIn(PIN_COOKIE, response.cookies)
+
+        response = middleware(self.factory.post("/"))
+        self.assertEqual(response.database, "default")
+        self.assertIn(PIN_COOKIE, response.cookies)
+
+        response = middleware(self.factory.get("/", {"write": 1}))
+        self.assertIn(PIN_COOKIE, response.cookies)
+
+        request = self.factory.get("/")
+        request.COOKIES[PIN_COOKIE] = "1"
+        response = middleware(request)
+        self.assertEqual(response.database, "default")
+        self.assertNotIn(PIN_COOKIE, response.cookies)
+
+    async def test_async_pinning(self):
+        async def get_response(request):
+            return self.get_response(request)
+
+        middleware = ReplicaPinningMiddleware(get_response)
+        response = await middleware(self.factory.get("/"))
+        self.assertEqual(response.database, "replica1")
+        response = await middleware(self.factory.post("/"))
+        self.assertEqual(response.database, "default")
+        self.assertIn(PIN_COOKIE, response.cookies)
+
+
+class SyncReplicaTest(TransactionTestCase):
+    # The backup waits for the primary's open transactions to finish
+
+    def test_sync_replica_copies_the_primary(self):
+        Task.objects.create(title="Task", description="Description")
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "replica.sqlite3")
+            settings = {**connections.settings["default"], "NAME": path}
+            connections.settings["replica_test"] = settings
+            try:
+                sync_replica("replica_test")
+            finally:
+                del connections.settings["replica_test"]
+
+            replica = sqlite3.connect(path)
+            try:
+                rows = replica.execute('SELECT title FROM "App_task"').fetchall()
+            finally:
+                replica.close()
+        self.assertEqual(rows, [("Task",)])
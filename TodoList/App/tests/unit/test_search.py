@@ -0,0 +1,98 @@
+import base64
+from django.urls import reverse
+from rest_framework.test import APITestCase
+from App.models import Task, Tag
+from App.search import build_match_expression, search_tasks
+from django.contrib.auth.models import User
+
+
+class TaskSearchTest(APITestCase):
+    def setUp(self):
+        self.python = Tag.objects.create(name="python")
+        self.django = Tag.objects.create(name="django")
+
+        self.task1 = Task.objects.create(
+            title="Write release notes", description="Mention the python upgrade"
+        )
+        self.task2 = Task.objects.create(
+            title="Upgrade python", description="Move to the latest release"
+        )
+        self.task3 = Task.objects.create(title="Groceries", description="Milk")
+        self.task2.tags.add(self.python, self.django)
+
+        self.user = User.objects.create_user(username="test", password="test")
+        self.basic_auth = "Basic " + base64.b64encode(b"test:test").decode("utf-8")
+
+    def _search(self, text):
+        return list(search_tasks(Task.objects.all(), text))
+
+    def test_build_match_expression(self):
+        self.assertEqual(build_match_expression('py "OR" dj*'), '"py"* "OR"* "dj"*')
+        self.assertIsNone(build_match_expression("  ?! "))
+
+    def test_search_ranks_title_before_description(self):
+        self.assertEqual(self._search("python"), [self.task2, self.task1])
+
+    def test_search_matches_prefixes_and_all_words(self):
+        self.assertCountEqual(self._search("relea upgr"), [self.task1, self.task2])
+        self.assertEqual(self._search("groceries python"), [])
+
+    def test_search_tags_without_duplicates(self):
+        self.assertEqual(self._search("django"), [self.task2])
+        self.assertEqual(self._search("py dj"), [self.task2])
+
+    def test_index_follows_writes(self):
+        self.django.name = "flask"
+        self.django.save()
+        self.assertEqual(self._search("flask"), [self.task2])
+
+        self.task2.tags.remove(self.django)
+        self.assertEqual(self._search("flask"), [])
+
+        self.task3.title = "Buy bread"
+        self.task3.save()
+        self.assertEqual(self._search("bread"), [self.task3])
+
+        Task.objects.filter(pk=self.task3.pk).delete()
+        self.assertEqual(self._search("bread"), [])
+
+    def test_search_endpoint(self):
+        self.client.credentials(HTTP_AUTHORIZATION=self.basic_auth)
+
+        response = self.client.get(reverse("task-list"), {"search": "python"})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["count"], 2)
+        self.assertEqual(
+            [task["id"] for task in response.json()["results"]],
+            [self.task2.id, self.task1.id],
+        )
+
+    def test_search_combines_with_filters_and_pagination(self):
+        self.client.credentials(HTTP_AUTHORIZATION=self.basic_auth)
+
+        params = {"search": "python", "tags_all": "python,django"}
+        response = self.client.get(reverse("task-list"), params)
+        self.assertEqual(response.json()["count"], 1)
+        self.assertEqual(response.json()["results"][0]["id"], self.task2.id)
+
+        params = {"search": "python", "pagination": "cursor", "page_size": 1}
+        response = self.client.get(reverse("task-list"), params)
+        self.assertEqual(response.json()["results"][0]["id"], self.task1.id)
+        self.assertIsNotNone(response.json()["next"])
+
+    def test_bulk_writes_are_indexed(self):
+        self.client.credentials(HTTP_AUTHORIZATION=self.basic_auth)
+        url = reverse("task-bulk")
+
+        data = [{"title": "Bulk bread", "description": "Bulk", "tags": ["bakery"]}]
+        task_id = self.client.post(url, data, format="json").json()[0]["id"]
+        self.assertEqual([task.pk for task in self._search("bakery bread")], [task_id])
+
+        data = [{"id": task_id, "tags": ["market"]}]
+        self.client.patch(url, data, format="json")
+        self.assertEqual(self._search("bakery"), [])
+        self.assertEqual([task.pk for task in self._search("market")], [task_id])
+
+        self.client.delete(url, {"ids": [task_id]}, format="json")
+        self.assertEqual(self._search("market"), [])
@@ -1,9 +1,11 @@
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from django.utils.timezone import now
 from datetime import timedelta
 from rest_framework.exceptions import ValidationError
 from App.models import Task, Tag
-from App.serializers import TaskSerializer
+from App.serializers import TaskReadSerializer, TaskSerializer
 
 
 class TaskSerializerTestCase(TestCase):
@@ -36,6 +38,25 @@ class TaskSerializerTestCase(TestCase):
         self.assertTrue(Tag.objects.filter(name="python").exists())
         self.assertTrue(Tag.objects.filter(name="react").exists())
 
+    def test_create_task_tag_queries_do_not_scale_with_tags(self):
+        """Test that tag resolution is batched when creating a task."""
+
+        def create_query_count(tags):
+            data = {"title": "New Task", "description": "Sample", "tags": tags}
+            serializer = TaskSerializer(data=data)
+            self.assertTrue(serializer.is_valid())
+
+            with CaptureQueriesContext(connection) as ctx:
+                task = serializer.save()
+
+            self.assertEqual(task.tags.count(), len(tags))
+            return len(ctx.captured_queries)
+
+        self.assertEqual(
+            create_query_count(["single"]),
+            create_query_count([f"tag-{i}" for i in range(20)]),
+        )
+
     def test_update_status_after_due_date(self):
         """Test that a task is marked as overdue if the due_date is in the past."""
 
@@ -89,3 +110,43 @@ class TaskSerializerTestCase(TestCase):
         self.assertTrue(serializer.is_valid())
         task = serializer.save()
         self.assertEqual(task.status, Task.StatusChoices.OPEN)
+
+
+class TaskReadSerializerTestCase(TestCase):
+    def setUp(self):
+        tags = [Tag.objects.create(name=name) for name in ["python", "react", "api"]]
+        self.tasks = [
+            Task.objects.create(
+                title=f"Task {i}",
+                description="Description",
+                due_date=now().date() + timedelta(days=i) if i % 2 else None,
+            )
+            for i in range(5)
+        ]
+        self.tasks[0].tags.add(tags[2], tags[0])
+        self.tasks[3].tags.add(*tags)
+
+    def test_matches_task_serializer(self):
+        queryset = Task.objects.prefetch_related("tags")
+        rows = list(TaskReadSerializer.rows(queryset))
+
+        self.assertEqual(
+            TaskReadSerializer(rows, many=True).data,
+            TaskSerializer(queryset, many=True).data,
+        )
+        self.assertEqual(
+            TaskReadSerializer(rows[3]).data, TaskSerializer(self.tasks[3]).data
+        )
+
+    def test_tags_of_a_page_are_loaded_with_one_query(self):
+        rows = list(TaskReadSerializer.rows(Task.objects.all()))
+        with CaptureQueriesContext(connection) as context:
+            data = TaskReadSerializer(rows, many=True).data
+        self.assertEqual(len(context), 1)
+        self.assertEqual(data[0]["tags"], ["python", "api"])
+        self.assertEqual(data[1]["tags"], [])
+
+    def test_empty_page_runs_no_query(self):
+        with CaptureQueriesContext(connection) as context:
+            self.assertEqual(TaskReadSerializer([], many=True).data, [])
+        self.assertEqual(len(context), 0)
@@ -0,0 +1,193 @@
+from datetime import timedelta
+from io import StringIO
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils.timezone import now
+from App.models import Task, Tag
+from App.services import (
+    collect_orphan_tags,
+    deleting_tasks,
+    mark_overdue_tasks,
+    remove_orphan_tags,
+    resolve_tags,
+    set_tags_in_bulk,
+)
+
+
+class ResolveTagsTestCase(TestCase):
+    def setUp(self):
+        self.tag1 = Tag.objects.create(name="python")
+
+    def test_resolve_existing_and_missing_tags(self):
+        tags = resolve_tags(["react", "python", "react", "django"])
+
+        self.assertEqual([tag.name for tag in tags], ["react", "python", "django"])
+        self.assertEqual(tags[1], self.tag1)
+        self.assertTrue(all(tag.pk for tag in tags))
+        self.assertEqual(Tag.objects.count(), 3)
+
+    def test_resolve_many_tags_uses_constant_queries(self):
+        names = [f"tag-{i}" for i in range(20)]
+
+        # lookup, bulk insert and read back of the created rows
+        with self.assertNumQueries(3):
+            tags = resolve_tags(names + ["python"])
+
+        self.assertEqual(len(tags), 21)
+
+        with self.assertNumQueries(1):
+            resolve_tags(names)
+
+    def test_resolve_no_tags(self):
+        with self.assertNumQueries(0):
+            self.assertEqual(resolve_tags([]), [])
+
+
+class OrphanTagsTestCase(TestCase):
+    def setUp(self):
+        self.tag1 = Tag.objects.create(name="python")
+        self.tag2 = Tag.objects.create(name="react")
+        self.tag3 = Tag.objects.create(name="django")
+        self.task = Task.objects.create(title="Task", description="Description")
+        self.task.tags.add(self.tag1)
+
+    def test_remove_orphan_tags_limited_to_candidates(self):
+        self.assertEqual(remove_orphan_tags([self.tag1.pk, self.tag2.pk]), 1)
+        self.assertEqual(
+            set(Tag.objects.values_list("name", flat=True)), {"python", "django"}
+        )
+
+    def test_remove_all_orphan_tags(self):
+        self.assertEqual(remove_orphan_tags(), 2)
+        self.assertEqual(list(Tag.objects.all()), [self.tag1])
+
+    @override_settings(TAG_ORPHAN_COLLECTION="deferred")
+    def test_deferred_collection_leaves_orphans_for_the_sweep(self):
+        self.assertEqual(collect_orphan_tags([self.tag2.pk]), 0)
+        self.assertEqual(Tag.objects.count(), 3)
+
+        call_command("collect_orphan_tags", stdout=StringIO())
+        self.assertEqual(list(Tag.objects.all()), [self.tag1])
+
+
+class MarkOverdueTasksTestCase(TestCase):
+    def setUp(self):
+        today = now().date()
+        self.tasks = [
+            Task.objects.create(
+                title=f"Task {i}", description="Description", due_date=today
+            )
+            for i in range(5)
+        ]
+        self.completed = Task.objects.create(
+            title="Done",
+            description="Description",
+            due_date=today,
+            status=Task.StatusChoices.COMPLETED,
+        )
+        self.future = Task.objects.create(
+            title="Later", description="Description", due_date=today
+        )
+        # Let the due dates pass without going through Task.clean
+        Task.objects.exclude(pk=self.future.pk).update(
+            due_date=today - timedelta(days=1)
+        )
+
+    def test_mark_overdue_tasks_in_chunks(self):
+        chunks = list(mark_overdue_tasks(chunk_size=2))
+
+        self.assertEqual([updated for _, updated in chunks], [2, 2, 1])
+        self.assertEqual(
+            Task.objects.filter(status=Task.StatusChoices.OVERDUE).count(), 5
+        )
+        self.completed.refresh_from_db()
+        self.future.refresh_from_db()
+        self.assertEqual(self.completed.status, Task.StatusChoices.COMPLETED)
+        self.assertEqual(self.future.status, Task.StatusChoices.OPEN)
+
+        self.assertEqual(list(mark_overdue_tasks()), [])
+
+    def test_mark_overdue_tasks_command(self):
+        out = StringIO()
+        call_command("mark_overdue_tasks", chunk_size=3, stdout=out)
+
+        self.assertIn("Marked 5 task(s) overdue in 2 chunk(s)", out.getvalue())
+
+
+class TagUsageCountTestCase(TestCase):
+    def setUp(self):
+        self.tag1 = Tag.objects.create(name="python")
+        self.tag2 = Tag.objects.create(name="react")
+        self.task1 = Task.objects.create(title="Task 1", description="Description")
+        self.task2 = Task.objects.create(title="Task 2", description="Description")
+
+    def assertUsage(self, expected):
+        self.assertEqual(dict(Tag.objects.values_list("name", "usage_count")), expected)
+
+    def test_task_tag_changes_are_counted(self):
+        self.task1.tags.add(self.tag1, self.tag2)
+        self.task2.tags.add(self.tag1)
+        self.task2.tags.add(self.tag1)
+        self.assertUsage({"python": 2, "react": 1})
+
+        self.task1.tags.remove(self.tag2, self.tag2)
+        self.task2.tags.remove(self.tag2)
+        self.assertUsage({"python": 2, "react": 0})
+
+        self.task1.tags.set([self.tag2])
+        self.assertUsage({"python": 1, "react": 1})
+
+        self.task1.tags.clear()
+        self.assertUsage({"python": 1, "react": 0})
+
+    def test_tag_task_changes_are_counted(self):
+        self.tag1.task_set.add(self.task1, self.task2)
+        self.assertUsage({"python": 2, "react": 0})
+
+        self.tag1.task_set.remove(self.task1)
+        self.assertUsage({"python": 1, "react": 0})
+
+        self.tag1.task_set.clear()
+        self.assertUsage({"python": 0, "react": 0})
+
+    def test_task_deletion_is_counted(self):
+        self.task1.tags.add(self.tag1, self.tag2)
+        self.task2.tags.add(self.tag1)
+
+        self.task1.delete()
+        self.assertUsage({"python": 1, "react": 0})
+
+        with deleting_tasks(Task.objects.all()):
+            Task.objects.all().delete()
+        # python lost its last task and was collected
+        self.assertUsage({"react": 0})
+
+    def test_saving_a_stale_tag_keeps_its_count(self):
+        self.task1.tags.add(self.tag1)
+        self.tag1.name = "django"
+        self.tag1.save()
+        self.assertUsage({"django": 1, "react": 0})
+
+    def test_bulk_tag_changes_are_counted(self):
+        set_tags_in_bulk({self.task1.pk: ["python", "go"], self.task2.pk: ["go"]})
+        self.assertUsage({"python": 1, "react": 0, "go": 2})
+
+        set_tags_in_bulk({self.task1.pk: ["react"]})
+        self.assertUsage({"python": 0, "react": 1, "go": 1})
+
+    def test_reconcile_tag_usage(self):
+        self.task1.tags.add(self.tag1)
+        Tag.objects.update(usage_count=5)
+
+        out = StringIO()
+        call_command("reconcile_tag_usage", stdout=out)
+
+        self.assertIn("Repaired 2 tag count(s)", out.getvalue())
+        self.assertUsage({"python": 1, "react": 0})
+
+    def test_orphan_detection_ignores_drifted_counts(self):
+        self.task1.tags.add(self.tag1)
+        Tag.objects.update(usage_count=0)
+
+        self.assertEqual(remove_orphan_tags(), 1)
+        self.assertEqual(list(Tag.objects.all()), [self.tag1])
@@ -0,0 +1,173 @@
+import base64
+from collections import Counter
+from datetime import timedelta
+from io import StringIO
+from django.contrib.admin.sites import site
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.db.models import Count
+from django.test import RequestFactory
+from django.urls import reverse
+from django.utils.timezone import now
+from rest_framework.test import APITestCase
+from App.importing import import_tasks
+from App.models import Task, TaskSummary
+from App.services import mark_overdue_tasks
+from App.stats import rebuild_task_stats, task_stats
+
+
+class TaskStatsTest(APITestCase):
+    def setUp(self):
+        self.today = now().date()
+        self.user = User.objects.create_superuser(username="test", password="test")
+        self.basic_auth = "Basic " + base64.b64encode(b"test:test").decode("utf-8")
+        self.client.credentials(HTTP_AUTHORIZATION=self.basic_auth)
+
+    def assertSummaryIsAccurate(self):
+        expected = Counter(
+            {
+                (status, due_date): count
+                for status, due_date, count in Task.objects.order_by()
+                .values_list("status", "due_date")
+                .annotate(count=Count("pk"))
+            }
+        )
+        summary = Counter(
+            {(row.status, row.due_date): row.count for row in TaskSummary.objects.all()}
+        )
+        self.assertEqual(+summary, expected)
+
+    def test_single_task_writes(self):
+        task = Task.objects.create(title="Task", description="Task")
+        Task.objects.create(
+            title="Due", description="Due", due_date=self.today + timedelta(days=3)
+        )
+        self.assertSummaryIsAccurate()
+
+        task.status = Task.StatusChoices.WORKING
+        task.due_date = self.today
+        task.save()
+        self.assertSummaryIsAccurate()
+
+        # Saves that do not touch the summary fields are not counted twice
+        task.title = "Renamed"
+        task.save(update_fields=["title"])
+        task.save()
+        self.assertSummaryIsAccurate()
+
+        task.delete()
+        self.assertSummaryIsAccurate()
+
+    def test_api_writes(self):
+        response = self.client.post(
+            reverse("task-list"),
+            {"title": "Task", "description": "Task", "tags": ["python"]},
+            format="json",
+        )
+        pk = response.data["id"]
+        self.client.patch(
+            reverse("task-detail", args=[pk]), {"status": "COMPLETED"}, format="json"
+        )
+        self.assertSummaryIsAccurate()
+
+        response = self.client.post(
+            reverse("task-bulk"),
+            [
+                {"title": f"Bulk {i}", "description": "Bulk", "due_date": self.today}
+                for i in range(3)
+            ],
+            format="json",
+        )
+        ids = [item["id"] for item in response.data]
+        self.client.patch(
+            reverse("task-bulk"),
+            [{"id": ids[0], "status": "WORKING"}, {"id": ids[1], "title": "Only"}],
+            format="json",
+        )
+        self.assertSummaryIsAccurate()
+
+        self.client.delete(reverse("task-bulk"), {"ids": ids[:2]}, format="json")
+        self.client.delete(reverse("task-detail", args=[pk]))
+        self.assertSummaryIsAccurate()
+
+    def test_import_overdue_and_admin_writes(self):
+        rows = [
+            (i, {"title": f"Task {i}", "description": "Task", "due_date": due_date})
+            for i, due_date in enumerate(
+                [None, str(self.today), str(self.today + timedelta(days=9))]
+            )
+        ]
+        list(import_tasks(rows))
+        self.assertSummaryIsAccurate()
+
+        Task.objects.filter(due_date=self.today).update(
+            due_date=self.today - timedelta(days=1)
+        )
+        rebuild_task_stats()
+        list(mark_overdue_tasks())
+        self.assertSummaryIsAccurate()
+
+        request = RequestFactory().post("/admin/App/task/")
+        request.user = self.user
+        ids = Task.objects.values_list("pk", flat=True)[:2]
+        site._registry[Task].delete_queryset(
+            request, Task.objects.filter(pk__in=list(ids))
+        )
+        self.assertSummaryIsAccurate()
+
+    def test_stats_endpoint(self):
+        for status, days in [("OPEN", 0), ("OPEN", 3), ("WORKING", 30)]:
+            Task.objects.create(
+                title="Task",
+                description="Task",
+                status=status,
+                due_date=self.today + timedelta(days=days),
+            )
+        tagged = Task.objects.create(title="Tagged", description="Task")
+        self.client.patch(
+            reverse("task-detail", args=[tagged.pk]),
+            {"tags": ["python", "django"]},
+            format="json",
+        )
+        self.client.get(reverse("task-list"))  # warm the credential cache
+
+        # The user, the summary and the tags
+        with self.assertNumQueries(3):
+            response = self.client.get(reverse("task-stats"), {"tag_limit": 1})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["total"], 4)
+        self.assertEqual(
+            response.data["by_status"],
+            {
+                "OPEN": 3,
+                "WORKING": 1,
+                "PENDING_REVIEW": 0,
+                "COMPLETED": 0,
+                "OVERDUE": 0,
+                "CANCELLED": 0,
+            },
+        )
+        self.assertEqual(
+            response.data["by_due_date"],
+            {"past": 0, "today": 1, "next_7_days": 1, "later": 1, "none": 1},
+        )
+        self.assertEqual(response.data["by_tag"], {"django": 1})
+
+        response = self.client.get(reverse("task-stats"), {"tag_limit": "all"})
+        self.assertEqual(response.status_code, 400)
+
+    def test_buckets_follow_the_day(self):
+        Task.objects.create(
+            title="Task", description="Task", due_date=self.today + timedelta(days=1)
+        )
+        later = task_stats(today=self.today + timedelta(days=2))
+        self.assertEqual(later["by_due_date"]["past"], 1)
+
+    def test_rebuild_command(self):
+        Task.objects.create(title="Task", description="Task")
+        TaskSummary.objects.update(count=42)
+
+        out = StringIO()
+        call_command("rebuild_task_stats", stdout=out)
+        self.assertIn("Rebuilt 1 summary row(s)", out.getvalue())
+        self.assertSummaryIsAccurate()
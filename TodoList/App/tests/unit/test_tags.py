@@ -0,0 +1,109 @@
+import base64
+from django.contrib.auth.models import User
+from django.db import DatabaseError, transaction
+from django.urls import reverse
+from rest_framework.test import APITestCase
+from App.autocomplete import TagPrefixIndex, tag_index
+from App.models import Task, Tag
+from App.services import remove_orphan_tags, resolve_tags
+
+
+class TagPrefixIndexTest(APITestCase):
+    def setUp(self):
+        for name, usage_count in [("Django", 1), ("docs", 5), ("devops", 3)]:
+            Tag.objects.create(name=name, usage_count=usage_count)
+        Tag.objects.create(name="python")
+        self.index = TagPrefixIndex(ttl=60)
+
+    def _names(self, prefix, **kwargs):
+        return [name for _, name, _ in self.index.complete(prefix, **kwargs)]
+
+    def test_complete_is_case_insensitive_and_alphabetical(self):
+        self.assertEqual(self._names("D"), ["devops", "Django", "docs"])
+        self.assertEqual(self._names("do"), ["docs"])
+        self.assertEqual(self._names("x"), [])
+
+    def test_complete_popular_and_limit(self):
+        self.assertEqual(self._names("d", popular=True), ["docs", "devops", "Django"])
+        self.assertEqual(self._names("d", limit=2), ["devops", "Django"])
+
+    def test_complete_runs_without_queries_once_loaded(self):
+        self.index.complete("d")
+        with self.assertNumQueries(0):
+            self.index.complete("dj")
+
+    def test_add_rename_and_remove(self):
+        self.index.complete("")
+        tag = Tag.objects.get(name="python")
+        self.index.add(tag.pk, "pandas")
+        self.assertEqual(self._names("p"), ["pandas"])
+        self.index.remove(tag.pk)
+        self.assertEqual(self._names("p"), [])
+
+
+class TagViewSetTest(APITestCase):
+    def setUp(self):
+        tag_index.clear()
+        self.python = Tag.objects.create(name="python")
+        self.pytest = Tag.objects.create(name="pytest")
+        task = Task.objects.create(title="Task", description="Description")
+        task.tags.add(self.pytest)
+
+        self.user = User.objects.create_user(username="test", password="test")
+        self.basic_auth = "Basic " + base64.b64encode(b"test:test").decode("utf-8")
+        self.client.credentials(HTTP_AUTHORIZATION=self.basic_auth)
+
+    def _autocomplete(self, params):
+        response = self.client.get(reverse("tag-autocomplete"), params)
+        self.assertEqual(response.status_code, 200)
+        return [tag["name"] for tag in response.json()]
+
+    def test_list_orderings(self):
+        response = self.client.get(reverse("tag-list"))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [tag["name"] for tag in response.json()["results"]], ["pytest", "python"]
+        )
+
+        response = self.client.get(reverse("tag-list"), {"ordering": "popular"})
+        self.assertEqual(
+            [(tag["name"], tag["usage_count"]) for tag in response.json()["results"]],
+            [("pytest", 1), ("python", 0)],
+        )
+
+        response = self.client.get(reverse("tag-list"), {"ordering": "size"})
+        self.assertEqual(response.status_code, 400)
+
+    def test_autocomplete(self):
+        self.assertEqual(self._autocomplete({"q": "PY"}), ["pytest", "python"])
+        self.assertEqual(
+            self._autocomplete({"q": "py", "ordering": "popular", "limit": 1}),
+            ["pytest"],
+        )
+        response = self.client.get(reverse("tag-autocomplete"), {"limit": "many"})
+        self.assertEqual(response.status_code, 400)
+
+    def test_autocomplete_follows_tag_writes(self):
+        self.assertEqual(self._autocomplete({"q": "py"}), ["pytest", "python"])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            resolve_tags(["pyramid"])
+            self.python.name = "snake"
+            self.python.save()
+            remove_orphan_tags([self.python.pk])
+
+        self.assertEqual(self._autocomplete({"q": "py"}), ["pyramid", "pytest"])
+        self.assertEqual(self._autocomplete({"q": "sn"}), [])
+
+    def test_autocomplete_ignores_rolled_back_tags(self):
+        self.assertEqual(self._autocomplete({"q": "py"}), ["pytest", "python"])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            with self.assertRaises(DatabaseError):
+                with transaction.atomic():
+                    resolve_tags(["pyramid"])
+                    self.python.name = "snake"
+                    self.python.save()
+                    raise DatabaseError()
+
+        self.assertEqual(self._autocomplete({"q": "py"}), ["pytest", "python"])
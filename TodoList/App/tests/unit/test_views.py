@@ -1,4 +1,6 @@
 import base64
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from rest_framework import status
 from rest_framework.test import APITestCase
@@ -53,3 +55,39 @@ class TaskViewSetTest(APITestCase):
         self.assertEqual(Tag.objects.count(), 1)
 
         self.assertEqual(Tag.objects.first().name, self.tag2.name)
+
+    def _list_query_count(self, page_size):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(self.url, {"page_size": page_size})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.json()["results"]), page_size)
+        return len(ctx.captured_queries)
+
+    def test_task_list_query_count_is_constant(self):
+        """
+        Test that listing tasks does not issue one tag query per task,
+        whatever the page size is
+        """
+
+        self.client.credentials(HTTP_AUTHORIZATION=self.basic_auth)
+
+        for i in range(49):
+            task = Task.objects.create(title=f"Task {i}", description="Description")
+            task.tags.add(self.tag1, self.tag2)
+
+        # Warm up the credential cache so both requests authenticate alike
+        self.client.get(self.url)
+
+        small_page = self._list_query_count(5)
+        large_page = self._list_query_count(50)
+
+        self.assertEqual(small_page, large_page)
+
+    def test_task_retrieve_returns_prefetched_tags(self):
+        self.client.credentials(HTTP_AUTHORIZATION=self.basic_auth)
+
+        task_url = reverse("task-detail", kwargs={"pk": self.task1.pk})
+        response = self.client.get(task_url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()["tags"], [self.tag1.name])
@@ -1,9 +1,25 @@
 from django.urls import path, include
 
 # from .views import TaskCreateAPIView, TaskDetailAPIView, TaskListAPIView
-from .views import TaskViewSet
+from .async_views import AsyncTaskDetailView, AsyncTaskEventsView, AsyncTaskListView
+from .views import MetricsView, TagViewSet, TaskViewSet
 from rest_framework.routers import DefaultRouter
 
 router = DefaultRouter()
 router.register(r"tasks", TaskViewSet, basename="task")
-urlpatterns = [path("", include(router.urls))]
+router.register(r"tags", TagViewSet, basename="tag")
+urlpatterns = [
+    path("", include(router.urls)),
+    path("metrics/", MetricsView.as_view(), name="metrics"),
+    path("async/tasks/", AsyncTaskListView.as_view(), name="async-task-list"),
+    path(
+        "async/tasks/<int:pk>/",
+        AsyncTaskDetailView.as_view(),
+        name="async-task-detail",
+    ),
+    path(
+        "async/tasks/events/",
+        AsyncTaskEventsView.as_view(),
+        name="async-task-events",
+    ),
+]
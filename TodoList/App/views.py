@@ -1,29 +1,363 @@
-from .models import Task
-from .serializers import TaskSerializer
-from rest_framework import viewsets
-from rest_framework.filters import SearchFilter
+from . import caching, conditional, export, metrics
+from .autocomplete import tag_index
+from .changes import BATCH_SIZE, MAX_BATCH_SIZE, read_changes, read_snapshot
+from .filters import TaskFilter, TaskSearchFilter
+from .models import Tag, Task
+from .pagination import TaskKeysetPagination
+from .serializers import (
+    TagSerializer,
+    TaskBulkDeleteSerializer,
+    TaskReadSerializer,
+    TaskSerializer,
+)
+from .services import collect_orphan_tags, deleting_tasks, recording_task_writes
+from .stats import TAG_LIMIT, task_stats
+from django.db import transaction
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.http import Http404, StreamingHttpResponse
+from rest_framework import status, viewsets
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
 from rest_framework.pagination import PageNumberPagination
+from rest_framework.renderers import BaseRenderer
+from rest_framework.response import Response
+from rest_framework.views import APIView
 
 # Create your views here.
 
 
 class TaskListPagination(PageNumberPagination):
     page_size = 10  # Tasks per page
+    page_size_query_param = "page_size"
+    max_page_size = 1000
+
+
+def integer_param(request, name, default, minimum, maximum):
+    """Read the `name` query parameter as an integer clamped to the bounds."""
+    try:
+        value = int(request.query_params.get(name, default))
+    except ValueError:
+        raise ValidationError({name: ["A valid integer is required."]})
+    return min(max(value, minimum), maximum)
+
+
+def cached_response(request, entry):
+    """
+    Answer with a cached `(etag, last modified, data)` entry, or with the
+    bodyless 304 (or 412) the conditional headers of `request` call for.
+    """
+    etag, last_modified, data = entry
+    response = conditional.conditional_response(request, etag, last_modified)
+    if response is None:
+        response = conditional.set_validators(Response(data), etag, last_modified)
+    return response
 
 
 class TaskViewSet(viewsets.ModelViewSet):
     """Handle all CRUD operations for tasks."""
 
-    queryset = Task.objects.all()
+    # Tags are loaded in bulk so serializing a page costs the same number of
+    # queries regardless of how many tasks (or tags) it holds.
+    queryset = Task.objects.prefetch_related("tags")
     serializer_class = TaskSerializer
-    filter_backends = [SearchFilter]
-    search_fields = ["title", "tags__name"]
+    filter_backends = [TaskFilter, TaskSearchFilter]
+    search_fields = ["title", "description", "tags__name"]
     pagination_class = TaskListPagination
 
+    @property
+    def paginator(self):
+        """
+        Use keyset pagination when asked with `?pagination=cursor`.
+
+        Page number pagination stays the default; the keyset mode skips the
+        COUNT and seeks on `ordering` (`id`, `due_date` or `timestamp`).
+        """
+        if not hasattr(self, "_paginator"):
+            request = getattr(self, "request", None)
+            if request is not None and (
+                request.query_params.get("pagination") == "cursor"
+            ):
+                self._paginator = TaskKeysetPagination()
+            else:
+                self._paginator = super().paginator
+        return self._paginator
+
+    def list(self, request, *args, **kwargs):
+        # Any task write changes the validators, an unchanged list costs
+        # a single lookup whatever the filters. Read before the page and on
+        # the same alias, a write in between only makes them stale.
+        validators = conditional.list_validators()
+        if conditional.is_conditional(request):
+            response = conditional.conditional_response(request, *validators)
+            if response is not None:
+                return response
+
+        key = caching.list_key(request.build_absolute_uri(), *validators)
+        entry = caching.get_entry(key)
+        if entry is None:
+            # Pages are serialized from .values() rows, not Task instances
+            queryset = self.filter_queryset(self.get_queryset())
+            page = self.paginate_queryset(TaskReadSerializer.rows(queryset))
+            response = self.get_paginated_response(
+                TaskReadSerializer(page, many=True).data
+            )
+            entry = caching.set_entry(key, *validators, response.data)
+        return cached_response(request, entry)
+
+    def retrieve(self, request, *args, **kwargs):
+        # Filters may hide the task, only plain lookups are served from cache
+        if request.query_params:
+            return cached_response(request, self.get_task_entry())
+
+        # Entries are keyed by the current version, never by a stale one
+        pk = kwargs[self.lookup_field]
+        validators = conditional.task_validators(pk)
+        if validators is None:
+            raise Http404("No Task matches the given query.")
+        if conditional.is_conditional(request):
+            response = conditional.conditional_response(request, *validators)
+            if response is not None:
+                return response
+
+        entry = caching.get_entry(caching.task_key(pk, validators[0]))
+        if entry is None:
+            entry = self.get_task_entry()
+            caching.set_entry(caching.task_key(pk, entry[0]), *entry)
+        return cached_response(request, entry)
+
+    def get_task_entry(self):
+        """
+        Return the representation of the requested task with its validators,
+        like `get_serializer(get_object()).data` but without building the Task.
+        """
+        queryset = TaskReadSerializer.rows(self.filter_queryset(self.get_queryset()))
+        lookup = self.kwargs[self.lookup_url_kwarg or self.lookup_field]
+        try:
+            row = queryset.get(pk=lookup)
+        except (Task.DoesNotExist, TypeError, ValueError, DjangoValidationError):
+            raise Http404("No Task matches the given query.")
+        return (
+            conditional.version_etag(row["version"]),
+            row["updated_at"],
+            TaskReadSerializer(row).data,
+        )
+
+    @transaction.atomic
+    def update(self, request, *args, **kwargs):
+        conditional.check_if_match(request, kwargs[self.lookup_field])
+        response = super().update(request, *args, **kwargs)
+        response["ETag"] = conditional.version_etag(response.data["version"])
+        return response
+
+    @transaction.atomic
     def destroy(self, request, *args, **kwargs):
+        conditional.check_if_match(request, kwargs[self.lookup_field])
         task = self.get_object()
-        tags = task.tags.all()
-        for tag in tags:
-            if tag.task_set.count() == 1:
-                tag.delete()
-        return super().destroy(request, *args, **kwargs)
+        tag_ids = [tag.pk for tag in task.tags.all()]
+        with recording_task_writes():
+            self.perform_destroy(task)
+        collect_orphan_tags(tag_ids)
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+    @action(detail=False, url_path="export")
+    def export(self, request, *args, **kwargs):
+        """
+        Stream every task matching the filters as NDJSON (default) or CSV,
+        chosen with `?export_format=`, in primary key order.
+        """
+        export_format = request.query_params.get("export_format", "ndjson")
+        if export_format not in export.FORMATS:
+            raise ValidationError(
+                {"export_format": [f"Choose one of {', '.join(export.FORMATS)}."]}
+            )
+
+        queryset = self.filter_queryset(self.get_queryset())
+        response = StreamingHttpResponse(
+            export.export_lines(queryset, export_format),
+            content_type=export.FORMATS[export_format],
+        )
+        response["Content-Disposition"] = (
+            f'attachment; filename="tasks.{export_format}"'
+        )
+        return response
+
+    stats_max_tag_limit = 1000
+
+    @action(detail=False, url_path="stats")
+    def stats(self, request, *args, **kwargs):
+        """
+        Count the tasks by status, by due date bucket (past, today, next 7
+        days, later, none) and for the `tag_limit` most used tags. Served
+        from the incrementally maintained summary, filters do not apply.
+        """
+        tag_limit = integer_param(
+            request, "tag_limit", TAG_LIMIT, 0, self.stats_max_tag_limit
+        )
+        return Response(task_stats(tag_limit=tag_limit))
+
+    @action(detail=False, url_path="changes")
+    def changes(self, request, *args, **kwargs):
+        """
+        Return the task changes recorded after the `since` sequence number,
+        `limit` at a time, with the current representation of every changed
+        task. Pass the returned `last_seq` as the next `since`. Answers 410
+        when `since` is older than the pruned history.
+
+        `since=0` (the default) starts with a snapshot of every task instead.
+        While its batches return an `after` task id, pass it along with
+        `since` to read the rest of the snapshot.
+        """
+        since = integer_param(request, "since", 0, 0, 2**63 - 1)
+        limit = integer_param(request, "limit", BATCH_SIZE, 1, MAX_BATCH_SIZE)
+        if "after" in request.query_params:
+            after = integer_param(request, "after", 0, 0, 2**63 - 1)
+            return Response(read_snapshot(seq=since, after=after, limit=limit))
+        if not since:
+            return Response(read_snapshot(limit=limit))
+        return Response(read_changes(since=since, limit=limit))
+
+    bulk_max_items = 1000  # Tasks accepted by a single bulk request
+
+    def _get_bulk_items(self, data):
+        if not isinstance(data, list):
+            raise ValidationError({"non_field_errors": ["Expected a list of tasks."]})
+        if len(data) > self.bulk_max_items:
+            raise ValidationError(
+                {
+                    "non_field_errors": [
+                        f"A bulk request accepts at most {self.bulk_max_items} tasks."
+                    ]
+                }
+            )
+        return data
+
+    @action(detail=False, methods=["post", "patch", "delete"], url_path="bulk")
+    def bulk(self, request, *args, **kwargs):
+        """
+        Create (POST), partially update (PATCH) or delete (DELETE) many tasks.
+
+        POST and PATCH take a list of tasks (PATCH items must include their
+        `id`) and answer with the tasks in the same order, or with one error
+        object per item. DELETE takes `{"ids": [...]}`. Every request runs in
+        a single transaction with a fixed number of queries.
+        """
+        with transaction.atomic():
+            if request.method == "POST":
+                return self._bulk_create(request)
+            if request.method == "PATCH":
+                return self._bulk_update(request)
+            return self._bulk_destroy(request)
+
+    def _bulk_create(self, request):
+        serializer = self.get_serializer(
+            data=self._get_bulk_items(request.data), many=True
+        )
+        serializer.is_valid(raise_exception=True)
+        serializer.save()
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
+
+    def _bulk_update(self, request):
+        items = self._get_bulk_items(request.data)
+        ids = [item.get("id") for item in items if isinstance(item, dict)]
+        # Tags are prefetched again once they have been rewritten
+        tasks = Task.objects.in_bulk([pk for pk in ids if isinstance(pk, int)])
+
+        serializer = self.get_serializer(tasks, data=items, many=True, partial=True)
+        serializer.is_valid(raise_exception=True)
+        serializer.save()
+        return Response(serializer.data)
+
+    def _bulk_destroy(self, request):
+        serializer = TaskBulkDeleteSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        ids = serializer.validated_data["ids"]
+
+        queryset = Task.objects.filter(pk__in=ids)
+        deleted = list(queryset.values_list("pk", flat=True))
+        with deleting_tasks(queryset):
+            queryset.delete()
+
+        return Response(
+            {"deleted": deleted, "not_found": sorted(set(ids) - set(deleted))}
+        )
+
+
+class TagViewSet(viewsets.ReadOnlyModelViewSet):
+    """
+    Browse the tag catalog.
+
+    Tags are listed by name, or most used first with `?ordering=popular`.
+    `autocomplete/?q=<prefix>` answers keystroke level suggestions from the
+    in-memory prefix index instead of the database.
+    """
+
+    queryset = Tag.objects.all()
+    serializer_class = TagSerializer
+    pagination_class = TaskListPagination
+    orderings = {"name": ["name"], "popular": ["-usage_count", "name"]}
+    autocomplete_max_limit = 50
+
+    def get_ordering(self):
+        ordering = self.request.query_params.get("ordering", "name")
+        if ordering not in self.orderings:
+            raise ValidationError(
+                {"ordering": [f"Choose one of {', '.join(self.orderings)}."]}
+            )
+        return ordering
+
+    def get_queryset(self):
+        return super().get_queryset().order_by(*self.orderings[self.get_ordering()])
+
+    @action(detail=False)
+    def autocomplete(self, request, *args, **kwargs):
+        """
+        Return up to `limit` tags whose name starts with `q` (case
+        insensitive), alphabetically or most used first with
+        `ordering=popular`. Usage counts may lag by `TAG_INDEX_TTL` seconds.
+        """
+        try:
+            limit = int(request.query_params.get("limit", 10))
+        except ValueError:
+            raise ValidationError({"limit": ["A valid integer is required."]})
+        limit = min(max(limit, 1), self.autocomplete_max_limit)
+
+        matches = tag_index.complete(
+            request.query_params.get("q", ""),
+            limit=limit,
+            popular=self.get_ordering() == "popular",
+        )
+        return Response(
+            [
+                {"id": pk, "name": name, "usage_count": usage_count}
+                for pk, name, usage_count in matches
+            ]
+        )
+
+
+class PrometheusRenderer(BaseRenderer):
+    media_type = "text/plain"
+    format = "prometheus"
+    charset = "utf-8"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if isinstance(data, str):
+            return data.encode(self.charset)
+        # Errors (such as a failed authentication) as plain text
+        return str(data.get("detail", data)).encode(self.charset)
+
+
+class MetricsView(APIView):
+    """
+    Per route request metrics of this process, in the Prometheus text format.
+
+    Filled by `App.metrics.PerformanceMiddleware` when `PERFORMANCE_METRICS`
+    is enabled.
+    """
+
+    renderer_classes = [PrometheusRenderer]
+
+    def get(self, request, *args, **kwargs):
+        return Response(
+            metrics.render_metrics(),
+            content_type="text/plain; version=0.0.4; charset=utf-8",
+        )
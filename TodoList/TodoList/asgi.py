@@ -2,6 +2,9 @@
 ASGI config for TodoList project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
+Serve it with an ASGI server for the async endpoints: the live task event
+stream (/api/async/tasks/events/) holds a connection per subscriber, which
+only costs a coroutine here, while a WSGI worker would block a thread on it.
 
 For more information on this file, see
 https://docs.djangoproject.com/en/5.1/howto/deployment/asgi/
@@ -10,8 +10,11 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.1/ref/settings/
 """
 
+import os
 from pathlib import Path
 
+from django.core.exceptions import ImproperlyConfigured
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -44,6 +47,7 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
+    "App.routers.ReplicaPinningMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
@@ -52,6 +56,12 @@ MIDDLEWARE = [
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
 ]
 
+# Opt-in per route timings (Server-Timing headers and /api/metrics/), see
+# App/metrics.py. Enable with TODOLIST_PERFORMANCE_METRICS=1.
+PERFORMANCE_METRICS = os.environ.get("TODOLIST_PERFORMANCE_METRICS") == "1"
+if PERFORMANCE_METRICS:
+    MIDDLEWARE.insert(0, "App.metrics.PerformanceMiddleware")
+
 ROOT_URLCONF = "TodoList.urls"
 
 TEMPLATES = [
@@ -83,6 +93,56 @@ DATABASES = {
     }
 }
 
+# Database tuning profiles, chosen with the TODOLIST_DB_PROFILE environment
+# variable. "production" sets up SQLite for concurrent requests:
+# - WAL lets readers run alongside the single writer. synchronous=NORMAL is
+#   safe with WAL, and only the last commits are at risk on power loss.
+# - mmap serves reads from the page cache.
+# - Write transactions take the lock up front (BEGIN IMMEDIATE) and wait up
+#   to `timeout` seconds for it, instead of failing with "database is locked"
+#   when a read lock cannot be upgraded.
+# - Connections are kept between requests.
+DATABASE_PROFILES = {
+    "default": {},
+    "production": {
+        "CONN_MAX_AGE": 600,
+        "CONN_HEALTH_CHECKS": True,
+        "OPTIONS": {
+            "init_command": (
+                "PRAGMA journal_mode=WAL;"
+                "PRAGMA synchronous=NORMAL;"
+                "PRAGMA mmap_size=268435456;"
+                "PRAGMA temp_store=MEMORY;"
+            ),
+            "transaction_mode": "IMMEDIATE",
+            "timeout": 20,
+        },
+    },
+}
+DATABASE_PROFILE = os.environ.get("TODOLIST_DB_PROFILE", "default")
+if DATABASE_PROFILE not in DATABASE_PROFILES:
+    raise ImproperlyConfigured(
+        f"TODOLIST_DB_PROFILE must be one of {', '.join(DATABASE_PROFILES)}."
+    )
+DATABASES["default"].update(DATABASE_PROFILES[DATABASE_PROFILE])
+
+# Read replicas, as a comma separated list of SQLite files in
+# TODOLIST_DB_REPLICAS. They become the "replica1", "replica2"... aliases,
+# and App.routers spreads the reads over them while writes stay on
+# "default". Keep them fresh with `manage.py sync_replicas --interval N`.
+DATABASE_REPLICAS = []
+for path in filter(None, os.environ.get("TODOLIST_DB_REPLICAS", "").split(",")):
+    alias = f"replica{len(DATABASE_REPLICAS) + 1}"
+    DATABASES[alias] = {
+        **DATABASES["default"],
+        "NAME": path.strip(),
+        "TEST": {"MIRROR": "default"},
+    }
+    DATABASE_REPLICAS.append(alias)
+DATABASE_ROUTERS = ["App.routers.PrimaryReplicaRouter"]
+# Seconds a client keeps reading from the primary after a write
+REPLICA_PIN_SECONDS = 15
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
@@ -131,7 +191,7 @@ DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": [
-        "rest_framework.authentication.BasicAuthentication",
+        "App.authentication.CachedBasicAuthentication",
     ],
     "DEFAULT_PERMISSION_CLASSES": [
         "rest_framework.permissions.IsAuthenticated",
@@ -145,3 +205,34 @@ SPECTACULAR_SETTINGS = {
     "VERSION": "1.0.0",
     "SERVE_INCLUDE_SCHEMA": False,
 }
+
+# Orphaned tags are deleted as soon as their last task lets go of them
+# ("inline") or left for the `collect_orphan_tags` command ("deferred").
+TAG_ORPHAN_COLLECTION = "inline"
+
+# Successful Basic authentication credentials are remembered (as an HMAC) for
+# this many seconds so repeated API calls skip the password hasher.
+BASIC_AUTH_CACHE_TTL = 300
+BASIC_AUTH_CACHE_SIZE = 1024
+
+# Cache used for serialized tasks and task list pages (see App/caching.py).
+# The local memory cache is per process: use a shared backend, such as
+# "django.core.cache.backends.filebased.FileBasedCache", when serving the API
+# from several processes.
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    }
+}
+TASK_CACHE_ALIAS = "default"
+TASK_CACHE_TIMEOUT = 300
+
+# Seconds before the in-process tag autocomplete index is reloaded from the
+# database (to see tags written by other processes and fresh usage counts).
+TAG_INDEX_TTL = 60
+
+# Live task events (/api/async/tasks/events/, see App/events.py): seconds
+# between two reads of the change outbox while a worker has subscribers, and
+# events a subscriber may fall behind before it is dropped.
+TASK_EVENTS_POLL_INTERVAL = 1
+TASK_EVENTS_QUEUE_SIZE = 100